@@ -0,0 +1,253 @@
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from pro_tools.testing.fake_services import FakeBoard, FakeServices
+from pro_tools.utils.metrics import percentile
+
+DEFAULT_SIZES = (100, 1000, 5000)
+DEFAULT_REPEAT = 5
+DEFAULT_PUBLISH_CARDS = 200
+PUBLISH_THREADS = 8
+STARTUP_SCRIPT = """
+from pro_tools.main import run
+try:
+    run()
+except SystemExit:
+    pass
+"""
+
+
+@contextlib.contextmanager
+def _environment(values: Dict[str, str]) -> Iterator[None]:
+    saved = dict(os.environ)
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        os.environ.clear()
+        os.environ.update(saved)
+
+
+@contextlib.contextmanager
+def _quiet() -> Iterator[None]:
+    # The code under test prints as it goes; formatting the output is part of
+    # its cost, so it is still produced, only discarded
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def _measure(fn: Callable[[], Any], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with _quiet():
+            fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _row(benchmark: str, variant: str, n: int, samples: List[float], items: Optional[int] = None) -> Dict[str, Any]:
+    ordered = sorted(samples)
+    row = {
+        "benchmark": benchmark,
+        "variant": variant,
+        "n": n,
+        "runs": len(ordered),
+        "p50": percentile(ordered, 0.5),
+        "p95": percentile(ordered, 0.95),
+        "mean": statistics.mean(ordered),
+    }
+    if items:
+        row["per_second"] = items / row["p50"] if row["p50"] else float("inf")
+    return row
+
+
+def _use_board(services: FakeServices, num_cards: int):
+    services.board = FakeBoard(num_cards=num_cards)
+    os.environ.update(services.env())
+
+
+def bench_startup(services: FakeServices, repeat: int) -> List[Dict[str, Any]]:
+    """
+    Times a whole `run` process that finds the TODO list empty, with the
+    pre-crewai card count check and with the full crewai import path.
+    """
+    _use_board(services, 0)
+    rows = []
+    for variant, precheck in (("empty_list_precheck", "true"), ("empty_list_full_import", "false")):
+        env = {**os.environ, "TRELLO_PRECHECK": precheck}
+        samples = _measure(
+            lambda: subprocess.run(
+                [sys.executable, "-c", STARTUP_SCRIPT],
+                env=env,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                check=False,
+            ),
+            repeat,
+        )
+        rows.append(_row("startup", variant, 0, samples))
+    return rows
+
+
+def bench_prepare_inputs(services: FakeServices, num_cards: int, repeat: int) -> List[Dict[str, Any]]:
+    """
+    Times ProTools.prepare_inputs (credential check, board and list
+    verification and card fetch) with and without TRELLO_FAST_STARTUP.
+    """
+    from pro_tools.crew import ProTools
+
+    _use_board(services, num_cards)
+    with _quiet():
+        pro_tools = ProTools()
+
+    rows = []
+    for variant, fast_startup in (("default", "false"), ("fast_startup", "true")):
+        os.environ["TRELLO_FAST_STARTUP"] = fast_startup
+        samples = _measure(lambda: pro_tools.prepare_inputs({}), repeat)
+        rows.append(_row("prepare_inputs", variant, num_cards, samples))
+    return rows
+
+
+def bench_card_listing(services: FakeServices, sizes: Sequence[int], repeat: int) -> List[Dict[str, Any]]:
+    """
+    Times fetching a whole list at each size, in one request and paginated.
+    """
+    from pro_tools.utils.trello_utils import TrelloUtils
+
+    rows = []
+    for size in sizes:
+        _use_board(services, size)
+        list_id = services.board.todo_list_id
+        with _quiet():
+            trello_utils = TrelloUtils(verify_access=False)
+        samples = _measure(lambda: trello_utils.get_cards_in_list(list_id), repeat)
+        rows.append(_row("get_cards_in_list", "single_request", size, samples, size))
+        samples = _measure(lambda: list(trello_utils.iter_cards_in_list(list_id)), repeat)
+        rows.append(_row("get_cards_in_list", "paginated", size, samples, size))
+    return rows
+
+
+def bench_publish(services: FakeServices, num_cards: int, repeat: int) -> List[Dict[str, Any]]:
+    """
+    Measures comment-and-move throughput through the Trello tools, run
+    sequentially and on a thread pool, and through AsyncTrelloUtils.
+    """
+    from pro_tools.tools.TrelloAddCardCommentTool import TrelloAddCardCommentTool
+    from pro_tools.tools.TrelloUpdateCardTool import TrelloUpdateCardTool
+    from pro_tools.utils.async_trello_utils import comment_and_move_cards
+
+    comment_tool = TrelloAddCardCommentTool()
+    update_tool = TrelloUpdateCardTool()
+
+    def publish_one(card_id: str):
+        comment_tool._run(card_id=card_id, text="Benchmark article")
+        update_tool._run(card_id=card_id, idList=services.board.doing_list_id)
+
+    def card_ids() -> List[str]:
+        # Each run starts from a fresh board so every run moves the same cards
+        _use_board(services, num_cards)
+        return [card["id"] for card in services.board.cards_in_list(services.board.todo_list_id)]
+
+    def sequential():
+        for card_id in card_ids():
+            publish_one(card_id)
+
+    def threaded():
+        with ThreadPoolExecutor(max_workers=PUBLISH_THREADS) as executor:
+            list(executor.map(publish_one, card_ids()))
+
+    def direct():
+        comment_and_move_cards([{"card_id": card_id, "text": "Benchmark article"} for card_id in card_ids()])
+
+    return [
+        _row("publish", "tools_sequential", num_cards, _measure(sequential, repeat), num_cards),
+        _row("publish", f"tools_{PUBLISH_THREADS}_threads", num_cards, _measure(threaded, repeat), num_cards),
+        _row("publish", "async_direct_write", num_cards, _measure(direct, repeat), num_cards),
+    ]
+
+
+def run_suite(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    repeat: int = DEFAULT_REPEAT,
+    publish_cards: int = DEFAULT_PUBLISH_CARDS,
+    latency: float = 0.0,
+) -> List[Dict[str, Any]]:
+    """
+    Runs every benchmark against a local FakeServices instance, offline.
+
+    Args:
+        sizes (list): Card counts for the list-fetching benchmark.
+        repeat (int): Runs per measurement.
+        publish_cards (int): Cards commented on and moved per publish run.
+        latency (float): Seconds the fake server adds to every response.
+
+    Returns:
+        list: One row per benchmark variant with p50, p95 and mean seconds.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir, FakeServices(latency=latency) as services:
+        env = {
+            **services.env(),
+            "TRELLO_CREDENTIAL_CACHE_PATH": os.path.join(tmp_dir, "credentials.json"),
+            "SERPAPI_CACHE_ENABLED": "false",
+            "CARD_LEDGER_ENABLED": "false",
+            "STAGE_CACHE_ENABLED": "false",
+        }
+        # Measure the client, not Trello's rate limit, unless one is configured
+        env["TRELLO_RATE_LIMIT"] = os.getenv("TRELLO_RATE_LIMIT") or "1000000"
+        with _environment(env):
+            rows = bench_startup(services, repeat)
+            rows += bench_prepare_inputs(services, min(sizes), repeat)
+            rows += bench_card_listing(services, sizes, repeat)
+            rows += bench_publish(services, publish_cards, repeat)
+    return rows
+
+
+def format_rows(rows: List[Dict[str, Any]]) -> str:
+    lines = [f"{'benchmark':<18} {'variant':<24} {'n':>6} {'p50 (s)':>9} {'p95 (s)':>9} {'items/s':>10}"]
+    for row in rows:
+        per_second = f"{row['per_second']:.1f}" if "per_second" in row else "-"
+        lines.append(
+            f"{row['benchmark']:<18} {row['variant']:<24} {row['n']:>6} "
+            f"{row['p50']:>9.4f} {row['p95']:>9.4f} {per_second:>10}"
+        )
+    return "\n".join(lines)
+
+
+def run():
+    """
+    Run the HTTP-layer benchmarks against the local Trello/SerpApi stand-in.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the Trello/SerpApi I/O paths offline.")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="Comma-separated card counts for the list benchmark")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--publish-cards", type=int, default=DEFAULT_PUBLISH_CARDS)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every fake response")
+    parser.add_argument("--output", help="Also write the results as JSON to this path")
+    args = parser.parse_args()
+
+    rows = run_suite(
+        sizes=[int(size) for size in args.sizes.split(",")],
+        repeat=args.repeat,
+        publish_cards=args.publish_cards,
+        latency=args.latency,
+    )
+    print(format_rows(rows))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(rows, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    run()
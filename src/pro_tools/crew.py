@@ -1,22 +1,156 @@
+import logging
 import os
-from typing import Any, Dict
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
-from crewai import Agent, Crew, Process, Task
-from crewai.project import CrewBase, agent, before_kickoff, crew, task
+from crewai import Agent, Crew, CrewOutput, Process, Task, TaskOutput
+from crewai.events import CrewKickoffFailedEvent, crewai_event_bus
+from crewai.project import CrewBase, after_kickoff, agent, before_kickoff, crew, task
 
-from pro_tools.models.article import Article
-from pro_tools.models.research import Research
+from pro_tools.models.article import Article, Section
+from pro_tools.models.publish_result import CardPublishResult, PublishReport
+from pro_tools.models.research import Research, Topic
+from pro_tools.tools.RedditBatchSearchTool import RedditSerpApiBatchSearchTool
 from pro_tools.tools.RedditSearchTool import RedditSerpApiSearchTool
 from pro_tools.tools.TrelloAddCardCommentTool import TrelloAddCardCommentTool
 from pro_tools.tools.TrelloUpdateCardTool import TrelloUpdateCardTool
+from pro_tools.utils import deadline
+from pro_tools.utils.card_ledger import CardLedger, ResumePlan
+from pro_tools.utils.card_queue import CardQueue, LeaseKeeper, new_worker_id
+from pro_tools.utils.crew_metrics import install_crew_listeners
+from pro_tools.utils.metrics import get_metrics
+from pro_tools.utils.output_store import get_output_store
+from pro_tools.utils.research_compactor import compact_research, estimate_tokens
+from pro_tools.utils.section_stream import unwatch_task, watch_task
+from pro_tools.utils.stage_cache import StageCache
+from pro_tools.utils.topic_clusters import cluster_cards
+from pro_tools.utils.trello_publisher import (
+    SUCCESSFUL_COMMENT,
+    StreamingPublisher,
+    move_cards,
+    publish_article,
+    publish_sections,
+)
 from pro_tools.utils.trello_utils import TrelloUtils
 
+logger = logging.getLogger(__name__)
+
+RESUMED_RESEARCH_PROMPT = """
+Research for these topics was completed in an earlier run. Use it as your research findings:
+
+```
+{research_topics}
+```
+"""
+
+# Deadline stage (see pro_tools.utils.deadline) each task runs under
+TASK_STAGES = {
+    "research_task": "research",
+    "article_task": "article",
+    "trello_update_task": "publish",
+}
+
+# Task and agent whose configuration produced each cached stage output
+STAGE_TASKS = {
+    "research": ("research_task", "researcher"),
+    "article": ("article_task", "writer"),
+}
+
+# Streaming runs to close if their crew's kickoff raises, by crew ID
+_streaming_runs: Dict[Any, "ProTools"] = {}
+_streaming_runs_lock = threading.Lock()
+_installed = False
+
+
+def _close_on_failure(crew_id: Any, pro_tools: Optional["ProTools"]):
+    """
+    Registers `pro_tools` to have its streaming publisher closed if the
+    crew's kickoff raises, or unregisters the crew when `pro_tools` is None.
+    """
+    global _installed
+    with _streaming_runs_lock:
+        if not _installed:
+            crewai_event_bus.register_handler(CrewKickoffFailedEvent, _on_kickoff_failed)
+            _installed = True
+        if pro_tools is None:
+            _streaming_runs.pop(crew_id, None)
+        elif crew_id is not None:
+            _streaming_runs[crew_id] = pro_tools
+
+
+def _on_kickoff_failed(source, event):
+    with _streaming_runs_lock:
+        pro_tools = _streaming_runs.pop(getattr(source, "id", None), None)
+    if pro_tools is not None:
+        pro_tools._close_streaming()
+
 
 @CrewBase
 class ProTools:
     """ProTools crew"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        direct_write: Optional[bool] = None,
+        start_stage: str = "research",
+        stream_results: Optional[bool] = None,
+    ):
+        # Publish each card as soon as its section is written, instead of after the crew
+        if stream_results is None:
+            stream_results = os.getenv("TRELLO_STREAM_RESULTS", "").lower() == "true"
+        self.stream_results = stream_results
+        self._publisher: Optional[StreamingPublisher] = None
+        self._streamed_task_id = None
+        # Cards whose section was handed to the publisher as it streamed
+        self._streamed_ids: Set[str] = set()
+        self._crew_id = None
+
+        # Publish articles without the trello_manager agent (see publish_articles)
+        if direct_write is None:
+            direct_write = os.getenv("TRELLO_DIRECT_WRITE", "").lower() == "true"
+        # Streaming publishes from code, so it implies direct writes
+        self.direct_write = direct_write or stream_results
+        self.publish_report: Optional[PublishReport] = None
+
+        # "article" skips research_task for cards resumed from the ledger
+        if start_stage not in ("research", "article"):
+            raise ValueError(f"Unsupported start stage: {start_stage}")
+        self.start_stage = start_stage
+
+        # Track completed stages per card so interrupted runs can resume
+        self.ledger = CardLedger() if os.getenv("CARD_LEDGER_ENABLED", "").lower() == "true" else None
+        self._card_activity: Dict[str, Optional[str]] = {}
+        self._card_names: Dict[str, str] = {}
+
+        # Share the TODO list with other processes through leased claims on a local queue
+        self.queue = CardQueue() if os.getenv("CARD_QUEUE_ENABLED", "").lower() == "true" else None
+        self._lease: Optional[str] = None
+        self._lease_keeper: Optional[LeaseKeeper] = None
+
+        # Reuse research and articles already produced for a card with the same name
+        self.stage_cache = StageCache() if os.getenv("STAGE_CACHE_ENABLED", "").lower() == "true" else None
+
+        # Append research and articles to per-run compressed shards instead of research.txt/article.txt
+        self.output_store = None
+        if os.getenv("OUTPUT_STORE_ENABLED", "").lower() == "true":
+            self.output_store = get_output_store()
+
+        # Dedupe and trim each topic's research before it reaches the writer's prompt
+        self.compact_research = os.getenv("RESEARCH_COMPACTION_ENABLED", "").lower() == "true"
+
+        # Research cards with near-duplicate names once and share the topic between them
+        self.collapse_duplicates = os.getenv("CARD_DEDUP_ENABLED", "").lower() == "true"
+        self._duplicates: Dict[str, List[Dict[str, Any]]] = {}
+
+        # Each task runs under its stage's share of the run deadline (RUN_DEADLINE_SECONDS)
+        self._stage_tasks: List[Task] = []
+        self._stage_index = -1
+        self._stage_token = None
+
+        # Time LLM calls, tasks and kickoffs alongside HTTP and tool spans
+        install_crew_listeners()
+
         # Get the directory containing this file
         base_dir = os.path.dirname(os.path.abspath(__file__))
         
@@ -37,23 +171,269 @@ class ProTools:
     @before_kickoff
     def prepare_inputs(self, inputs: Dict[str, Any]):
         inputs = inputs or {}
-        trello_utils = TrelloUtils()
 
         print("\nStarting to prepare inputs...")
-        
+
+        # Cards handed in by the caller (e.g. one fan-out pipeline) are used as-is
+        if "trello_cards" in inputs:
+            cards = inputs["trello_cards"]
+        else:
+            with deadline.stage("load"):
+                cards = self.load_trello_cards()
+            if self.queue is not None:
+                cards = self._claim_from_queue(cards)
+            fresh, resumed = self.resume_cards(cards)
+            if self._lease is not None:
+                # Cards resume_cards published or skipped are finished, and
+                # those it failed to publish go back to the queue
+                fresh_ids = {card["id"] for card in fresh}
+                failed = {result.card_id for result in resumed.failed}
+                self.queue.ack(self._lease, [
+                    card["id"] for card in cards if card["id"] not in fresh_ids | failed
+                ])
+                if failed:
+                    self.queue.release(self._lease, failed, "Publishing to Trello failed")
+                if not fresh:
+                    self._stop_lease_keeper()
+            cards = fresh
+
+        if not cards:
+            print("No cards found in the TODO list.")
+            # Instead of continuing with empty inputs, raise an exception to stop the process
+            raise ValueError("No cards found in the TODO list. Nothing to process.")
+
+        # Only the card ID and name go into the prompt
+        self._card_activity = {card["id"]: card.get("dateLastActivity") for card in cards}
+        self._card_names = {card["id"]: card["name"] for card in cards}
+        research_cards = cards
+        if self.collapse_duplicates and self.start_stage == "research":
+            research_cards = self._collapse_duplicates(cards)
+        inputs["trello_cards"] = [{"id": card["id"], "name": card["name"]} for card in research_cards]
+        if self.stream_results:
+            self._streamed_ids = set()
+            self._publisher = StreamingPublisher(
+                on_published=self._on_streamed,
+                started_at=time.perf_counter(),
+                publish=publish_sections,
+            )
+            _close_on_failure(self._crew_id, self)
+        print(f"\nFinal inputs prepared: {len(inputs['trello_cards'])} cards")
+        logger.debug("Final inputs: %s", inputs)
+        self._enter_stage(0)
+        return inputs
+
+    def _enter_stage(self, index: int):
+        """
+        Narrows the deadline to the budget of the stage of the crew's
+        index-th task, and caps its agent's LLM calls to that budget.
+        """
+        self._leave_stage()
+        self._stage_index = index
+        if index >= len(self._stage_tasks):
+            return
+        task = self._stage_tasks[index]
+        stage = TASK_STAGES.get(task.name, task.name)
+        deadline.check(f"the {stage} stage")
+        self._stage_token = deadline.set_deadline(deadline.stage_budget(stage))
+        llm = getattr(task.agent, "llm", None)
+        if hasattr(llm, "timeout"):
+            llm.timeout = deadline.llm_timeout()
+
+    def _leave_stage(self):
+        if self._stage_token is not None:
+            deadline.reset(self._stage_token)
+            self._stage_token = None
+
+    def _advance_stage(self, output: TaskOutput):
+        # Crew-level task callback: the next task starts right after this one
+        self._enter_stage(self._stage_index + 1)
+
+    def _check_deadline(self, step: Any):
+        # Agent step callback; a TimeoutError ends the task without retries
+        deadline.check("the next agent step")
+
+    def _claim_from_queue(self, cards: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Enqueues the TODO list and claims this run's share of it, so several
+        processes on the same list never handle the same card.
+        """
+        queued = self.queue.enqueue(cards)
+        self._lease, claimed = self.queue.claim(new_worker_id())
+        print(f"\nQueued {queued} new cards, claimed {len(claimed)} for this run")
+        if self._lease is not None:
+            # acknowledge_cards stops the renewals; if the run dies, the lease expires
+            self._lease_keeper = LeaseKeeper(self.queue, self._lease)
+            self._lease_keeper.start()
+        return claimed
+
+    def _stop_lease_keeper(self):
+        if self._lease_keeper is not None:
+            self._lease_keeper.stop()
+            self._lease_keeper = None
+
+    def enqueue_cards(self) -> int:
+        """
+        Adds the TODO list's cards to the card queue for workers to claim.
+
+        Returns:
+            int: The number of cards newly queued.
+        """
+        queue = self.queue or CardQueue()
+        return queue.enqueue(self.load_trello_cards())
+
+    def resume_cards(self, cards: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], PublishReport]:
+        """
+        Uses the card ledger and the stage cache to pick up where earlier runs
+        stopped.
+
+        Cards already published and unchanged are skipped. Cards whose article
+        was written, or is cached, are published directly, and cards whose
+        research is done, or cached, run through an article-only crew. Without
+        a ledger or stage cache, all cards are returned unchanged.
+
+        Returns:
+            tuple: The cards that still need the full pipeline, and a
+                PublishReport with the outcome of every card resumed here.
+                Skipped cards were finished earlier and are not in it.
+        """
+        report = PublishReport()
+        if (self.ledger is None and self.stage_cache is None) or not cards:
+            return cards, report
+
+        if self.ledger is not None:
+            plan = self.ledger.plan(cards)
+        else:
+            plan = ResumePlan()
+            plan.fresh = list(cards)
+        if self.stage_cache is not None:
+            self._apply_stage_cache(plan)
+        print(f"\nResume plan: {len(plan.fresh)} new, {len(plan.from_article)} resuming at article, "
+              f"{len(plan.to_publish)} resuming at publish, {len(plan.to_move)} resuming at move, "
+              f"{len(plan.done)} already done")
+
+        if plan.to_publish:
+            published = publish_sections(plan.to_publish)
+            for result in published.results:
+                self._record_publish(result)
+            report.results.extend(published.results)
+
+        if plan.to_move:
+            moved = move_cards(plan.to_move)
+            for result in moved.results:
+                self._record_publish(result)
+            report.results.extend(moved.results)
+
+        if plan.from_article:
+            topics = [card.pop("topic") for card in plan.from_article]
+            resumed = ProTools(
+                direct_write=self.direct_write, start_stage="article", stream_results=self.stream_results
+            )
+            try:
+                resumed.crew().kickoff(inputs={
+                    "trello_cards": plan.from_article,
+                    "research_topics": Research(research_topics=topics).model_dump_json(),
+                })
+            except Exception as e:
+                print(f"Article-only crew for resumed cards failed: {str(e)}")
+                report.results.extend(
+                    CardPublishResult(card_id=card["id"], name=card["name"], status="failed",
+                                      comment=f"Error: {str(e)}", move="Error: not attempted")
+                    for card in plan.from_article
+                )
+            else:
+                # Without direct writes the crew's own agent published them
+                if resumed.publish_report is not None:
+                    report.results.extend(resumed.publish_report.results)
+
+        return plan.fresh, report
+
+    def _stage_key(self, stage: str, card_name: str) -> str:
+        task_name, agent_name = STAGE_TASKS[stage]
+        return StageCache.make_key(
+            stage, card_name, self.tasks_config[task_name], self.agents_config[agent_name]
+        )
+
+    def _apply_stage_cache(self, plan: ResumePlan):
+        # Cached outputs are stored per card name; re-point them at this card
+        fresh = []
+        for card in plan.fresh:
+            overrides = {"id": card["id"], "name": card["name"]}
+            section = self.stage_cache.get(self._stage_key("article", card["name"]))
+            if section is not None:
+                plan.to_publish.append(Section(**{**section, **overrides}))
+                continue
+            topic = self.stage_cache.get(self._stage_key("research", card["name"]))
+            if topic is not None:
+                plan.from_article.append({**card, "topic": Topic(**{**topic, **overrides})})
+                continue
+            fresh.append(card)
+        plan.fresh = fresh
+
+    def _collapse_duplicates(self, cards: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Keeps the first card of each cluster of near-duplicate names for
+        research_task; the others get its topic in _prepare_research.
+        """
+        clusters = cluster_cards(cards)
+        self._duplicates = {cluster[0]["id"]: cluster[1:] for cluster in clusters if len(cluster) > 1}
+        for card_id, duplicates in self._duplicates.items():
+            names = ", ".join(f"'{card['name']}'" for card in duplicates)
+            print(f"\nResearching '{self._card_names[card_id]}' once for duplicates {names}")
+        collapsed = len(cards) - len(clusters)
+        if collapsed:
+            get_metrics().increment("duplicate_cards_collapsed", collapsed)
+        return [cluster[0] for cluster in clusters]
+
+    def _todo_list_config(self) -> Tuple[str, str]:
         # Get board ID
         board_id = os.getenv("TRELLO_BOARD_ID")
         if board_id is None:
             raise ValueError("Environment variable 'TRELLO_BOARD_ID' is not set.")
-            
-        # Verify board access and get lists
-        print("\nVerifying board access...")
-        board_details = trello_utils.verify_board_access(board_id)
-        
+
         # Get TODO list ID
         trello_todo_list_id = os.getenv("TRELLO_TOOD_LIST_ID")
         if trello_todo_list_id is None:
             raise ValueError("Environment variable 'TRELLO_TOOD_LIST_ID' is not set.")
+
+        return board_id, trello_todo_list_id
+
+    def load_trello_cards(self) -> List[Dict[str, Any]]:
+        """
+        Fetches the cards of the TODO list configured in the environment.
+        """
+        board_id, trello_todo_list_id = self._todo_list_config()
+
+        if os.getenv("TRELLO_FAST_STARTUP", "").lower() == "true":
+            # One batched round-trip replaces the credential, board, list and card calls
+            trello_utils = TrelloUtils(verify_access=False)
+            return trello_utils.get_startup_snapshot(board_id, trello_todo_list_id)["cards"]
+
+        trello_utils = TrelloUtils()
+        self._verify_todo_list(trello_utils, board_id, trello_todo_list_id)
+            
+        print(f"\nFetching cards from list ID: {trello_todo_list_id}")
+        cards = trello_utils.get_cards_in_list(trello_todo_list_id)
+        if isinstance(cards, str) and cards.startswith("Error"):
+            raise ValueError(f"Failed to fetch cards: {cards}")
+
+        return cards
+
+    def iter_trello_cards(self, page_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Streams the cards of the TODO list page by page instead of loading them all.
+        """
+        board_id, trello_todo_list_id = self._todo_list_config()
+
+        trello_utils = TrelloUtils()
+        self._verify_todo_list(trello_utils, board_id, trello_todo_list_id)
+
+        print(f"\nStreaming cards from list ID: {trello_todo_list_id}")
+        yield from trello_utils.iter_cards_in_list(trello_todo_list_id, page_size)
+
+    def _verify_todo_list(self, trello_utils: TrelloUtils, board_id: str, trello_todo_list_id: str):
+        # Verify board access and get lists
+        print("\nVerifying board access...")
+        board_details = trello_utils.verify_board_access(board_id)
             
         # Verify list exists in board
         if 'lists' in board_details:
@@ -65,22 +445,175 @@ class ProTools:
         list_details = trello_utils.verify_list(trello_todo_list_id)
         if isinstance(list_details, str) and list_details.startswith("Error"):
             raise ValueError(f"Invalid list ID: {list_details}")
-            
-        print(f"\nFetching cards from list ID: {trello_todo_list_id}")
-        cards = trello_utils.get_cards_in_list(trello_todo_list_id)
-        print(f"Retrieved cards: {cards}")
-        
-        if isinstance(cards, str) and cards.startswith("Error"):
-            raise ValueError(f"Failed to fetch cards: {cards}")
-            
-        if not cards:
-            print("No cards found in the TODO list.")
-            # Instead of continuing with empty inputs, raise an exception to stop the process
-            raise ValueError("No cards found in the TODO list. Nothing to process.")
-            
-        inputs["trello_cards"] = cards
-        print(f"\nFinal inputs prepared: {inputs}")
-        return inputs
+
+    @after_kickoff
+    def publish_articles(self, output: CrewOutput) -> CrewOutput:
+        """
+        In direct-write mode, posts each article section as a comment on its
+        card and moves the card, replacing the trello_update_task agent loop.
+        """
+        self._leave_stage()
+        if not self.direct_write:
+            return output
+        if self._publisher is not None:
+            return self._finish_streaming(output)
+
+        article = output.pydantic
+        if not isinstance(article, Article):
+            raise ValueError("Direct write requires the Article output of article_task.")
+
+        # Only publish to cards of this run, not to IDs the model made up
+        sections = [section for section in article.sections if section.id in self._card_activity]
+        for section in article.sections:
+            if section.id not in self._card_activity:
+                print(f"Skipping section for unknown card {section.id} ({section.name})")
+
+        print(f"\nPublishing {len(sections)} articles directly to Trello...")
+        with deadline.stage("publish"):
+            self.publish_report = publish_article(Article(sections=sections))
+        for result in self.publish_report.results:
+            print(f"- {result.card_id} ({result.name}): {result.status} "
+                  f"[comment: {result.comment} | move: {result.move}]")
+            self._record_publish(result)
+        return output
+
+    @after_kickoff
+    def acknowledge_cards(self, output: CrewOutput) -> CrewOutput:
+        """
+        Marks the cards claimed from the card queue as done, and returns
+        those whose publish failed, or that got no section, to the queue for
+        another attempt.
+        """
+        if self._lease is None:
+            return output
+        self._stop_lease_keeper()
+        if self.publish_report is None:
+            # The trello_manager agent does not report per card
+            self.queue.ack(self._lease, list(self._card_activity))
+        else:
+            # Only cards whose comment and move went through are done; a card
+            # the Article left out has no result and is still in TODO
+            succeeded = {result.card_id for result in self.publish_report.succeeded}
+            failed = {result.card_id for result in self.publish_report.failed}
+            unwritten = [card_id for card_id in self._card_activity if card_id not in succeeded | failed]
+            self.queue.ack(self._lease, [card_id for card_id in self._card_activity if card_id in succeeded])
+            if failed:
+                self.queue.release(self._lease, failed, "Publishing to Trello failed")
+            if unwritten:
+                self.queue.release(self._lease, unwritten, "No section written for this card")
+        self._lease = None
+        return output
+
+    def _stream_section(self, data: Dict[str, Any]):
+        # Called from the LLM stream as each section of the answer closes. The
+        # section is validated on its own, and only published to this run's cards.
+        try:
+            section = Section(**data)
+        except ValueError:
+            return
+        if self._publisher is None or section.id not in self._card_activity:
+            return
+        if section.id not in self._streamed_ids:
+            print(f"\nSection for {section.id} ({section.name}) is ready, publishing it now")
+            self._streamed_ids.add(section.id)
+            self._publisher.submit(section)
+
+    def _on_streamed(self, result: CardPublishResult):
+        print(f"- {result.card_id} ({result.name}): {result.status} "
+              f"[comment: {result.comment} | move: {result.move}]")
+        self._record_publish(result)
+
+    def _record_publish(self, result: CardPublishResult):
+        if self.ledger is None:
+            return
+        if result.status == "succeeded":
+            self.ledger.record(result.card_id, "published")
+        elif result.comment == SUCCESSFUL_COMMENT:
+            # Only the move failed; the next run retries just the move rather
+            # than treating the card, changed by our own comment, as new
+            self.ledger.record(result.card_id, "commented")
+
+    def _finish_streaming(self, output: CrewOutput) -> CrewOutput:
+        self._close_streaming()
+        print(f"\nPublished {len(self.publish_report.succeeded)}/{len(self.publish_report.results)} "
+              f"articles as they were written")
+        if self._publisher.first_update_after is not None:
+            print(f"First Trello update {self._publisher.first_update_after:.1f}s after the run started")
+        return output
+
+    def _close_streaming(self):
+        # Called once per run, after kickoff or when it raises: stops parsing the
+        # writer's stream and waits for the sections already submitted
+        _close_on_failure(self._crew_id, None)
+        if self._streamed_task_id is not None:
+            unwatch_task(self._streamed_task_id)
+        self.publish_report = self._publisher.wait()
+
+    def _record_stage(self, stage: str, items: List[Any]):
+        for item in items:
+            # Ignore IDs the model made up rather than copied from the input cards
+            if item.id not in self._card_activity:
+                continue
+            if self.output_store is not None:
+                self.output_store.append(stage, item.id, item.model_dump())
+            if self.ledger is not None:
+                self.ledger.record(item.id, stage, self._card_activity[item.id], item.model_dump())
+            if self.stage_cache is not None:
+                self.stage_cache.put(
+                    self._stage_key(stage, self._card_names[item.id]), stage, item.model_dump()
+                )
+
+    def _prepare_research(self, output: TaskOutput) -> Tuple[bool, Any]:
+        """
+        Guardrail of research_task that compacts the research and fans each
+        topic back out to the cards collapsed into it, so article_task gets
+        one topic per card and fewer, more relevant tokens.
+        """
+        if not isinstance(output.pydantic, Research):
+            return True, output
+        research = output.pydantic
+        if self.compact_research:
+            research = compact_research(research)
+            before, after = estimate_tokens(output.raw), estimate_tokens(research.model_dump_json())
+            print(f"\nCompacted research from ~{before} to ~{after} tokens")
+            metrics = get_metrics()
+            metrics.increment("research_tokens", before, stage="raw")
+            metrics.increment("research_tokens", after, stage="compacted")
+        if self._duplicates:
+            research = Research(research_topics=[
+                fanned
+                for topic in research.research_topics
+                for fanned in [topic] + [
+                    Topic(id=card["id"], name=card["name"], research=topic.research)
+                    for card in self._duplicates.get(topic.id, [])
+                ]
+            ])
+        return True, output.model_copy(update={
+            "raw": research.model_dump_json(),
+            "pydantic": research,
+            "json_dict": None,
+        })
+
+    def _record_research(self, output: TaskOutput):
+        if isinstance(output.pydantic, Research):
+            self._record_stage("research", output.pydantic.research_topics)
+
+    def _record_article(self, output: TaskOutput):
+        if isinstance(output.pydantic, Article):
+            self._record_stage("article", output.pydantic.sections)
+            if self._publisher is not None:
+                # Sections the stream missed, e.g. because the LLM does not stream
+                for section in output.pydantic.sections:
+                    if section.id in self._card_activity and section.id not in self._streamed_ids:
+                        self._publisher.submit(section)
+
+    def _record_published(self, output: TaskOutput):
+        # The trello_manager agent does not report per card, so a completed
+        # task marks every card of this run as published
+        if self.ledger is None:
+            return
+        for card_id in self._card_activity:
+            self.ledger.record(card_id, "published")
 
     # Define agents
     @agent
@@ -91,7 +624,8 @@ class ProTools:
         """
         return Agent(
             config=self.agents_config["researcher"],
-            tools=[RedditSerpApiSearchTool()],
+            tools=[RedditSerpApiSearchTool(), RedditSerpApiBatchSearchTool()],
+            step_callback=self._check_deadline,
             verbose=True,
         )
 
@@ -101,7 +635,11 @@ class ProTools:
         Creates the 'writer' agent.
         Responsible for crafting actionable articles based on research findings.
         """
-        return Agent(config=self.agents_config["writer"], verbose=True)
+        agent = Agent(config=self.agents_config["writer"], step_callback=self._check_deadline, verbose=True)
+        if self.stream_results and hasattr(agent.llm, "stream"):
+            # Token streaming lets sections be published before the whole answer is written
+            agent.llm.stream = True
+        return agent
 
     @agent
     def trello_manager(self) -> Agent:
@@ -112,6 +650,7 @@ class ProTools:
         return Agent(
             config=self.agents_config["trello_manager"],
             tools=[TrelloAddCardCommentTool(), TrelloUpdateCardTool()],
+            step_callback=self._check_deadline,
             verbose=True,
         )
 
@@ -124,8 +663,10 @@ class ProTools:
         """
         return Task(
             config=self.tasks_config["research_task"],
-            output_file="research.txt",
+            output_file=None if self.output_store is not None else "research.txt",
             output_pydantic=Research,
+            guardrail=self._prepare_research if self.compact_research or self.collapse_duplicates else None,
+            callback=self._record_research,
         )
 
     @task
@@ -134,11 +675,22 @@ class ProTools:
         Creates the 'article_task'.
         Responsible for turning research findings into concise and actionable articles.
         """
-        return Task(
+        description = None
+        if self.start_stage == "article":
+            # research_task is skipped, so hand over the research stored by an earlier run
+            description = self.tasks_config["article_task"]["description"] + RESUMED_RESEARCH_PROMPT
+        task = Task(
             config=self.tasks_config["article_task"],
-            output_file="article.txt",
+            description=description,
+            output_file=None if self.output_store is not None else "article.txt",
             output_pydantic=Article,
+            callback=self._record_article,
         )
+        if self.stream_results:
+            # Publish each section the moment the writer's streamed answer completes it
+            self._streamed_task_id = task.id
+            watch_task(task.id, self._stream_section)
+        return task
 
     @task
     def trello_update_task(self) -> Task:
@@ -146,7 +698,10 @@ class ProTools:
         Creates the 'trello_update_task'.
         Responsible for saving articles as comments on Trello cards and moving them to the next column.
         """
-        return Task(config=self.tasks_config["trello_update_task"])
+        return Task(
+            config=self.tasks_config["trello_update_task"],
+            callback=self._record_published,
+        )
 
     @crew
     def crew(self) -> Crew:
@@ -164,6 +719,13 @@ class ProTools:
         print("\nInitializing tasks...")
         try:
             tasks = self.tasks
+            if self.start_stage == "article":
+                tasks = [task for task in tasks if task.name != "research_task"]
+            if self.direct_write:
+                # The final Trello stage runs without an LLM in publish_articles
+                tasks = [task for task in tasks if task.name != "trello_update_task"]
+            task_roles = {task.agent.role for task in tasks}
+            agents = [agent for agent in agents if agent.role in task_roles]
             print(f"Created {len(tasks)} tasks successfully")
             for task in tasks:
                 print(f"- {task.description[:50]}...")
@@ -171,10 +733,14 @@ class ProTools:
             print(f"Error creating tasks: {e}")
             raise
             
+        self._stage_tasks = tasks
         print("\nCreating crew...")
-        return Crew(
+        crew = Crew(
             agents=agents,
             tasks=tasks,
             process=Process.sequential,
+            task_callback=self._advance_stage,
             verbose=True,
         )
+        self._crew_id = crew.id
+        return crew
@@ -1,37 +1,106 @@
 #!/usr/bin/env python
+import logging
+import os
 import sys
+import time
 import warnings
 
-print("=== Starting pro_tools.main ===")
+from pro_tools.utils import deadline
+from pro_tools.utils.metrics import get_metrics
 
-try:
-    from pro_tools.crew import ProTools
-    print("Successfully imported ProTools")
-except Exception as e:
-    print(f"Error importing ProTools: {str(e)}")
-    import traceback
-    print(traceback.format_exc())
-    sys.exit(1)
+print("=== Starting pro_tools.main ===")
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
+# LOG_LEVEL=DEBUG also dumps the raw Trello payloads and crew inputs
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "WARNING").upper(),
+    format="%(levelname)s %(name)s: %(message)s",
+)
+
 # This main file is intended to be a way for you to run your
 # crew locally, so refrain from adding unnecessary logic into this file.
 # Replace with inputs you want to test with, it will automatically
 # interpolate any tasks and agents information
 
 
+def _import_crew():
+    # crewai and the tool stack take seconds to import, so they are only
+    # loaded once there is work to do
+    try:
+        from pro_tools.crew import ProTools
+        print("Successfully imported ProTools")
+        return ProTools
+    except Exception as e:
+        print(f"Error importing ProTools: {str(e)}")
+        import traceback
+        print(traceback.format_exc())
+        sys.exit(1)
+
+
+def todo_list_is_empty():
+    """
+    Asks Trello whether the TODO list has any cards, without importing crewai.
+
+    Returns:
+        bool: True only when the list is known to be empty. Missing settings
+            or failed requests return False so the full run reports them.
+    """
+    if os.getenv("TRELLO_PRECHECK", "true").lower() == "false":
+        return False
+    list_id = os.getenv("TRELLO_TOOD_LIST_ID")
+    if not list_id:
+        return False
+
+    from pro_tools.utils.trello_utils import TrelloUtils
+
+    try:
+        count = TrelloUtils(verify_access=False).count_cards_in_list(list_id, limit=1)
+    except ValueError as e:
+        print(f"Card count pre-check failed, continuing with a full run: {str(e)}")
+        return False
+    return count == 0
+
+
 def run():
     """
-    Run the crew.
+    Run the crew, within RUN_DEADLINE_SECONDS if set.
     """
+    run_deadline = deadline.set_deadline(deadline.run_budget())
     try:
+        if todo_list_is_empty():
+            raise ValueError("No cards found in the TODO list. Nothing to process.")
+
+        ProTools = _import_crew()
+        from pro_tools.runner import run_batched, run_fanout
+
         print("\nInitializing ProTools...")
         pro_tools = ProTools()
+
+        run_mode = os.getenv("CREW_RUN_MODE", "sequential").lower()
+        if run_mode in ("fanout", "batched"):
+            if run_mode == "fanout":
+                print("Starting per-card fan-out...")
+                report = run_fanout(pro_tools.load_trello_cards())
+            else:
+                print("Starting batched processing...")
+                report = run_batched(pro_tools.iter_trello_cards())
+            if not report.results:
+                raise ValueError("No cards found in the TODO list. Nothing to process.")
+            print(f"\nProcessed {len(report.results)} cards: "
+                  f"{len(report.succeeded)} succeeded, {len(report.failed)} failed")
+            for result in report.failed:
+                print(f"- {result.card_id} ({result.name}): {result.error}")
+            if report.failed:
+                sys.exit(1)
+            return
+
         print("Creating crew...")
         crew = pro_tools.crew()
         print("Starting crew execution...")
         crew.kickoff()
+        if pro_tools.publish_report is not None and pro_tools.publish_report.failed:
+            sys.exit(1)
     except ValueError as e:
         if "No cards found in the TODO list" in str(e):
             print(f"\nNotice: {str(e)}")
@@ -49,12 +118,124 @@ def run():
         print("\nFull error trace:")
         print(traceback.format_exc())
         sys.exit(1)
+    finally:
+        deadline.reset(run_deadline)
+        write_run_metrics()
+
+
+def write_run_metrics():
+    """
+    Writes this run's timings and counters to METRICS_OUTPUT_PATH, if set.
+    """
+    try:
+        path = get_metrics().write()
+    except (OSError, ValueError) as e:
+        print(f"\nFailed to write metrics: {str(e)}")
+        return
+    if path:
+        print(f"\nMetrics written to {path}")
+
+
+def record():
+    """
+    Run the crew and record every LLM completion, tool call and Trello
+    read/write to a cassette (the first argument, or CASSETTE_PATH).
+    """
+    from pro_tools.utils.cassette import Cassette
+
+    with Cassette(_cassette_path(), mode="record") as cassette:
+        try:
+            run()
+        finally:
+            print(f"\nRecorded {len(cassette.interactions)} interactions to {cassette.path}")
+
+
+def playback():
+    """
+    Run the crew against a recorded cassette instead of live LLMs, Trello and
+    SerpApi, to time orchestration and parsing on their own.
+    """
+    from unittest.mock import patch
+
+    from pro_tools.utils.cassette import Cassette
+
+    # Resume state from earlier runs would skip stages the cassette recorded,
+    # and the card pre-check would go to Trello instead of the cassette
+    replay_env = patch.dict(os.environ, {
+        "CARD_LEDGER_ENABLED": "false",
+        "STAGE_CACHE_ENABLED": "false",
+        "TRELLO_PRECHECK": "false",
+    })
+
+    start = time.perf_counter()
+    with replay_env, Cassette(_cassette_path(), mode="replay") as cassette:
+        try:
+            run()
+        finally:
+            print(f"\nReplayed {cassette.replayed_count}/{len(cassette.interactions)} interactions "
+                  f"from {cassette.path} in {time.perf_counter() - start:.3f}s")
+
+
+def serve():
+    """
+    Run as a daemon that processes cards as Trello webhooks report them,
+    instead of polling the whole TODO list.
+    """
+    from pro_tools.webhook_daemon import WebhookDaemon
+
+    try:
+        WebhookDaemon().serve_forever()
+    except ValueError as e:
+        print(f"\nError running webhook daemon: {str(e)}")
+        sys.exit(1)
+    finally:
+        write_run_metrics()
+
+
+def enqueue():
+    """
+    Add the TODO list's cards to the card queue, for `work` processes to claim.
+    """
+    from pro_tools.utils.card_queue import CardQueue
+
+    ProTools = _import_crew()
+    try:
+        queued = ProTools().enqueue_cards()
+    except ValueError as e:
+        print(f"\nError enqueuing cards: {str(e)}")
+        sys.exit(1)
+    print(f"\nQueued {queued} new cards: {CardQueue().stats()}")
+
+
+def work():
+    """
+    Run as a card queue worker: claim cards, run the crew for them and
+    acknowledge them. Stops when the queue is empty unless `--follow` is
+    given. Start as many workers as there is capacity for.
+    """
+    from pro_tools.queue_worker import QueueWorker
+
+    try:
+        report = QueueWorker(follow="--follow" in sys.argv[1:]).run()
+        print(f"\nProcessed {len(report.results)} cards: "
+              f"{len(report.succeeded)} succeeded, {len(report.failed)} failed")
+        for result in report.failed:
+            print(f"- {result.card_id} ({result.name}): {result.error}")
+    finally:
+        write_run_metrics()
+
+
+def _cassette_path():
+    # Works both as a script entry point and as `python -m pro_tools.main <command>`
+    args = [arg for arg in sys.argv[1:] if arg not in ("record", "playback")]
+    return args[0] if args else None
 
 
 def train():
     """
     Train the crew for a given number of iterations.
     """
+    ProTools = _import_crew()
     inputs = {"topic": "AI LLMs"}
     try:
         ProTools().crew().train(
@@ -69,6 +250,7 @@ def replay():
     """
     Replay the crew execution from a specific task.
     """
+    ProTools = _import_crew()
     try:
         ProTools().crew().replay(task_id=sys.argv[1])
 
@@ -80,6 +262,7 @@ def test():
     """
     Test the crew execution and returns the results.
     """
+    ProTools = _import_crew()
     inputs = {"topic": "AI LLMs"}
     try:
         ProTools().crew().test(
@@ -108,6 +291,16 @@ if __name__ == "__main__":
         replay()
     elif command == "test":
         test()
+    elif command == "record":
+        record()
+    elif command == "playback":
+        playback()
+    elif command == "serve":
+        serve()
+    elif command == "enqueue":
+        enqueue()
+    elif command == "work":
+        work()
     else:
         print(f"Unknown command: {command}")
         sys.exit(1)
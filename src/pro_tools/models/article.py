@@ -4,7 +4,7 @@ from pydantic import BaseModel, Field
 
 
 class Section(BaseModel):
-    id: int = Field(..., description="The unique identifier for the section")
+    id: str = Field(..., description="The ID of the Trello card the section belongs to")
     name: str = Field(..., description="The original topic name")
     article: str = Field(..., description="The Markdown article content")
 
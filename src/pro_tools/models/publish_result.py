@@ -0,0 +1,25 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class CardPublishResult(BaseModel):
+    card_id: str = Field(..., description="The ID of the Trello card")
+    name: str = Field(..., description="The original topic name")
+    status: str = Field(..., description="Either 'succeeded' or 'failed'")
+    comment: str = Field(..., description="The outcome of adding the article as a comment")
+    move: str = Field(..., description="The outcome of moving the card to the next list")
+
+
+class PublishReport(BaseModel):
+    results: List[CardPublishResult] = Field(
+        default_factory=list, description="One result per published section"
+    )
+
+    @property
+    def succeeded(self) -> List[CardPublishResult]:
+        return [result for result in self.results if result.status == "succeeded"]
+
+    @property
+    def failed(self) -> List[CardPublishResult]:
+        return [result for result in self.results if result.status == "failed"]
@@ -4,7 +4,7 @@ from pydantic import BaseModel, Field
 
 
 class Topic(BaseModel):
-    id: int = Field(..., description="The unique identifier for the topic")
+    id: str = Field(..., description="The ID of the Trello card the topic belongs to")
     name: str = Field(..., description="The name of the topic")
     research: str = Field(..., description="The research content related to the topic")
 
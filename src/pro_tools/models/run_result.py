@@ -0,0 +1,25 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class CardResult(BaseModel):
+    card_id: str = Field(..., description="The ID of the Trello card")
+    name: str = Field(..., description="The name of the Trello card")
+    status: str = Field(..., description="Either 'succeeded' or 'failed'")
+    error: Optional[str] = Field(None, description="The error message if the card failed")
+    output: Optional[str] = Field(None, description="The final crew output for the card")
+
+
+class RunReport(BaseModel):
+    results: List[CardResult] = Field(
+        default_factory=list, description="One result per processed card"
+    )
+
+    @property
+    def succeeded(self) -> List[CardResult]:
+        return [result for result in self.results if result.status == "succeeded"]
+
+    @property
+    def failed(self) -> List[CardResult]:
+        return [result for result in self.results if result.status == "failed"]
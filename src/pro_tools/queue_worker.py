@@ -0,0 +1,123 @@
+import os
+import signal
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from pro_tools.models.run_result import CardResult, RunReport
+from pro_tools.utils import deadline
+from pro_tools.utils.card_queue import CardQueue, new_worker_id
+
+DEFAULT_POLL_INTERVAL = 10.0
+
+
+def run_cards(cards: List[Dict[str, Any]]) -> List[CardResult]:
+    """
+    Runs one crew pipeline for a claimed batch of cards.
+    """
+    # crewai is only imported once there is a batch to run
+    from pro_tools.runner import run_card_group
+
+    return run_card_group(cards)
+
+
+class QueueWorker:
+    """
+    Worker process of the card queue: claims a batch of cards, runs the crew
+    for it while renewing the lease, then acknowledges the cards that
+    succeeded and releases the rest for another attempt.
+
+    Start as many workers as there is capacity for, on one host or several
+    sharing CARD_QUEUE_PATH; the leases keep them from processing the same
+    card, and the cards of a worker that dies are handed out again once its
+    lease expires.
+
+    Args:
+        queue (CardQueue): The queue to work from.
+        process (callable): Runs the crew for a batch and returns one
+            CardResult per card. Defaults to one crew pipeline per batch.
+        worker_id (str): Name of this worker in the queue.
+        batch_size (int): Cards claimed at a time (CARD_QUEUE_BATCH_SIZE).
+        follow (bool): Keep polling for new cards instead of stopping once
+            the queue is empty.
+        poll_interval (float): Seconds between polls of an empty queue when
+            following (CARD_QUEUE_POLL_INTERVAL, default 10).
+    """
+
+    def __init__(
+        self,
+        queue: Optional[CardQueue] = None,
+        process: Optional[Callable[[List[Dict[str, Any]]], List[CardResult]]] = None,
+        worker_id: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        follow: bool = False,
+        poll_interval: Optional[float] = None,
+    ):
+        self.queue = queue or CardQueue()
+        self.process = process or run_cards
+        self.worker_id = worker_id or new_worker_id()
+        self.batch_size = batch_size
+        self.follow = follow
+        if poll_interval is None:
+            poll_interval = float(os.getenv("CARD_QUEUE_POLL_INTERVAL") or DEFAULT_POLL_INTERVAL)
+        self.poll_interval = poll_interval
+        self._stopping = threading.Event()
+
+    def run_once(self) -> Optional[List[CardResult]]:
+        """
+        Claims and processes one batch.
+
+        Returns:
+            list: The batch's results, or None if there was nothing to claim.
+        """
+        token, cards = self.queue.claim(self.worker_id, self.batch_size)
+        if token is None:
+            return None
+        print(f"\nWorker {self.worker_id} claimed {len(cards)} cards")
+
+        try:
+            # Each batch is a run of its own under RUN_DEADLINE_SECONDS
+            with deadline.deadline(deadline.run_budget()), self.queue.hold(token):
+                results = self.process(cards)
+        except Exception as e:
+            results = [
+                CardResult(card_id=card["id"], name=card["name"], status="failed", error=str(e))
+                for card in cards
+            ]
+
+        reported = {result.card_id for result in results}
+        succeeded = [result.card_id for result in results if result.status == "succeeded"]
+        failed = [result for result in results if result.status != "succeeded"]
+        lost = set(succeeded) - set(self.queue.ack(token, succeeded))
+        for result in failed:
+            self.queue.release(token, [result.card_id], result.error)
+        # Cards the pipeline said nothing about are retried
+        self.queue.release(token, [card["id"] for card in cards if card["id"] not in reported],
+                           "No result reported")
+        if lost:
+            print(f"Lease lost before acknowledging {', '.join(sorted(lost))}; another worker has them")
+        return results
+
+    def run(self) -> RunReport:
+        """
+        Processes batches until the queue is empty, or, when following,
+        until stopped (Ctrl+C or SIGTERM). A batch in progress is finished
+        before stopping.
+        """
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda signum, frame: self._stopping.set())
+        report = RunReport()
+        try:
+            while not self._stopping.is_set():
+                results = self.run_once()
+                if results is not None:
+                    report.results.extend(results)
+                    continue
+                if not self.follow:
+                    break
+                self._stopping.wait(self.poll_interval)
+        except KeyboardInterrupt:
+            pass
+        return report
+
+    def stop(self):
+        self._stopping.set()
@@ -0,0 +1,155 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from pro_tools.crew import ProTools
+from pro_tools.models.run_result import CardResult, RunReport
+from pro_tools.utils import deadline
+
+DEFAULT_WORKERS = 4
+DEFAULT_GROUP_SIZE = 1
+DEFAULT_BATCH_SIZE = 10
+NO_SECTION_ERROR = "No section written for this card"
+
+
+def chunk_cards(cards: Iterable[Dict[str, Any]], group_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Splits cards into consecutive groups of at most `group_size` cards.
+    """
+    group = []
+    for card in cards:
+        group.append(card)
+        if len(group) == group_size:
+            yield group
+            group = []
+    if group:
+        yield group
+
+
+def run_card_group(cards: List[Dict[str, Any]]) -> List[CardResult]:
+    """
+    Runs one independent research -> article -> trello_update pipeline for a
+    group of cards. Failures are captured per card instead of raised.
+    """
+    pro_tools = ProTools()
+    try:
+        # Cards finished or resumed through the card ledger drop out here
+        remaining, resumed = pro_tools.resume_cards(cards)
+    except Exception as e:
+        return [
+            CardResult(card_id=card["id"], name=card["name"], status="failed", error=str(e))
+            for card in cards
+        ]
+    # A failed kickoff only fails the cards it ran for, not those resumed above
+    output = None
+    kickoff_error = None
+    if remaining:
+        try:
+            output = pro_tools.crew().kickoff(inputs={"trello_cards": remaining})
+        except Exception as e:
+            kickoff_error = str(e)
+
+    # A card only succeeds once its comment and move went through, where that is known:
+    # for resumed cards, and for the crew's cards in direct-write mode
+    published = {result.card_id: result for result in resumed.results}
+    if pro_tools.publish_report is not None:
+        published.update((result.card_id, result) for result in pro_tools.publish_report.results)
+
+    results = []
+    remaining_ids = {card["id"] for card in remaining}
+    for card in cards:
+        publish_result = published.get(card["id"])
+        if publish_result is not None and publish_result.status == "failed":
+            error = f"comment: {publish_result.comment} | move: {publish_result.move}"
+            results.append(
+                CardResult(card_id=card["id"], name=card["name"], status="failed", error=error)
+            )
+        elif card["id"] in remaining_ids and kickoff_error is not None and publish_result is None:
+            results.append(
+                CardResult(card_id=card["id"], name=card["name"], status="failed", error=kickoff_error)
+            )
+        elif card["id"] in remaining_ids and pro_tools.publish_report is not None and publish_result is None:
+            # Direct writes report every card they publish, so the Article left this one out
+            results.append(
+                CardResult(card_id=card["id"], name=card["name"], status="failed", error=NO_SECTION_ERROR)
+            )
+        elif card["id"] in remaining_ids:
+            results.append(
+                CardResult(card_id=card["id"], name=card["name"], status="succeeded",
+                           output=output.raw if output is not None else None)
+            )
+        else:
+            results.append(CardResult(card_id=card["id"], name=card["name"], status="succeeded"))
+    return results
+
+
+def run_fanout(
+    cards: Iterable[Dict[str, Any]],
+    workers: Optional[int] = None,
+    group_size: Optional[int] = None,
+) -> RunReport:
+    """
+    Processes cards as independent crew pipelines across a pool of worker threads.
+
+    Args:
+        cards (iterable): Dictionaries with the card `id` and `name`.
+        workers (int): Number of pipelines running at once. Defaults to
+            CREW_FANOUT_WORKERS.
+        group_size (int): Cards handled by each pipeline. Defaults to
+            CREW_FANOUT_GROUP_SIZE.
+
+    Returns:
+        RunReport: One result per card, in completion order.
+    """
+    if workers is None:
+        workers = int(os.getenv("CREW_FANOUT_WORKERS") or DEFAULT_WORKERS)
+    if group_size is None:
+        group_size = int(os.getenv("CREW_FANOUT_GROUP_SIZE") or DEFAULT_GROUP_SIZE)
+
+    report = RunReport()
+    groups = chunk_cards(cards, group_size)
+    print(f"\nStarting pipelines across {workers} workers")
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="crew") as executor:
+        # Submit lazily so a streamed card source is never fully materialized
+        pending = set()
+        for group in groups:
+            pending.add(executor.submit(deadline.bind(run_card_group), group))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                _collect(done, report)
+        _collect(pending, report)
+    return report
+
+
+def run_batched(
+    cards: Iterable[Dict[str, Any]], batch_size: Optional[int] = None
+) -> RunReport:
+    """
+    Feeds cards to the crew in fixed-size batches, one batch at a time, so the
+    prompt size and memory use stay flat however long the list is.
+
+    Args:
+        cards (iterable): Dictionaries with the card `id` and `name`,
+            typically streamed from ProTools.iter_trello_cards().
+        batch_size (int): Cards per crew run. Defaults to CREW_BATCH_SIZE.
+
+    Returns:
+        RunReport: One result per card, in list order.
+    """
+    if batch_size is None:
+        batch_size = int(os.getenv("CREW_BATCH_SIZE") or DEFAULT_BATCH_SIZE)
+
+    report = RunReport()
+    for number, batch in enumerate(chunk_cards(cards, batch_size), 1):
+        print(f"\nProcessing batch {number} ({len(batch)} cards)")
+        for result in run_card_group(batch):
+            print(f"Card {result.card_id} ({result.name}): {result.status}")
+            report.results.append(result)
+    return report
+
+
+def _collect(futures, report: RunReport):
+    for future in as_completed(futures):
+        for result in future.result():
+            print(f"Card {result.card_id} ({result.name}): {result.status}")
+            report.results.append(result)
@@ -0,0 +1,532 @@
+import argparse
+import gzip
+import json
+import math
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+import requests
+
+from pro_tools.testing.webhook_sender import build_action, send_webhook
+
+FAKE_API_KEY = "fake-key"
+FAKE_API_TOKEN = "fake-token"
+FAKE_SERPAPI_KEY = "fake-serpapi-key"
+
+
+def fake_id(sequence: int) -> str:
+    """
+    Returns a 24-character hex ID. Like Trello's IDs, later IDs sort after
+    earlier ones, so `before` pagination works on them.
+    """
+    return f"{sequence:024x}"
+
+
+class FakeBoard:
+    """
+    In-memory Trello board with a TODO and a DOING list. Card creations,
+    edits and comments are logged as Trello actions in `actions`.
+
+    Args:
+        num_cards (int): Cards generated in the TODO list.
+        seed (int): Seed for the generated card names.
+    """
+
+    TOPICS = (
+        "AI agents", "Vector databases", "Prompt caching", "Retrieval augmented generation",
+        "Fine-tuning", "Model evaluation", "Tool calling", "Speculative decoding",
+        "Quantization", "Multi-agent planning", "Guardrails", "Synthetic data",
+    )
+
+    def __init__(self, num_cards: int = 10, seed: int = 0):
+        self._lock = threading.Lock()
+        self._sequence = 0
+        self.board_id = self._next_id()
+        self.todo_list_id = self._next_id()
+        self.doing_list_id = self._next_id()
+        self.board = {
+            "id": self.board_id,
+            "name": "Fake Board",
+            "url": f"https://trello.com/b/{self.board_id[-8:]}/fake-board",
+            "idOrganization": None,
+        }
+        self.lists = {
+            self.todo_list_id: {"id": self.todo_list_id, "name": "TODO", "idBoard": self.board_id, "closed": False},
+            self.doing_list_id: {"id": self.doing_list_id, "name": "DOING", "idBoard": self.board_id, "closed": False},
+        }
+        self.cards: Dict[str, Dict[str, Any]] = {}
+        self.comments: List[Dict[str, Any]] = []
+        self.actions: List[Dict[str, Any]] = []
+
+        rng = random.Random(seed)
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        for n in range(num_cards):
+            name = f"{rng.choice(self.TOPICS)} #{n + 1}"
+            self.add_card(name, self.todo_list_id, start + timedelta(minutes=n))
+
+    def _next_id(self) -> str:
+        self._sequence += 1
+        return fake_id(self._sequence)
+
+    @staticmethod
+    def _timestamp(when: Optional[datetime] = None) -> str:
+        when = when or datetime.now(timezone.utc)
+        return when.strftime("%Y-%m-%dT%H:%M:%S.") + f"{when.microsecond // 1000:03d}Z"
+
+    def _log(self, action_type: str, date: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        action = {"id": self._next_id(), "type": action_type, "date": date, "data": data}
+        self.actions.append(action)
+        return action
+
+    def add_card(self, name: str, list_id: str, when: Optional[datetime] = None) -> Dict[str, Any]:
+        with self._lock:
+            card = {
+                "id": self._next_id(),
+                "name": name,
+                "desc": "",
+                "idList": list_id,
+                "idBoard": self.board_id,
+                "closed": False,
+                "pos": 16384 * (len(self.cards) + 1),
+                "dateLastActivity": self._timestamp(when),
+            }
+            self.cards[card["id"]] = card
+            self._log("createCard", card["dateLastActivity"], {
+                "card": {"id": card["id"], "name": name},
+                "list": {"id": list_id},
+            })
+            return card
+
+    def cards_in_list(self, list_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [card for card in self.cards.values() if card["idList"] == list_id and not card["closed"]]
+
+    def comment(self, card_id: str, text: str) -> Dict[str, Any]:
+        with self._lock:
+            card = self.cards[card_id]
+            card["dateLastActivity"] = self._timestamp()
+            action = self._log("commentCard", card["dateLastActivity"], {
+                "text": text,
+                "card": {"id": card_id, "name": card["name"]},
+            })
+            self.comments.append(action)
+            return action
+
+    def update(self, card_id: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            card = self.cards[card_id]
+            before = dict(card)
+            for key in ("name", "desc", "idList"):
+                if key in fields:
+                    card[key] = fields[key]
+            if "closed" in fields:
+                card["closed"] = str(fields["closed"]).lower() == "true"
+            card["dateLastActivity"] = self._timestamp()
+
+            changed = [key for key in ("name", "desc", "idList", "closed") if card[key] != before[key]]
+            data: Dict[str, Any] = {
+                "card": {"id": card_id, "name": card["name"], **{key: card[key] for key in changed}},
+                "old": {key: before[key] for key in changed},
+            }
+            if "idList" in changed:
+                data["listBefore"] = {"id": before["idList"]}
+                data["listAfter"] = {"id": card["idList"]}
+            else:
+                # Like Trello, other updates carry the list the card is in
+                data["list"] = {"id": card["idList"]}
+            self._log("updateCard", card["dateLastActivity"], data)
+            return dict(card)
+
+    def archive_list(self, list_id: str):
+        with self._lock:
+            self.lists[list_id]["closed"] = True
+            self._log("updateList", self._timestamp(), {
+                "list": {"id": list_id, "name": self.lists[list_id]["name"], "closed": True},
+                "old": {"closed": False},
+            })
+
+
+def _project(item: Dict[str, Any], fields: Optional[str]) -> Dict[str, Any]:
+    if not fields or fields == "all":
+        return dict(item)
+    keys = {"id", *fields.split(",")}
+    return {key: value for key, value in item.items() if key in keys}
+
+
+class FakeServices:
+    """
+    Local stand-in for the Trello REST endpoints and the SerpApi search
+    endpoint this project uses, for offline tests and benchmarks.
+
+    Point the app at it with the variables from `env()`. Every response can
+    be delayed by `latency` seconds, a fraction `error_rate` of requests fail
+    with a 500, and more than `rate_limit` requests per `rate_period` seconds
+    are answered with a 429 and a Retry-After of `retry_after` seconds.
+
+    Webhooks registered through `POST /1/webhooks` are checked with a HEAD
+    request, like Trello does, and then receive a signed `createCard` or
+    `updateCard` action whenever a card is created through the API or moved
+    to another list.
+
+    Usage:
+        with FakeServices(FakeBoard(num_cards=5000), latency=0.02) as services:
+            os.environ.update(services.env())
+            ...
+    """
+
+    def __init__(
+        self,
+        board: Optional[FakeBoard] = None,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: Optional[int] = None,
+        rate_period: float = 10.0,
+        retry_after: float = 1.0,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        webhook_secret: Optional[str] = None,
+    ):
+        self.board = board or FakeBoard()
+        self.webhook_secret = webhook_secret
+        self.webhooks: Dict[str, Dict[str, Any]] = {}
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.rate_period = rate_period
+        self.retry_after = retry_after
+        self.requests: List[Tuple[str, str]] = []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window: List[float] = []
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+        self._routes: List[Tuple[str, "re.Pattern[str]", Callable]] = [
+            ("GET", re.compile(r"^/1/members/me$"), self._get_member),
+            ("GET", re.compile(r"^/1/members/me/boards$"), self._get_member_boards),
+            ("GET", re.compile(r"^/1/boards/(?P<board_id>\w+)$"), self._get_board),
+            ("GET", re.compile(r"^/1/boards/(?P<board_id>\w+)/lists$"), self._get_board_lists),
+            ("GET", re.compile(r"^/1/boards/(?P<board_id>\w+)/actions$"), self._get_board_actions),
+            ("GET", re.compile(r"^/1/lists/(?P<list_id>\w+)$"), self._get_list),
+            ("GET", re.compile(r"^/1/lists/(?P<list_id>\w+)/cards$"), self._get_list_cards),
+            ("GET", re.compile(r"^/1/batch$"), self._get_batch),
+            ("POST", re.compile(r"^/1/cards/(?P<card_id>\w+)/actions/comments$"), self._post_comment),
+            ("PUT", re.compile(r"^/1/cards/(?P<card_id>\w+)$"), self._put_card),
+            ("POST", re.compile(r"^/1/cards$"), self._post_card),
+            ("POST", re.compile(r"^/1/webhooks$"), self._post_webhook),
+            ("GET", re.compile(r"^/1/tokens/(?P<token>[\w-]+)/webhooks$"), self._get_webhooks),
+            ("DELETE", re.compile(r"^/1/webhooks/(?P<webhook_id>\w+)$"), self._delete_webhook),
+            ("GET", re.compile(r"^/search(\.json)?$"), self._get_search),
+        ]
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def trello_api_url(self) -> str:
+        return f"{self.url}/1"
+
+    @property
+    def serpapi_url(self) -> str:
+        return f"{self.url}/search"
+
+    def env(self) -> Dict[str, str]:
+        """
+        Environment variables that point the app at this server and its board.
+        """
+        return {
+            "TRELLO_API_URL": self.trello_api_url,
+            "SERPAPI_URL": self.serpapi_url,
+            "TRELLO_API_KEY": FAKE_API_KEY,
+            "TRELLO_API_TOKEN": FAKE_API_TOKEN,
+            "SERPAPI_API_KEY": FAKE_SERPAPI_KEY,
+            "TRELLO_BOARD_ID": self.board.board_id,
+            "TRELLO_TOOD_LIST_ID": self.board.todo_list_id,
+            "TRELLO_DOING_LIST_ID": self.board.doing_list_id,
+        }
+
+    def start(self) -> "FakeServices":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeServices":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _throttled(self) -> bool:
+        if self.rate_limit is None:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            self._window = [t for t in self._window if now - t < self.rate_period]
+            if len(self._window) >= self.rate_limit:
+                return True
+            self._window.append(now)
+            return False
+
+    def _inject_error(self) -> bool:
+        with self._lock:
+            return self.error_rate > 0 and self._random.random() < self.error_rate
+
+    def handle(self, method: str, target: str) -> Tuple[int, Any, Dict[str, str]]:
+        """
+        Answers one request. Returns the status, the JSON body (or an error
+        string) and extra headers.
+        """
+        parsed = urlparse(target)
+        query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        with self._lock:
+            self.requests.append((method, parsed.path))
+
+        if self.latency:
+            time.sleep(self.latency)
+        if self._throttled():
+            # Whole seconds, as Trello sends; urllib3 rejects fractional values
+            return 429, "API rate limit exceeded", {"Retry-After": str(math.ceil(self.retry_after))}
+        if self._inject_error():
+            return 500, "Injected failure", {}
+        return self._dispatch(method, parsed.path, query)
+
+    def _dispatch(self, method: str, path: str, query: Dict[str, str]) -> Tuple[int, Any, Dict[str, str]]:
+        for route_method, pattern, handler in self._routes:
+            match = pattern.match(path)
+            if match and route_method == method:
+                if path.startswith("/1/") and (query.get("key") != FAKE_API_KEY or query.get("token") != FAKE_API_TOKEN):
+                    return 401, "invalid key", {}
+                if path.startswith("/search") and query.get("api_key") != FAKE_SERPAPI_KEY:
+                    return 401, {"error": "Invalid API key."}, {}
+                try:
+                    status, body = handler(query, **match.groupdict())
+                except KeyError:
+                    status, body = 404, "The requested resource was not found."
+                return status, body, {}
+        return 404, "Cannot %s %s" % (method, path), {}
+
+    def _get_member(self, query):
+        return 200, {"id": fake_id(0), "username": "fakeuser", "fullName": "Fake User"}
+
+    def _get_member_boards(self, query):
+        return 200, [self.board.board]
+
+    def _get_board(self, query, board_id):
+        if board_id != self.board.board_id:
+            raise KeyError(board_id)
+        board = _project(self.board.board, query.get("fields"))
+        if query.get("lists") in ("open", "all"):
+            board["lists"] = [dict(lst) for lst in self.board.lists.values()
+                              if query["lists"] == "all" or not lst["closed"]]
+        if query.get("cards") in ("open", "all"):
+            with self.board._lock:
+                cards = [card for card in self.board.cards.values()
+                         if query["cards"] == "all" or not card["closed"]]
+            board["cards"] = [_project(card, query.get("card_fields")) for card in cards]
+        return 200, board
+
+    def _get_board_lists(self, query, board_id):
+        if board_id != self.board.board_id:
+            raise KeyError(board_id)
+        return 200, [dict(lst) for lst in self.board.lists.values() if not lst["closed"]]
+
+    def _get_board_actions(self, query, board_id):
+        if board_id != self.board.board_id:
+            raise KeyError(board_id)
+        with self.board._lock:
+            actions = [dict(action) for action in self.board.actions]
+        # Trello accepts an action ID or a date as the cursor
+        since = query.get("since")
+        if since:
+            key = "id" if re.fullmatch(r"[0-9a-f]{24}", since) else "date"
+            actions = [action for action in actions if action[key] > since]
+        actions.reverse()
+        return 200, actions[: int(query.get("limit", 50))]
+
+    def _get_list(self, query, list_id):
+        return 200, self.board.lists[list_id]
+
+    def _get_list_cards(self, query, list_id):
+        if list_id not in self.board.lists:
+            raise KeyError(list_id)
+        cards = sorted(self.board.cards_in_list(list_id), key=lambda card: card["id"], reverse=True)
+        if "before" in query:
+            cards = [card for card in cards if card["id"] < query["before"]]
+        if "limit" in query:
+            cards = cards[: int(query["limit"])]
+        return 200, [_project(card, query.get("fields")) for card in cards]
+
+    def _get_batch(self, query):
+        results = []
+        for route in query.get("urls", "").split(","):
+            route_path, _, route_query = route.partition("?")
+            inner = {key: unquote(values[-1]) for key, values in parse_qs(route_query).items()}
+            inner.update({"key": query.get("key"), "token": query.get("token")})
+            status, body, _ = self._dispatch("GET", f"/1{route_path}", inner)
+            results.append({str(status): body})
+        return 200, results
+
+    def _post_comment(self, query, card_id):
+        return 200, self.board.comment(card_id, query.get("text", ""))
+
+    def _put_card(self, query, card_id):
+        fields = {key: value for key, value in query.items() if key not in ("key", "token")}
+        list_before = self.board.cards[card_id]["idList"]
+        card = self.board.update(card_id, fields)
+        if card["idList"] != list_before:
+            self.emit("updateCard", card, card["idList"], list_before)
+        return 200, card
+
+    def _post_card(self, query):
+        if query.get("idList") not in self.board.lists:
+            return 400, "invalid value for idList"
+        card = self.board.add_card(query.get("name", ""), query["idList"])
+        self.emit("createCard", card, card["idList"])
+        return 200, card
+
+    def _post_webhook(self, query):
+        callback_url = query.get("callbackURL", "")
+        try:
+            verified = requests.head(callback_url, timeout=5).status_code == 200
+        except requests.RequestException:
+            verified = False
+        if not verified:
+            return 400, "URL (%s) did not return 200 status code" % callback_url
+        with self._lock:
+            webhook = {
+                "id": self.board._next_id(),
+                "description": query.get("description", ""),
+                "idModel": query.get("idModel"),
+                "callbackURL": callback_url,
+                "active": True,
+            }
+            self.webhooks[webhook["id"]] = webhook
+        return 200, webhook
+
+    def _get_webhooks(self, query, token):
+        with self._lock:
+            return 200, list(self.webhooks.values())
+
+    def _delete_webhook(self, query, webhook_id):
+        with self._lock:
+            del self.webhooks[webhook_id]
+        return 200, {"_value": None}
+
+    def emit(self, action_type: str, card: Dict[str, Any], list_id: str, list_before_id: Optional[str] = None):
+        """
+        Delivers a card action to every webhook watching the board or one of
+        the lists involved, in the background as Trello does.
+        """
+        models = {self.board.board_id, list_id, list_before_id}
+        with self._lock:
+            targets = [webhook for webhook in self.webhooks.values() if webhook["idModel"] in models]
+        for webhook in targets:
+            payload = build_action(action_type, card, list_id, list_before_id, self.board.board_id)
+            threading.Thread(target=self._deliver, args=(webhook, payload), daemon=True).start()
+
+    def _deliver(self, webhook: Dict[str, Any], payload: Dict[str, Any]):
+        try:
+            send_webhook(webhook["callbackURL"], payload, self.webhook_secret)
+        except requests.RequestException:
+            # Trello retries failed deliveries later; the fake drops them
+            pass
+
+    def _get_search(self, query):
+        q = query.get("q", "")
+        num = int(query.get("num", 10))
+        return 200, {
+            "search_parameters": {"q": q, "engine": query.get("engine", "google")},
+            "organic_results": [
+                {
+                    "position": n + 1,
+                    "title": f"{q} - discussion {n + 1}",
+                    "link": f"https://www.reddit.com/r/fake/comments/{n + 1}",
+                    "snippet": f"Synthetic result {n + 1} for {q}.",
+                }
+                for n in range(num)
+            ],
+        }
+
+    def _handler_class(self):
+        services = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate writes; without this, delayed ACKs
+            # add ~40ms to every keep-alive response and swamp the measurements
+            disable_nagle_algorithm = True
+
+            def _respond(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                status, body, headers = services.handle(self.command, self.path)
+                payload = (json.dumps(body) if not isinstance(body, str) else body).encode("utf-8")
+                self.send_response(status)
+                content_type = "application/json" if not isinstance(body, str) else "text/plain"
+                self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+                # Compress like Trello does when the client accepts it
+                if "gzip" in self.headers.get("Accept-Encoding", ""):
+                    payload = gzip.compress(payload)
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(payload)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _respond
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the local Trello/SerpApi stand-in.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--cards", type=int, default=100, help="Cards generated in the TODO list")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failing with 500")
+    parser.add_argument("--rate-limit", type=int, default=None, help="Requests per period before 429s")
+    parser.add_argument("--rate-period", type=float, default=10.0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    args = parser.parse_args()
+
+    services = FakeServices(
+        FakeBoard(num_cards=args.cards),
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        rate_period=args.rate_period,
+        retry_after=args.retry_after,
+        port=args.port,
+    )
+    print(f"Fake Trello/SerpApi listening on {services.url}. Point the app at it with:\n")
+    for key, value in services.env().items():
+        print(f"export {key}={value}")
+    try:
+        services.start()
+        services._thread.join()
+    except KeyboardInterrupt:
+        services.stop()
+
+
+if __name__ == "__main__":
+    main()
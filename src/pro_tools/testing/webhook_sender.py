@@ -0,0 +1,88 @@
+import argparse
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+import requests
+
+from pro_tools.webhook_daemon import webhook_signature
+
+
+def build_action(
+    action_type: str,
+    card: Dict[str, Any],
+    list_id: str,
+    list_before_id: Optional[str] = None,
+    board_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Builds a Trello-shaped webhook payload for a card action.
+
+    Args:
+        action_type (str): "createCard" or "updateCard" (a move when
+            `list_before_id` is given).
+        card (dict): The card, with at least `id` and `name`.
+        list_id (str): The list the card is in after the action.
+        list_before_id (str): The list the card moved out of.
+        board_id (str): The board, used as the webhook model.
+    """
+    data: Dict[str, Any] = {"card": {"id": card["id"], "name": card["name"]}}
+    if list_before_id:
+        data["listBefore"] = {"id": list_before_id}
+        data["listAfter"] = {"id": list_id}
+        data["old"] = {"idList": list_before_id}
+    else:
+        data["list"] = {"id": list_id}
+    if board_id:
+        data["board"] = {"id": board_id}
+    now = datetime.now(timezone.utc)
+    return {
+        "action": {
+            "type": action_type,
+            "date": now.strftime("%Y-%m-%dT%H:%M:%S.") + f"{now.microsecond // 1000:03d}Z",
+            "data": data,
+        },
+        "model": {"id": board_id or list_id},
+    }
+
+
+def send_webhook(
+    url: str,
+    payload: Dict[str, Any],
+    secret: Optional[str] = None,
+    callback_url: Optional[str] = None,
+    timeout: float = 10.0,
+) -> int:
+    """
+    POSTs a webhook payload to `url` the way Trello does, signed when a
+    secret is given.
+
+    Returns:
+        int: The response status code.
+    """
+    body = json.dumps(payload).encode("utf-8")
+    headers = {"Content-Type": "application/json"}
+    if secret:
+        headers["X-Trello-Webhook"] = webhook_signature(body, callback_url or url, secret)
+    return requests.post(url, data=body, headers=headers, timeout=timeout).status_code
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send a simulated Trello webhook to the daemon.")
+    parser.add_argument("url", help="The daemon's webhook endpoint")
+    parser.add_argument("--card-id", required=True)
+    parser.add_argument("--name", required=True)
+    parser.add_argument("--list-id", required=True, help="The list the card is in after the action")
+    parser.add_argument("--from-list-id", help="Simulate a move out of this list instead of a new card")
+    parser.add_argument("--secret", help="Sign the payload with this application secret")
+    parser.add_argument("--callback-url", help="The callback URL the daemon registered, if not `url`")
+    args = parser.parse_args()
+
+    action_type = "updateCard" if args.from_list_id else "createCard"
+    payload = build_action(action_type, {"id": args.card_id, "name": args.name}, args.list_id, args.from_list_id)
+    status = send_webhook(args.url, payload, args.secret, args.callback_url)
+    print(f"{action_type} for {args.card_id} delivered: {status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import asyncio
+import os
+import unittest
+from unittest.mock import patch
+
+from pro_tools.utils.async_trello_utils import AsyncTrelloUtils
+from pro_tools.utils.rate_limiter import TokenBucket
+from pro_tools.utils.trello_utils import CARD_FIELDS
+
+
+class FakeAsyncTrelloUtils(AsyncTrelloUtils):
+    """AsyncTrelloUtils with the network replaced by an in-memory fake."""
+
+    def __init__(self, *args, fail_comment_for=(), **kwargs):
+        super().__init__("key", "token", *args, **kwargs)
+        self.fail_comment_for = set(fail_comment_for)
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _request(self, method, path, params=None):
+        async with self._semaphore:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.calls.append((method, path, params))
+            await asyncio.sleep(0.01)
+            self.in_flight -= 1
+        card_id = path.split("/")[2] if path.startswith("/cards/") else None
+        if method == "POST" and card_id in self.fail_comment_for:
+            return 500, "boom"
+        return 200, {}
+
+
+class TestAsyncTrelloUtils(unittest.TestCase):
+    """Test concurrent comment-and-move handling of the async Trello client."""
+
+    def test_comment_and_move_cards_is_bounded_by_concurrency(self):
+        """Test that updates run concurrently but never exceed the limit."""
+        trello = FakeAsyncTrelloUtils(concurrency=3)
+        updates = [{"card_id": f"card{i}", "text": f"article {i}"} for i in range(10)]
+
+        results = asyncio.run(trello.comment_and_move_cards(updates, list_id="doing"))
+
+        self.assertEqual([r["card_id"] for r in results], [u["card_id"] for u in updates])
+        self.assertTrue(all(r["move"] == "Card updated successfully." for r in results))
+        self.assertEqual(trello.max_in_flight, 3)
+        self.assertEqual(len(trello.calls), 20)
+
+    def test_failed_comment_skips_move(self):
+        """Test that a card is not moved when its comment could not be added."""
+        trello = FakeAsyncTrelloUtils(fail_comment_for={"bad"})
+
+        result = asyncio.run(trello.comment_and_move_card("bad", "text", "doing"))
+
+        self.assertTrue(result["comment"].startswith("Error: 500"))
+        self.assertTrue(result["move"].startswith("Skipped"))
+        self.assertEqual(len(trello.calls), 1)
+
+    def test_card_listing_follows_the_lean_payload_switch(self):
+        """Test that listing cards asks for the sync client's card fields unless lean payloads are off."""
+        trello = FakeAsyncTrelloUtils()
+
+        asyncio.run(trello.get_cards_in_list("todo"))
+        with patch.dict(os.environ, {"TRELLO_LEAN_PAYLOADS": "false"}):
+            asyncio.run(trello.get_cards_in_list("todo"))
+
+        self.assertEqual([params for _, _, params in trello.calls], [{"fields": CARD_FIELDS}, None])
+
+    def test_rate_limiter_waits_for_tokens(self):
+        """Test that acquisitions beyond the bucket size wait for tokens to refill."""
+        limiter = TokenBucket(capacity=2, period=0.1)
+
+        async def acquire_three():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            for _ in range(3):
+                await limiter.acquire_async()
+            return loop.time() - start
+
+        self.assertGreaterEqual(asyncio.run(acquire_three()), 0.045)
+
+
+if __name__ == '__main__':
+    unittest.main()
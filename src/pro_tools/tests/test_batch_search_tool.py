@@ -0,0 +1,44 @@
+import os
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from pro_tools.tools.RedditBatchSearchTool import RedditSerpApiBatchSearchTool
+
+
+class TestBatchSearchTool(unittest.TestCase):
+    """Test the multi-query batch search mode."""
+
+    @patch.dict(os.environ, {
+        'SERPAPI_API_KEY': 'key',
+        'SERPAPI_CACHE_ENABLED': 'false',
+        'SERPAPI_MAX_CONCURRENCY': '2',
+    })
+    def test_queries_run_concurrently_and_are_grouped(self):
+        """Test that unique queries run under the cap and come back grouped in order."""
+        lock = threading.Lock()
+        state = {"in_flight": 0, "max_in_flight": 0}
+
+        def fake_search(query, max_results):
+            with lock:
+                state["in_flight"] += 1
+                state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+            time.sleep(0.02)
+            with lock:
+                state["in_flight"] -= 1
+            return f"results for {query}"
+
+        tool = RedditSerpApiBatchSearchTool()
+        with patch.object(tool, '_search_with_serpapi', side_effect=fake_search) as search:
+            output = tool._run(["gpt-5", "llama 4", "gpt-5", " ", "claude"])
+
+        self.assertEqual(search.call_count, 3)
+        self.assertEqual(state["max_in_flight"], 2)
+        self.assertLess(output.index("## Query: gpt-5"), output.index("## Query: llama 4"))
+        self.assertLess(output.index("## Query: llama 4"), output.index("## Query: claude"))
+        self.assertIn("results for claude", output)
+
+
+if __name__ == '__main__':
+    unittest.main()
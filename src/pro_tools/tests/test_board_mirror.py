@@ -0,0 +1,134 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from pro_tools.testing.fake_services import FakeBoard, FakeServices
+from pro_tools.tools.TrelloUpdateCardTool import TrelloUpdateCardTool
+from pro_tools.utils import async_trello_utils
+from pro_tools.utils import trello_utils as trello_utils_module
+from pro_tools.utils.trello_utils import TrelloUtils
+
+
+class TestBoardMirror(unittest.TestCase):
+    """Test that Trello reads answered from the board mirror match Trello itself."""
+
+    def setUp(self):
+        self.services = FakeServices(FakeBoard(num_cards=30)).start()
+        self.addCleanup(self.services.stop)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        env = patch.dict(os.environ, {
+            **self.services.env(),
+            "TRELLO_RATE_LIMIT": "1000000",
+            "BOARD_MIRROR_ENABLED": "true",
+            "BOARD_MIRROR_PATH": os.path.join(self.tmp_dir.name, "mirror.sqlite3"),
+            "BOARD_MIRROR_MAX_AGE": "0",
+        })
+        env.start()
+        self.addCleanup(env.stop)
+        self.board = self.services.board
+        self.mirrored = TrelloUtils(verify_access=False)
+
+    def _live(self):
+        with patch.dict(os.environ, {"BOARD_MIRROR_ENABLED": "false"}):
+            return TrelloUtils(verify_access=False)
+
+    @staticmethod
+    def _by_id(cards):
+        # The stand-in lists cards newest first; the mirror keeps board order
+        return sorted(cards, key=lambda card: card["id"])
+
+    def _assert_matches_trello(self):
+        live = self._live()
+        todo = self.board.todo_list_id
+        self.assertEqual(self._by_id(self.mirrored.get_cards_in_list(todo)),
+                         self._by_id(live.get_cards_in_list(todo)))
+        self.assertEqual(self._by_id(self.mirrored.iter_cards_in_list(self.board.doing_list_id)),
+                         self._by_id(live.get_cards_in_list(self.board.doing_list_id)))
+        self.assertEqual(self.mirrored.get_board_lists(self.board.board_id),
+                         live.get_board_lists(self.board.board_id))
+
+    def _requests_to(self, suffix):
+        return sum(1 for _, path in self.services.requests if path.endswith(suffix))
+
+    def test_delta_sync_replays_only_new_actions(self):
+        """Test that changes reach the mirror through the actions feed, not full reloads."""
+        todo, doing = self.board.todo_list_id, self.board.doing_list_id
+        self.assertEqual(len(self.mirrored.get_cards_in_list(todo)), 30)
+        self.assertEqual(self._requests_to("/batch"), 1)
+
+        cards = self.board.cards_in_list(todo)
+        self.board.add_card("Tool calling", todo)
+        self.board.update(cards[0]["id"], {"idList": doing})
+        self.board.update(cards[1]["id"], {"name": "Renamed"})
+        self.board.update(cards[2]["id"], {"closed": "true"})
+        self.board.comment(cards[3]["id"], "# Article")
+        self._assert_matches_trello()
+
+        self.assertEqual(self._requests_to("/batch"), 1)
+        self.assertGreaterEqual(self._requests_to("/actions"), 1)
+        self.assertEqual(self.mirrored.verify_list(doing)["name"], "DOING")
+        self.assertEqual(self.mirrored.count_cards_in_list(todo), 29)
+        snapshot = self.mirrored.get_startup_snapshot(self.board.board_id, todo)
+        self.assertEqual(self._by_id(snapshot["cards"]), self._by_id(self._live().get_cards_in_list(todo)))
+
+    def test_unarchived_card_returns_to_the_mirror(self):
+        """Test that a card archived and then restored shows up in its list again."""
+        todo = self.board.todo_list_id
+        card_id = self.board.cards_in_list(todo)[0]["id"]
+        self.mirrored.get_cards_in_list(todo)
+
+        self.board.update(card_id, {"closed": "true"})
+        self.assertNotIn(card_id, [card["id"] for card in self.mirrored.get_cards_in_list(todo)])
+        self.board.update(card_id, {"closed": "false"})
+
+        self.assertIn(card_id, [card["id"] for card in self.mirrored.get_cards_in_list(todo)])
+        self._assert_matches_trello()
+
+    def test_fresh_mirror_skips_sync(self):
+        """Test that reads within BOARD_MIRROR_MAX_AGE make no Trello requests."""
+        with patch.dict(os.environ, {"BOARD_MIRROR_MAX_AGE": "3600"}):
+            self.mirrored.get_cards_in_list(self.board.todo_list_id)
+            before = len(self.services.requests)
+            self.mirrored.verify_board_access(self.board.board_id)
+            self.mirrored.verify_list(self.board.todo_list_id)
+            self.mirrored.get_cards_in_list(self.board.todo_list_id)
+        self.assertEqual(len(self.services.requests), before)
+
+    def test_own_writes_reach_a_fresh_mirror(self):
+        """Test that cards this process moves out of TODO leave the mirror before BOARD_MIRROR_MAX_AGE."""
+        todo = self.board.todo_list_id
+        with patch.dict(os.environ, {"BOARD_MIRROR_MAX_AGE": "3600"}):
+            cards = self.mirrored.get_cards_in_list(todo)
+            TrelloUpdateCardTool()._run(cards[0]["id"], idList=self.board.doing_list_id)
+            async_trello_utils.move_cards([cards[1]["id"]], self.board.doing_list_id)
+
+            listed = [card["id"] for card in self.mirrored.get_cards_in_list(todo)]
+        self.assertNotIn(cards[0]["id"], listed)
+        self.assertNotIn(cards[1]["id"], listed)
+        self.assertEqual(self._requests_to("/batch"), 1)
+        self._assert_matches_trello()
+
+    def test_archived_list_and_large_backlog(self):
+        """Test that archived lists drop out and a large backlog reloads the board."""
+        self.mirrored.get_board_lists(self.board.board_id)
+        self.board.archive_list(self.board.doing_list_id)
+        self.assertEqual([lst["id"] for lst in self.mirrored.get_board_lists(self.board.board_id)],
+                         [self.board.todo_list_id])
+
+        for n in range(5):
+            self.board.add_card(f"Card {n}", self.board.todo_list_id)
+        with patch.object(trello_utils_module, "MAX_MIRROR_ACTIONS", 3):
+            self._assert_matches_trello()
+        self.assertEqual(self._requests_to("/batch"), 2)
+
+    def test_failed_sync_reads_from_trello(self):
+        """Test that reads fall back to Trello when the mirror cannot sync."""
+        with patch.object(TrelloUtils, "_load_board_snapshot", side_effect=ValueError("boom")):
+            cards = self.mirrored.get_cards_in_list(self.board.todo_list_id)
+        self.assertEqual(cards, self._live().get_cards_in_list(self.board.todo_list_id))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from pro_tools.crew import ProTools
+from pro_tools.models.article import Section
+from pro_tools.models.publish_result import CardPublishResult, PublishReport
+from pro_tools.models.research import Topic
+from pro_tools.utils.card_ledger import CardLedger
+
+
+class TestCardLedger(unittest.TestCase):
+    """Test resuming runs from the processed-card ledger."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "ledger.sqlite3")
+        self.ledger = CardLedger(self.path)
+
+        topic = Topic(id="researched", name="Researched", research="notes")
+        section = Section(id="written", name="Written", article="# Written")
+        self.ledger.record("done", "published", "t1")
+        self.ledger.record("researched", "research", "t1", topic.model_dump())
+        self.ledger.record("written", "article", "t1", section.model_dump())
+        self.ledger.record("changed", "published", "t1")
+
+        self.cards = [
+            {"id": "new", "name": "New", "dateLastActivity": "t1"},
+            {"id": "done", "name": "Done", "dateLastActivity": "t1"},
+            {"id": "researched", "name": "Researched", "dateLastActivity": "t1"},
+            {"id": "written", "name": "Written", "dateLastActivity": "t1"},
+            {"id": "changed", "name": "Changed", "dateLastActivity": "t2"},
+        ]
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_plan_sorts_cards_by_last_completed_stage(self):
+        """Test that unchanged cards resume and changed cards start over."""
+        plan = self.ledger.plan(self.cards)
+
+        self.assertEqual([card["id"] for card in plan.fresh], ["new", "changed"])
+        self.assertEqual([card["id"] for card in plan.done], ["done"])
+        self.assertEqual([card["id"] for card in plan.from_article], ["researched"])
+        self.assertEqual(plan.from_article[0]["topic"].research, "notes")
+        self.assertEqual([section.id for section in plan.to_publish], ["written"])
+
+    def test_record_keeps_last_activity_when_not_given(self):
+        """Test that recording a later stage keeps the card's known activity date."""
+        self.ledger.record("researched", "published")
+
+        self.assertEqual(self.ledger.get("researched")["date_last_activity"], "t1")
+
+    @patch('pro_tools.crew.publish_sections')
+    def test_resume_cards_only_returns_cards_needing_the_full_pipeline(self, mock_publish_sections):
+        """Test that resumed cards are published or re-written without research."""
+        mock_publish_sections.return_value = PublishReport(results=[CardPublishResult(
+            card_id="written", name="Written", status="succeeded", comment="ok", move="ok")])
+
+        with patch.dict(os.environ, {'CARD_LEDGER_ENABLED': 'true', 'CARD_LEDGER_PATH': self.path}):
+            pro_tools = ProTools()
+            with patch('pro_tools.crew.ProTools') as mock_resumed:
+                mock_resumed.return_value.publish_report = None
+                remaining, report = pro_tools.resume_cards(self.cards)
+
+        self.assertEqual([card["id"] for card in remaining], ["new", "changed"])
+        self.assertEqual([result.card_id for result in report.succeeded], ["written"])
+        mock_resumed.assert_called_once_with(direct_write=False, start_stage="article", stream_results=False)
+        inputs = mock_resumed.return_value.crew.return_value.kickoff.call_args.kwargs["inputs"]
+        self.assertEqual([card["id"] for card in inputs["trello_cards"]], ["researched"])
+        self.assertIn("notes", inputs["research_topics"])
+        self.assertEqual(self.ledger.get("written")["stage"], "published")
+
+    @patch('pro_tools.crew.move_cards')
+    @patch('pro_tools.crew.publish_sections')
+    def test_failed_move_is_retried_without_commenting_again(self, mock_publish_sections, mock_move_cards):
+        """Test that a card commented on but not moved only gets its move retried, though its activity changed."""
+        mock_publish_sections.return_value = PublishReport(results=[CardPublishResult(
+            card_id="written", name="Written", status="failed",
+            comment="Comment added successfully.", move="Error: 500 - boom")])
+        mock_move_cards.return_value = PublishReport(results=[CardPublishResult(
+            card_id="written", name="Written", status="succeeded",
+            comment="Skipped: already commented.", move="Card updated successfully.")])
+        written = self.cards[3]
+        with patch.dict(os.environ, {'CARD_LEDGER_ENABLED': 'true', 'CARD_LEDGER_PATH': self.path}):
+            pro_tools = ProTools()
+            _, first = pro_tools.resume_cards([written])
+            self.assertEqual(self.ledger.get("written")["stage"], "commented")
+            # Our own comment moved the card's dateLastActivity on
+            remaining, second = pro_tools.resume_cards([{**written, "dateLastActivity": "t3"}])
+
+        self.assertEqual([result.card_id for result in first.failed], ["written"])
+        self.assertEqual(remaining, [])
+        self.assertEqual([result.card_id for result in second.succeeded], ["written"])
+        mock_publish_sections.assert_called_once()
+        self.assertEqual([card["id"] for card in mock_move_cards.call_args.args[0]], ["written"])
+        self.assertEqual(self.ledger.get("written")["stage"], "published")
+
+    def test_article_stage_crew_skips_research(self):
+        """Test that a crew resumed at the article stage has no research_task."""
+        crew = ProTools(start_stage="article").crew()
+
+        self.assertEqual([task.name for task in crew.tasks], ["article_task", "trello_update_task"])
+        self.assertIn("{research_topics}", crew.tasks[0].description)
+
+
+if __name__ == '__main__':
+    unittest.main()
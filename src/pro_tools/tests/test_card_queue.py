@@ -0,0 +1,185 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from pro_tools.crew import ProTools
+from pro_tools.models.publish_result import CardPublishResult, PublishReport
+from pro_tools.models.run_result import CardResult
+from pro_tools.queue_worker import QueueWorker
+from pro_tools.utils.card_queue import CardQueue
+
+CARDS = [{"id": f"c{n}", "name": f"Topic {n}", "dateLastActivity": "2025-01-01T00:00:00.000Z"} for n in range(6)]
+
+
+class TestCardQueue(unittest.TestCase):
+    """Test leasing cards from the shared SQLite queue."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.path = os.path.join(self.tmp_dir.name, "queue.sqlite3")
+
+    def _queue(self, **kwargs):
+        return CardQueue(self.path, **kwargs)
+
+    def test_concurrent_claims_never_overlap(self):
+        """Test that workers racing on one queue each get different cards and all cards are handed out."""
+        self._queue().enqueue(CARDS)
+        claimed = []
+        lock = threading.Lock()
+
+        def claim(worker):
+            _, cards = self._queue().claim(worker, limit=2)
+            with lock:
+                claimed.extend(card["id"] for card in cards)
+
+        threads = [threading.Thread(target=claim, args=(f"w{n}",)) for n in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(claimed), [card["id"] for card in CARDS])
+        self.assertEqual(self._queue().stats()["leased"], 6)
+
+    def test_expired_leases_are_redelivered(self):
+        """Test that a crashed worker's cards go to the next claim and its late ack is refused."""
+        queue = self._queue(lease_seconds=0.05, max_attempts=2)
+        queue.enqueue(CARDS[:2])
+        crashed, cards = queue.claim("crashed", limit=2)
+        self.assertEqual(queue.claim("other")[1], [])
+
+        time.sleep(0.1)
+        token, redelivered = queue.claim("other", limit=2)
+        self.assertEqual([card["id"] for card in redelivered], ["c0", "c1"])
+        self.assertEqual(queue.ack(crashed, ["c0"]), [])
+        self.assertEqual(queue.ack(token, ["c0"]), ["c0"])
+
+        # The second lease of c1 also runs out, which uses up its attempts
+        time.sleep(0.1)
+        self.assertEqual(queue.claim("third"), (None, []))
+        self.assertEqual(queue.stats(), {"queued": 0, "leased": 0, "done": 1, "failed": 1})
+
+    def test_enqueue_skips_known_cards_until_they_change(self):
+        """Test that re-enqueuing the list only requeues finished cards whose activity changed."""
+        queue = self._queue()
+        self.assertEqual(queue.enqueue(CARDS[:2]), 2)
+        token, _ = queue.claim("w", limit=2)
+        queue.ack(token, ["c0", "c1"])
+
+        self.assertEqual(queue.enqueue(CARDS[:2]), 0)
+        moved_back = {**CARDS[0], "dateLastActivity": "2025-02-01T00:00:00.000Z"}
+        self.assertEqual(queue.enqueue([moved_back, CARDS[1]]), 1)
+        self.assertEqual([card["id"] for card in queue.claim("w")[1]], ["c0"])
+
+
+class TestQueueWorker(unittest.TestCase):
+    """Test the worker loop and the crew's use of the queue."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.queue = CardQueue(os.path.join(self.tmp_dir.name, "queue.sqlite3"))
+
+    def test_worker_acks_successes_and_retries_failures(self):
+        """Test that a worker drains the queue, retrying a failed card until its attempts run out."""
+        self.queue.enqueue(CARDS[:3])
+        batches = []
+
+        def process(cards):
+            batches.append([card["id"] for card in cards])
+            return [
+                CardResult(card_id=card["id"], name=card["name"],
+                           status="failed" if card["id"] == "c1" else "succeeded", error="boom")
+                for card in cards
+            ]
+
+        report = QueueWorker(self.queue, process=process, batch_size=3).run()
+
+        self.assertEqual(batches, [["c0", "c1", "c2"], ["c1"], ["c1"]])
+        self.assertEqual(len(report.failed), 3)
+        self.assertEqual(self.queue.stats(), {"queued": 0, "leased": 0, "done": 2, "failed": 1})
+
+    def test_run_claims_its_share_and_acks_after_kickoff(self):
+        """Test that prepare_inputs only hands the crew claimed cards and acknowledge_cards finishes them."""
+        env = patch.dict(os.environ, {"CARD_QUEUE_ENABLED": "true", "CARD_QUEUE_BATCH_SIZE": "4"})
+        env.start()
+        self.addCleanup(env.stop)
+        with patch("pro_tools.crew.CardQueue", return_value=self.queue):
+            first, second = ProTools(), ProTools()
+        for pro_tools in (first, second):
+            pro_tools.load_trello_cards = MagicMock(return_value=list(CARDS))
+
+        first_ids = [card["id"] for card in first.prepare_inputs({})["trello_cards"]]
+        second_ids = [card["id"] for card in second.prepare_inputs({})["trello_cards"]]
+        self.assertEqual(first_ids, ["c0", "c1", "c2", "c3"])
+        self.assertEqual(second_ids, ["c4", "c5"])
+
+        first.acknowledge_cards(MagicMock())
+        self.assertIsNone(first._lease_keeper)
+        self.assertEqual(self.queue.stats()["done"], 4)
+        second._stop_lease_keeper()
+
+    def test_cards_without_a_published_section_go_back_to_the_queue(self):
+        """Test that acknowledge_cards acks only published cards and releases failed and left-out ones."""
+        env = patch.dict(os.environ, {"CARD_QUEUE_ENABLED": "true", "CARD_QUEUE_BATCH_SIZE": "3"})
+        env.start()
+        self.addCleanup(env.stop)
+        with patch("pro_tools.crew.CardQueue", return_value=self.queue):
+            pro_tools = ProTools()
+        pro_tools.load_trello_cards = MagicMock(return_value=list(CARDS))
+        pro_tools.prepare_inputs({})
+        pro_tools.publish_report = PublishReport(results=[
+            CardPublishResult(card_id="c0", name="Topic 0", status="succeeded",
+                              comment="Comment added successfully.", move="Card updated successfully."),
+            CardPublishResult(card_id="c1", name="Topic 1", status="failed",
+                              comment="Error: 500 - boom", move="Skipped: comment failed."),
+        ])
+
+        pro_tools.acknowledge_cards(MagicMock())
+
+        self.assertEqual(self.queue.stats(), {"queued": 5, "leased": 0, "done": 1, "failed": 0})
+
+    def test_worker_requeues_cards_left_out_of_the_article(self):
+        """Test that a queue worker running the crew gives back a card the Article did not cover."""
+        self.queue.enqueue(CARDS[:2])
+        with patch("pro_tools.runner.ProTools") as mock_pro_tools:
+            mock_pro_tools.return_value.resume_cards.side_effect = lambda cards: (cards, PublishReport())
+            mock_pro_tools.return_value.crew.return_value.kickoff.return_value = MagicMock(raw="done")
+            mock_pro_tools.return_value.publish_report = PublishReport(results=[
+                CardPublishResult(card_id="c0", name="Topic 0", status="succeeded", comment="ok", move="ok"),
+            ])
+            QueueWorker(self.queue, batch_size=2).run_once()
+
+        self.assertEqual(self.queue.stats(), {"queued": 1, "leased": 0, "done": 1, "failed": 0})
+
+    def test_cards_that_fail_to_resume_go_back_to_the_queue(self):
+        """Test that prepare_inputs acks resumed cards that published and releases those that failed."""
+        env = patch.dict(os.environ, {"CARD_QUEUE_ENABLED": "true", "CARD_QUEUE_BATCH_SIZE": "4"})
+        env.start()
+        self.addCleanup(env.stop)
+        with patch("pro_tools.crew.CardQueue", return_value=self.queue):
+            pro_tools = ProTools()
+        pro_tools.load_trello_cards = MagicMock(return_value=list(CARDS))
+        resumed = PublishReport(results=[
+            CardPublishResult(card_id="c2", name="Topic 2", status="succeeded",
+                              comment="Comment added successfully.", move="Card updated successfully."),
+            CardPublishResult(card_id="c3", name="Topic 3", status="failed",
+                              comment="Error: 500 - boom", move="Skipped: comment failed."),
+        ])
+        pro_tools.resume_cards = MagicMock(side_effect=lambda cards: (cards[:1], resumed))
+
+        inputs = pro_tools.prepare_inputs({})
+        pro_tools._stop_lease_keeper()
+
+        self.assertEqual([card["id"] for card in inputs["trello_cards"]], ["c0"])
+        # c1 was skipped as already published, c2 was published on resume
+        self.assertEqual(self.queue.stats(), {"queued": 3, "leased": 1, "done": 2, "failed": 0})
+        self.assertEqual(sorted(card["id"] for card in self.queue.claim("other", 6)[1]), ["c3", "c4", "c5"])
+
+
+if __name__ == "__main__":
+    unittest.main()
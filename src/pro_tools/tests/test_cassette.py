@@ -0,0 +1,132 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from crewai.llm import LLM
+
+from pro_tools import main
+from pro_tools.crew import ProTools
+from pro_tools.utils.cassette import Cassette, CassetteMiss
+
+RESEARCH = {"research_topics": [{"id": "c1", "name": "AI agents", "research": "Notes on agents"}]}
+ARTICLE = {"sections": [{"id": "c1", "name": "AI agents", "article": "# AI agents"}]}
+
+
+class Echo:
+    def __init__(self):
+        self.calls = 0
+
+    def say(self, text):
+        self.calls += 1
+        return f"{text} #{self.calls}"
+
+
+def interaction(kind, name, response):
+    return {"kind": kind, "name": name, "key": "recorded-elsewhere", "request": {},
+            "response": response, "duration": 0.0}
+
+
+def final_answer(payload):
+    return f"Thought: I now know the final answer\nFinal Answer: {json.dumps(payload)}"
+
+
+class TestCassette(unittest.TestCase):
+    """Test recording and replaying LLM, tool and Trello interactions."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.path = os.path.join(self.tmp_dir.name, "cassette.json")
+
+    def write_cassette(self, interactions):
+        with open(self.path, "w") as f:
+            json.dump({"version": 1, "interactions": interactions}, f)
+
+    def test_replay_serves_recordings_by_request_in_order(self):
+        """Test that replays match on the request and serve repeated calls in recorded order."""
+        echo = Echo()
+        with Cassette(self.path, mode="record") as cassette:
+            cassette.wrap(Echo, "say", "tool", "Echo", lambda self, text: {"text": text})
+            recorded = [echo.say("a"), echo.say("b"), echo.say("a")]
+        self.assertEqual(recorded, ["a #1", "b #2", "a #3"])
+
+        with Cassette(self.path, mode="replay") as cassette:
+            cassette.wrap(Echo, "say", "tool", "Echo", lambda self, text: {"text": text})
+            replayed = [echo.say("a"), echo.say("a"), echo.say("b")]
+            with self.assertRaises(CassetteMiss):
+                echo.say("a")
+
+        self.assertEqual(replayed, ["a #1", "a #3", "b #2"])
+        self.assertEqual(echo.calls, 3)
+        self.assertNotIn("say", {key for key, value in vars(Echo).items() if hasattr(value, "__wrapped__")})
+
+    def test_unmatched_requests_fall_back_to_the_next_recording(self):
+        """Test that a changed request replays the next unused recording of the same name."""
+        self.write_cassette([interaction("tool", "Echo", "first"), interaction("tool", "Echo", "second")])
+        echo = Echo()
+
+        with Cassette(self.path, mode="replay") as cassette:
+            cassette.wrap(Echo, "say", "tool", "Echo", lambda self, text: {"text": text})
+            self.assertEqual([echo.say("x"), echo.say("y")], ["first", "second"])
+
+    @patch('pro_tools.utils.http_client.get_session', side_effect=AssertionError("network used"))
+    def test_crew_replays_end_to_end_without_network_or_llm(self, mock_get_session):
+        """Test that a direct-write run completes from the cassette alone."""
+        self.write_cassette([
+            interaction("trello", "load_trello_cards", [{"id": "c1", "name": "AI agents"}]),
+            interaction("llm", "completion", final_answer(RESEARCH)),
+            interaction("llm", "completion", final_answer(ARTICLE)),
+            interaction("trello", "publish_article", {"results": [{
+                "card_id": "c1", "name": "AI agents", "status": "succeeded",
+                "comment": "Comment added successfully.", "move": "Card updated successfully.",
+            }]}),
+        ])
+        original_call = LLM.call
+        # The tasks write research.txt and article.txt to the working directory
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.tmp_dir.name)
+
+        with patch.dict(os.environ, {'CREWAI_TESTING': 'true', 'OTEL_SDK_DISABLED': 'true',
+                                     'TRELLO_DIRECT_WRITE': 'true'}):
+            with Cassette(self.path, mode="replay") as cassette:
+                pro_tools = ProTools()
+                output = pro_tools.crew().kickoff()
+
+        self.assertEqual(output.pydantic.sections[0].article, "# AI agents")
+        self.assertEqual([result.card_id for result in pro_tools.publish_report.succeeded], ["c1"])
+        self.assertEqual(cassette.replayed_count, 4)
+        self.assertIs(LLM.call, original_call)
+
+    def test_streamed_card_listing_is_recorded_and_replayed(self):
+        """Test that the batched mode's card stream is recorded as a list and replayed without Trello."""
+        cards = [{"id": "c1", "name": "AI agents"}, {"id": "c2", "name": "Tool calling"}]
+
+        def stream(pro_tools, page_size=None):
+            yield from cards
+
+        with patch.object(ProTools, "iter_trello_cards", stream), Cassette(self.path, mode="record"):
+            self.assertEqual(list(ProTools().iter_trello_cards()), cards)
+        with patch("pro_tools.crew.TrelloUtils", side_effect=AssertionError("Trello used")), \
+                Cassette(self.path, mode="replay") as cassette:
+            self.assertEqual(list(ProTools().iter_trello_cards()), cards)
+            self.assertEqual(cassette.replayed_count, 1)
+
+    def test_playback_overrides_the_environment_only_while_replaying(self):
+        """Test that playback disables the ledger for the replayed run and restores it afterwards."""
+        self.write_cassette([])
+        seen = {}
+
+        def fake_run():
+            seen["ledger"] = os.environ.get("CARD_LEDGER_ENABLED")
+
+        with patch.dict(os.environ, {'CARD_LEDGER_ENABLED': 'true', 'CASSETTE_PATH': self.path}), \
+                patch('pro_tools.main.run', side_effect=fake_run), patch('sys.argv', ['playback']):
+            main.playback()
+            self.assertEqual(os.environ["CARD_LEDGER_ENABLED"], "true")
+
+        self.assertEqual(seen["ledger"], "false")
+
+if __name__ == '__main__':
+    unittest.main()
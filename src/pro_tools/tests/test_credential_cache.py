@@ -0,0 +1,83 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+
+from pro_tools.utils.credential_cache import CredentialCache, invalidate_on_auth_failure
+from pro_tools.utils.trello_utils import TrelloUtils
+
+
+class TestCredentialCache(unittest.TestCase):
+    """Test the on-disk cache of Trello credential verifications."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "credentials.json")
+        self.env = patch.dict(os.environ, {
+            'TRELLO_API_KEY': 'key',
+            'TRELLO_API_TOKEN': 'token',
+            'TRELLO_CREDENTIAL_CACHE_PATH': self.path,
+            'TRELLO_CREDENTIAL_CACHE_TTL': '60',
+        })
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+        self.tmp_dir.cleanup()
+
+    def test_entries_expire_after_ttl(self):
+        """Test that a verification older than the TTL is ignored."""
+        cache = CredentialCache(ttl=60)
+        cache.set('key', 'token', {'username': 'me'})
+        self.assertEqual(cache.get('key', 'token')['username'], 'me')
+        self.assertIsNone(cache.get('key', 'other-token'))
+
+        with patch('pro_tools.utils.credential_cache.time.time', return_value=time.time() + 61):
+            self.assertIsNone(cache.get('key', 'token'))
+
+    def test_credentials_are_not_stored_in_plain_text(self):
+        """Test that only a hash of the key and token is written to disk."""
+        CredentialCache().set('key', 'token', {'username': 'me'})
+        with open(self.path) as file:
+            contents = file.read()
+        self.assertNotIn('token', contents.replace('"username"', ''))
+
+    @patch('pro_tools.utils.trello_utils.http_client')
+    def test_cached_verification_skips_network(self, mock_http_client):
+        """Test that a second TrelloUtils makes no request while the cache is fresh."""
+        response = MagicMock(status_code=200)
+        response.json.return_value = {'username': 'me', 'fullName': 'Me'}
+        mock_http_client.get.return_value = response
+
+        TrelloUtils()
+        TrelloUtils()
+
+        mock_http_client.get.assert_called_once()
+
+    def test_auth_failure_invalidates_cache(self):
+        """Test that a 401 from Trello drops the cached verification."""
+        cache = CredentialCache()
+        cache.set('key', 'token', {'username': 'me'})
+
+        response = MagicMock(status_code=401)
+        response.request.url = "https://api.trello.com/1/lists/abc?key=key&token=token"
+        invalidate_on_auth_failure(response)
+
+        self.assertIsNone(cache.get('key', 'token'))
+
+    def test_auth_failure_from_overridden_api_url_invalidates_cache(self):
+        """Test that a 401 from a TRELLO_API_URL override is recognised as a Trello call."""
+        cache = CredentialCache()
+        cache.set('key', 'token', {'username': 'me'})
+
+        response = MagicMock(status_code=401)
+        response.request.url = "http://127.0.0.1:8765/1/lists/abc?key=key&token=token"
+        with patch.dict(os.environ, {'TRELLO_API_URL': 'http://127.0.0.1:8765/1'}):
+            invalidate_on_auth_failure(response)
+
+        self.assertIsNone(cache.get('key', 'token'))
+
+
+if __name__ == '__main__':
+    unittest.main()
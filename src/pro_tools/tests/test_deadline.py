@@ -0,0 +1,134 @@
+import os
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import requests
+
+from pro_tools.crew import ProTools
+from pro_tools.tools.TrelloAddCardCommentTool import TrelloAddCardCommentTool
+from pro_tools.utils import deadline, http_client
+from pro_tools.utils.metrics import get_metrics
+
+
+class SlowServer:
+    """Local HTTP server whose first `slow_requests` responses take `delay` seconds."""
+
+    def __init__(self, delay: float, slow_requests: int = 1):
+        self.delay = delay
+        self.slow_requests = slow_requests
+        self.requests = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                    slow = server.requests <= server.slow_requests
+                if slow:
+                    time.sleep(server.delay)
+                body = b"slow" if slow else b"fast"
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except OSError:
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/search"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class TestDeadline(unittest.TestCase):
+    """Test the run deadline and the timeouts derived from it."""
+
+    def tearDown(self):
+        http_client.close_session()
+
+    def test_deadlines_nest_and_reach_other_threads(self):
+        """Test that inner deadlines only narrow the outer one and bound functions carry it to threads."""
+        self.assertIsNone(deadline.remaining())
+        with deadline.deadline(10):
+            with deadline.deadline(60):
+                self.assertLessEqual(deadline.remaining(), 10)
+            with deadline.deadline(1):
+                connect, read = deadline.request_timeout()
+                self.assertLessEqual(read, 1)
+                self.assertLessEqual(connect, read)
+
+                seen = []
+                thread = threading.Thread(target=deadline.bind(lambda: seen.append(deadline.remaining())))
+                thread.start()
+                thread.join()
+                self.assertLessEqual(seen[0], 1)
+        self.assertIsNone(deadline.remaining())
+
+        with deadline.deadline(0):
+            with self.assertRaises(deadline.DeadlineExceeded):
+                deadline.request_timeout()
+
+    def test_hung_request_is_cut_off_at_the_deadline(self):
+        """Test that a request to a hung server gives up when the deadline runs out."""
+        server = SlowServer(delay=3)
+        self.addCleanup(server.stop)
+
+        start = time.perf_counter()
+        # urllib3 would normally retry the read timeout; past the deadline it must not
+        with deadline.deadline(0.3), self.assertRaises(requests.exceptions.RequestException):
+            http_client.get(server.url)
+        self.assertLess(time.perf_counter() - start, 2)
+        self.assertEqual(server.requests, 1)
+
+    def test_slow_request_is_hedged(self):
+        """Test that a second request is sent after the hedge delay and the faster answer wins."""
+        server = SlowServer(delay=2)
+        self.addCleanup(server.stop)
+        wins = get_metrics().counter("http_hedge_wins", host="127.0.0.1")
+
+        start = time.perf_counter()
+        response = http_client.hedged_get(server.url, hedge_after=0.05)
+        self.assertEqual(response.text, "fast")
+        self.assertLess(time.perf_counter() - start, 1.5)
+        self.assertEqual(server.requests, 2)
+        self.assertEqual(get_metrics().counter("http_hedge_wins", host="127.0.0.1"), wins + 1)
+
+        # A request faster than the hedge delay is sent once
+        self.assertEqual(http_client.hedged_get(server.url, hedge_after=1).text, "fast")
+        self.assertEqual(server.requests, 3)
+
+    def test_crew_stages_split_the_run_deadline(self):
+        """Test that each task gets its stage's share of the time left and stops once it runs out."""
+        pro_tools = ProTools()
+        pro_tools.crew()
+        with deadline.deadline(100):
+            pro_tools.prepare_inputs({"trello_cards": [{"id": "c1", "name": "AI agents"}]})
+            self.assertAlmostEqual(deadline.remaining(), 50, delta=1)
+            self.assertLessEqual(pro_tools._stage_tasks[0].agent.llm.timeout, 50)
+
+            pro_tools._advance_stage(None)
+            self.assertAlmostEqual(deadline.remaining(), 70, delta=1)
+            pro_tools._leave_stage()
+            self.assertAlmostEqual(deadline.remaining(), 100, delta=1)
+
+        with deadline.deadline(0):
+            with self.assertRaises(TimeoutError):
+                pro_tools._check_deadline(None)
+            with patch.dict(os.environ, {"TRELLO_API_KEY": "key", "TRELLO_API_TOKEN": "token"}):
+                result = TrelloAddCardCommentTool()._run(card_id="c1", text="x")
+        self.assertTrue(result.startswith("Error: Run deadline exceeded"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from unittest.mock import patch, MagicMock
+
+from pro_tools.crew import ProTools
+from pro_tools.models.article import Article, Section
+from pro_tools.utils.trello_publisher import publish_article
+
+ARTICLE = Article(sections=[
+    Section(id="c1", name="First", article="# First"),
+    Section(id="c2", name="Second", article="# Second"),
+])
+
+
+def fake_comment_and_move_cards(updates, list_id=None, session=None):
+    return [
+        {"card_id": update["card_id"], "comment": "Comment added successfully.",
+         "move": "Card updated successfully."}
+        if update["card_id"] == "c1"
+        else {"card_id": update["card_id"], "comment": "Error: 404 - card not found",
+              "move": "Skipped: comment failed."}
+        for update in updates
+    ]
+
+
+class TestDirectWrite(unittest.TestCase):
+    """Test the non-LLM stage that publishes articles straight to Trello."""
+
+    @patch('pro_tools.utils.trello_publisher.comment_and_move_cards',
+           side_effect=fake_comment_and_move_cards)
+    def test_publish_reports_status_per_card(self, mock_comment_and_move_cards):
+        """Test that each section is published to its own card with its own status."""
+        report = publish_article(ARTICLE)
+
+        updates = mock_comment_and_move_cards.call_args.args[0]
+        self.assertEqual(updates, [{"card_id": "c1", "text": "# First"},
+                                   {"card_id": "c2", "text": "# Second"}])
+        self.assertEqual([r.card_id for r in report.succeeded], ["c1"])
+        self.assertEqual([r.card_id for r in report.failed], ["c2"])
+
+    def test_crew_drops_trello_manager_stage(self):
+        """Test that direct-write mode builds the crew without the trello_update_task."""
+        crew = ProTools(direct_write=True).crew()
+
+        self.assertEqual([task.name for task in crew.tasks], ["research_task", "article_task"])
+        self.assertEqual(len(crew.agents), 2)
+
+    @patch('pro_tools.crew.publish_article')
+    def test_article_output_is_published_after_kickoff(self, mock_publish_article):
+        """Test that the crew's Article output is handed to the publisher, without made-up cards."""
+        pro_tools = ProTools(direct_write=True)
+        pro_tools._card_activity = {"c1": None, "c2": None}
+        invented = Section(id="c9", name="Invented", article="# Invented")
+        output = MagicMock(pydantic=Article(sections=[*ARTICLE.sections, invented]))
+
+        self.assertIs(pro_tools.publish_articles(output), output)
+        mock_publish_article.assert_called_once_with(ARTICLE)
+
+
+if __name__ == '__main__':
+    unittest.main()
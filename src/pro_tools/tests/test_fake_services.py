@@ -0,0 +1,120 @@
+import io
+import os
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from pro_tools.benchmarks import run_suite
+from pro_tools.testing.fake_services import FakeBoard, FakeServices
+from pro_tools.tools.RedditSearchTool import RedditSerpApiSearchTool
+from pro_tools.tools.TrelloAddCardCommentTool import TrelloAddCardCommentTool
+from pro_tools.tools.TrelloUpdateCardTool import TrelloUpdateCardTool
+from pro_tools.utils import http_client
+from pro_tools.utils.trello_utils import TrelloUtils
+
+
+class TestFakeServices(unittest.TestCase):
+    """Test the app's HTTP paths offline against the local Trello/SerpApi stand-in."""
+
+    def setUp(self):
+        self.services = FakeServices(FakeBoard(num_cards=250)).start()
+        self.addCleanup(self.services.stop)
+        env = patch.dict(os.environ, {
+            **self.services.env(),
+            'TRELLO_CREDENTIAL_CACHE_TTL': '0',
+            'SERPAPI_CACHE_ENABLED': 'false',
+        })
+        env.start()
+        self.addCleanup(env.stop)
+        self.board = self.services.board
+
+    def test_card_listing_pagination_and_snapshot_agree(self):
+        """Test that all ways of listing the TODO cards return the same cards."""
+        trello_utils = TrelloUtils()
+
+        cards = trello_utils.get_cards_in_list(self.board.todo_list_id)
+        paged = list(trello_utils.iter_cards_in_list(self.board.todo_list_id, page_size=100))
+        snapshot = trello_utils.get_startup_snapshot(self.board.board_id, self.board.todo_list_id)
+
+        self.assertEqual(len(cards), 250)
+        self.assertEqual(paged, cards)
+        self.assertEqual(snapshot["cards"], cards)
+        self.assertEqual(self.services.requests.count(("GET", "/1/lists/%s/cards" % self.board.todo_list_id)), 4)
+
+    def test_lean_card_listing_is_projected_compressed_and_quiet(self):
+        """Test that listing cards asks for only the used fields, gets gzip back and prints no payload."""
+        responses = []
+        send = http_client.get
+
+        def get(url, **kwargs):
+            responses.append((kwargs["params"], send(url, **kwargs)))
+            return responses[-1][1]
+
+        output = io.StringIO()
+        with patch.object(http_client, "get", side_effect=get), redirect_stdout(output):
+            cards = TrelloUtils().get_cards_in_list(self.board.todo_list_id)
+
+        params, response = responses[-1]
+        self.assertEqual(params["fields"], "id,name,dateLastActivity")
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(set(cards[0]), {"id", "name", "dateLastActivity"})
+        self.assertIn("Retrieved 250 cards", output.getvalue())
+        self.assertNotIn(cards[0]["name"], output.getvalue())
+
+    def test_tools_comment_on_and_move_cards(self):
+        """Test that the Trello tools comment on a card and move it to the DOING list."""
+        card_id = self.board.cards_in_list(self.board.todo_list_id)[0]["id"]
+
+        self.assertEqual(TrelloAddCardCommentTool()._run(card_id=card_id, text="# Article"),
+                         "Comment added successfully.")
+        self.assertEqual(TrelloUpdateCardTool()._run(card_id=card_id, idList="ignored"),
+                         "Card updated successfully.")
+
+        self.assertEqual(self.board.comments[-1]["data"]["text"], "# Article")
+        self.assertEqual(self.board.cards[card_id]["idList"], self.board.doing_list_id)
+
+    def test_search_tool_reads_fake_serpapi(self):
+        """Test that the search tool formats results from the fake SerpApi endpoint."""
+        result = RedditSerpApiSearchTool()._run("AI agents", max_results=2)
+
+        self.assertIn("Search results for: AI agents", result)
+        self.assertIn("2. AI agents - discussion 2", result)
+
+    def test_throttled_requests_are_retried(self):
+        """Test that 429 responses are retried after the server's Retry-After delay."""
+        self.services.rate_limit = 2
+        self.services.rate_period = 0.5
+        self.services.retry_after = 1
+
+        statuses = [http_client.get(f"{self.services.trello_api_url}/members/me",
+                                    params={"key": "fake-key", "token": "fake-token"}).status_code
+                    for _ in range(4)]
+
+        self.assertEqual(statuses, [200, 200, 200, 200])
+        self.assertGreater(len(self.services.requests), 4)
+
+    def test_injected_errors_reach_the_caller(self):
+        """Test that injected 500s surface as errors on calls that are not retried."""
+        self.services.error_rate = 1.0
+        card_id = self.board.cards_in_list(self.board.todo_list_id)[0]["id"]
+
+        result = TrelloAddCardCommentTool()._run(card_id=card_id, text="# Article")
+
+        self.assertEqual(result, "Error: 500 - Injected failure")
+
+    def test_benchmark_suite_runs_offline(self):
+        """Test that a small benchmark run produces a row per variant."""
+        rows = run_suite(sizes=[20], repeat=1, publish_cards=5)
+
+        self.assertEqual(
+            [(row["benchmark"], row["variant"]) for row in rows],
+            [("startup", "empty_list_precheck"), ("startup", "empty_list_full_import"),
+             ("prepare_inputs", "default"), ("prepare_inputs", "fast_startup"),
+             ("get_cards_in_list", "single_request"), ("get_cards_in_list", "paginated"),
+             ("publish", "tools_sequential"), ("publish", "tools_8_threads"),
+             ("publish", "async_direct_write")],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
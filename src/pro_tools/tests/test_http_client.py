@@ -0,0 +1,40 @@
+import os
+import unittest
+from unittest.mock import patch
+
+from pro_tools.utils import http_client
+
+
+class TestHttpClient(unittest.TestCase):
+    """Test the shared pooled HTTP session."""
+
+    def tearDown(self):
+        http_client.close_session()
+
+    def test_session_is_shared(self):
+        """Test that every caller gets the same pooled session."""
+        self.assertIs(http_client.get_session(), http_client.get_session())
+
+    def test_close_session_builds_a_new_one(self):
+        """Test that closing the session makes the next call build a fresh one."""
+        first = http_client.get_session()
+        http_client.close_session()
+        self.assertIsNot(first, http_client.get_session())
+
+    @patch.dict(os.environ, {
+        "HTTP_POOL_MAXSIZE": "7",
+        "HTTP_MAX_RETRIES": "2",
+        "HTTP_BACKOFF_FACTOR": "0.1",
+    })
+    def test_pool_and_retry_settings_from_environment(self):
+        """Test that pool size and retry settings are read from the environment."""
+        adapter = http_client.build_session().get_adapter("https://api.trello.com")
+
+        self.assertEqual(adapter._pool_maxsize, 7)
+        self.assertEqual(adapter.max_retries.total, 2)
+        self.assertEqual(adapter.max_retries.backoff_factor, 0.1)
+        self.assertNotIn("POST", adapter.max_retries.allowed_methods)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+
+from pro_tools.utils import http_client
+from pro_tools.utils.metrics import Metrics, get_metrics, percentile, timed
+
+
+class TestMetrics(unittest.TestCase):
+    """Test timing spans, counters and the per-run metrics file."""
+
+    def setUp(self):
+        get_metrics().reset()
+
+    def test_percentiles_use_nearest_rank(self):
+        """Test that percentiles pick the nearest-rank sample."""
+        samples = [float(n) for n in range(1, 101)]
+
+        self.assertEqual(percentile(samples, 0.5), 50.0)
+        self.assertEqual(percentile(samples, 0.95), 95.0)
+        self.assertEqual(percentile(samples, 0.99), 99.0)
+        self.assertEqual(percentile([], 0.5), 0.0)
+
+    def test_summary_groups_spans_by_phase_and_name(self):
+        """Test that the summary reports each series and the phase as a whole."""
+        metrics = Metrics()
+        for seconds in (0.1, 0.2, 0.3):
+            metrics.observe("http", "api.trello.com", seconds)
+        metrics.observe("http", "serpapi.com", 1.0)
+        metrics.increment("cache_hits", cache="serpapi")
+        metrics.increment("cache_hits", cache="serpapi")
+
+        summary = metrics.summary()
+
+        self.assertEqual(summary["phases"]["http"]["series"]["api.trello.com"]["count"], 3)
+        self.assertEqual(summary["phases"]["http"]["series"]["api.trello.com"]["p50"], 0.2)
+        self.assertEqual(summary["phases"]["http"]["summary"]["count"], 4)
+        self.assertEqual(summary["phases"]["http"]["summary"]["max"], 1.0)
+        self.assertEqual(summary["counters"]['cache_hits{cache="serpapi"}'], 2)
+
+    def test_timed_records_spans_named_after_the_class(self):
+        """Test that decorated methods are timed under their class name, even when they raise."""
+        class SlowTool:
+            @timed("tool")
+            def _run(self, fail=False):
+                if fail:
+                    raise RuntimeError("boom")
+                return "done"
+
+        self.assertEqual(SlowTool()._run(), "done")
+        with self.assertRaises(RuntimeError):
+            SlowTool()._run(fail=True)
+
+        self.assertEqual(get_metrics().summary()["phases"]["tool"]["series"]["SlowTool"]["count"], 2)
+
+    @patch('pro_tools.utils.http_client.get_session')
+    def test_http_requests_are_timed_and_counted(self, mock_get_session):
+        """Test that HTTP calls record a span, status, bytes and urllib3 retries per host."""
+        response = MagicMock(status_code=200, content=b"x" * 42)
+        response.request.body = b"text=hello"
+        response.raw.retries.history = ("first attempt",)
+        mock_get_session.return_value.request.return_value = response
+
+        http_client.request("POST", "https://serpapi.com/search")
+
+        metrics = get_metrics()
+        self.assertEqual(metrics.summary()["phases"]["http"]["series"]["serpapi.com"]["count"], 1)
+        self.assertEqual(metrics.counter("http_requests", host="serpapi.com", status=200), 1)
+        self.assertEqual(metrics.counter("http_bytes_sent", host="serpapi.com"), 10)
+        self.assertEqual(metrics.counter("http_bytes_received", host="serpapi.com"), 42)
+        self.assertEqual(metrics.counter("http_retries", host="serpapi.com"), 1)
+
+    def test_write_json_and_prometheus(self):
+        """Test that metrics are written as JSON or as a Prometheus textfile."""
+        metrics = Metrics()
+        metrics.observe("task", "research_task", 2.5)
+        metrics.increment("http_retries", 3, host="api.trello.com")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_path = metrics.write(os.path.join(tmp_dir, "run.json"))
+            with open(json_path) as f:
+                self.assertEqual(json.load(f)["phases"]["task"]["series"]["research_task"]["total"], 2.5)
+
+            prom_path = metrics.write(os.path.join(tmp_dir, "run.prom"))
+            with open(prom_path) as f:
+                text = f.read()
+
+        self.assertIn('pro_tools_phase_seconds{phase="task",name="research_task",quantile="0.99"} 2.500000', text)
+        self.assertIn('pro_tools_phase_seconds_count{phase="task",name="research_task"} 1', text)
+        self.assertIn('pro_tools_http_retries_total{host="api.trello.com"} 3', text)
+
+    def test_write_is_skipped_without_a_path(self):
+        """Test that nothing is written unless METRICS_OUTPUT_PATH is set."""
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertIsNone(Metrics().write())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,14 +1,28 @@
 import os
+import subprocess
+import sys
 import unittest
 from unittest.mock import patch, MagicMock
 
 from pro_tools.crew import ProTools
+from pro_tools.main import todo_list_is_empty
+from pro_tools.testing.fake_services import FakeBoard, FakeServices
+
+EMPTY_RUN_SCRIPT = """
+import sys
+from pro_tools.main import run
+try:
+    run()
+except SystemExit as e:
+    print("exit code:", e.code)
+print("crewai imported:", "crewai" in sys.modules)
+"""
 
 
 class TestNoCardsHandling(unittest.TestCase):
     """Test the handling of scenarios where no cards are found in the TODO list."""
 
-    @patch('pro_tools.utils.trello_utils.TrelloUtils')
+    @patch('pro_tools.crew.TrelloUtils')
     def test_no_cards_raises_value_error(self, mock_trello_utils):
         """Test that a ValueError is raised when no cards are found."""
         # Setup mock
@@ -41,5 +55,30 @@ class TestNoCardsHandling(unittest.TestCase):
         self.assertIn("No cards found in the TODO list", str(context.exception))
 
 
+    def test_empty_list_exits_before_importing_crewai(self):
+        """Test that the pre-check ends an empty run without loading crewai."""
+        with FakeServices(FakeBoard(num_cards=0)) as services:
+            env = {**os.environ, **services.env(), 'TRELLO_CREDENTIAL_CACHE_TTL': '0'}
+            result = subprocess.run([sys.executable, "-c", EMPTY_RUN_SCRIPT], env=env,
+                                    capture_output=True, text=True, timeout=60)
+
+        self.assertIn("No cards found in the TODO list", result.stdout)
+        self.assertIn("exit code: 0", result.stdout)
+        self.assertIn("crewai imported: False", result.stdout)
+
+    @patch('pro_tools.utils.trello_utils.TrelloUtils')
+    def test_failed_pre_check_falls_through_to_full_run(self, mock_trello_utils):
+        """Test that a failed or disabled pre-check never reports the list as empty."""
+        mock_trello_utils.return_value.count_cards_in_list.side_effect = ValueError("Error: 500")
+
+        with patch.dict(os.environ, {'TRELLO_TOOD_LIST_ID': 'mock_list_id'}):
+            self.assertFalse(todo_list_is_empty())
+            mock_trello_utils.return_value.count_cards_in_list.side_effect = None
+            mock_trello_utils.return_value.count_cards_in_list.return_value = 0
+            self.assertTrue(todo_list_is_empty())
+            with patch.dict(os.environ, {'TRELLO_PRECHECK': 'false'}):
+                self.assertFalse(todo_list_is_empty())
+
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,119 @@
+import gzip
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from pro_tools.crew import ProTools
+from pro_tools.models.research import Research, Topic
+from pro_tools.utils import output_store as output_store_module
+from pro_tools.utils.output_store import OutputStore, is_shard_of
+
+
+class TestOutputStore(unittest.TestCase):
+    """Test the append-only, compressed per-run output store."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.directory = self.tmp_dir.name
+
+    def _store(self, run_id, **kwargs):
+        return OutputStore(self.directory, run_id=run_id, **kwargs)
+
+    def test_history_reads_only_the_cards_records(self):
+        """Test that a card's history spans runs and decompresses only its own records."""
+        first, second = self._store("run-a"), self._store("run-b")
+        first.append("research", "c1", {"research": "old"})
+        first.append("research", "c2", {"research": "other"})
+        second.append("research", "c1", {"research": "new"})
+        second.append("article", "c1", {"article": "# New"})
+
+        with patch.object(output_store_module.gzip, "decompress", wraps=gzip.decompress) as decompress:
+            history = self._store("reader").history("c1")
+        self.assertEqual(decompress.call_count, 3)
+        self.assertEqual([(r["run_id"], r["stage"]) for r in history],
+                         [("run-a", "research"), ("run-b", "research"), ("run-b", "article")])
+        self.assertEqual(first.latest("c1", "research")["data"], {"research": "new"})
+        self.assertEqual([r["data"] for r in first.history("c1", stage="article")], [{"article": "# New"}])
+        self.assertEqual(first.runs(), ["run-a", "run-b"])
+
+    def test_shard_is_plain_gzip_jsonl(self):
+        """Test that a shard reads back as one gzip stream of JSON lines."""
+        store = self._store("run-a")
+        for n in range(3):
+            store.append("article", f"c{n}", {"article": f"# {n}"})
+
+        with gzip.open(os.path.join(store.shard_dir, store.shard), "rt") as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual([r["card_id"] for r in store.iter_run("run-a")], ["c0", "c1", "c2"])
+
+    def test_shards_rotate_and_old_runs_are_pruned(self):
+        """Test that shards rotate at their size cap and the oldest runs go past the total cap."""
+        old = self._store("run-a")
+        for n in range(5):
+            old.append("research", f"c{n}", {"research": os.urandom(200).hex()})
+        self._age(old.shard_dir, "run-a")
+
+        current = self._store("run-b", shard_bytes=1000, max_bytes=2000)
+        for n in range(5):
+            current.append("research", f"c{n}", {"research": os.urandom(200).hex()})
+
+        shards = sorted(os.listdir(current.shard_dir))
+        self.assertFalse(any(name.startswith("run-a") for name in shards))
+        self.assertGreater(len(shards), 1)
+        self.assertEqual(current.runs(), ["run-b"])
+        self.assertEqual([r["card_id"] for r in current.iter_run("run-b")], [f"c{n}" for n in range(5)])
+        self.assertEqual(len(current.history("c4")), 1)
+
+    def _age(self, shard_dir, run_id, seconds=7200):
+        stale = time.time() - seconds
+        for name in os.listdir(shard_dir):
+            if is_shard_of(name, run_id):
+                os.utime(os.path.join(shard_dir, name), (stale, stale))
+
+    def test_active_runs_are_not_pruned(self):
+        """Test that pruning spares every shard of a run still writing and matches run IDs exactly."""
+        running = self._store("run-a", shard_bytes=1000)
+        for n in range(5):
+            running.append("research", f"c{n}", {"research": os.urandom(200).hex()})
+        # Only the run's earlier shards are old, its latest one is still being written
+        earlier = [name for name in os.listdir(running.shard_dir) if name != running.shard]
+        stale = time.time() - 7200
+        for name in earlier:
+            os.utime(os.path.join(running.shard_dir, name), (stale, stale))
+        finished = self._store("run-a-b")
+        finished.append("research", "c9", {"research": os.urandom(200).hex()})
+        self._age(finished.shard_dir, "run-a-b")
+
+        self._store("run", max_bytes=0).append("research", "c0", {"research": "new"})
+
+        self.assertEqual(self._store("reader").runs(), ["run", "run-a"])
+        self.assertEqual(len(list(running.iter_run("run-a"))), 5)
+        self.assertEqual(list(running.iter_run("run-a-b")), [])
+
+    def test_crew_appends_outputs_instead_of_writing_files(self):
+        """Test that with the store enabled, tasks write no files and topics go to the store."""
+        store = self._store("run-a")
+        with patch.dict(os.environ, {"OUTPUT_STORE_ENABLED": "true"}), \
+                patch("pro_tools.crew.get_output_store", return_value=store):
+            pro_tools = ProTools()
+        pro_tools._card_activity = {"c1": None}
+        pro_tools._card_names = {"c1": "AI agents"}
+
+        self.assertIsNone(pro_tools.research_task().output_file)
+        self.assertIsNone(pro_tools.article_task().output_file)
+        research = Research(research_topics=[
+            Topic(id="c1", name="AI agents", research="Findings"),
+            Topic(id="made-up", name="Other", research="Ignored"),
+        ])
+        pro_tools._record_research(MagicMock(pydantic=research))
+
+        self.assertEqual([r["data"]["research"] for r in store.history("c1")], ["Findings"])
+        self.assertEqual(store.history("made-up"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
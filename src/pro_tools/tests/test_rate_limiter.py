@@ -0,0 +1,83 @@
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+
+from pro_tools.utils import http_client
+from pro_tools.utils.rate_limiter import TokenBucket, backoff_delay, parse_retry_after
+
+
+def mock_response(status_code, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return response
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test the shared token bucket and its throttling metrics."""
+
+    def test_burst_beyond_capacity_is_queued(self):
+        """Test that requests beyond capacity are delayed at the refill rate."""
+        bucket = TokenBucket(capacity=2, period=1.0)
+
+        delays = [bucket.reserve() for _ in range(3)]
+
+        self.assertEqual(delays[:2], [0.0, 0.0])
+        self.assertAlmostEqual(delays[2], 0.5, places=2)
+        self.assertEqual(bucket.stats()["queued_requests"], 1)
+
+    def test_throttle_pauses_every_caller(self):
+        """Test that a throttled response holds back later reservations."""
+        bucket = TokenBucket(capacity=100, period=10.0)
+
+        bucket.throttle(2.0)
+
+        self.assertGreaterEqual(bucket.reserve(), 1.9)
+        self.assertEqual(bucket.stats()["throttled_responses"], 1)
+        self.assertEqual(bucket.stats()["throttled_seconds"], 2.0)
+
+    def test_callers_resume_at_the_steady_rate_after_a_pause(self):
+        """Test that reservations made during a pause are spaced 1/rate apart after it."""
+        bucket = TokenBucket(capacity=100, period=10.0)
+        for _ in range(100):
+            bucket.reserve()
+        bucket.throttle(2.0)
+
+        with patch("pro_tools.utils.rate_limiter.time.monotonic", return_value=time.monotonic() + 1.0):
+            delays = [bucket.reserve() for _ in range(15)]
+
+        self.assertGreater(delays[0], 0.9)
+        for before, after in zip(delays, delays[1:]):
+            self.assertAlmostEqual(after - before, 0.1, places=3)
+
+    def test_retry_after_parsing(self):
+        """Test that Retry-After wins over exponential backoff."""
+        self.assertEqual(parse_retry_after("3"), 3.0)
+        self.assertIsNone(parse_retry_after("not a date"))
+        self.assertEqual(backoff_delay(0, "4"), 4.0)
+        self.assertEqual(backoff_delay(2), 2.0)
+
+
+class TestThrottledRequests(unittest.TestCase):
+    """Test that 429s are retried inside the HTTP layer."""
+
+    @patch('pro_tools.utils.http_client.get_trello_rate_limiter')
+    @patch('pro_tools.utils.http_client.get_session')
+    def test_429_is_retried_honoring_retry_after(self, mock_get_session, mock_get_limiter):
+        """Test that a throttled Trello call is retried after the server's delay."""
+        limiter = MagicMock()
+        mock_get_limiter.return_value = limiter
+        mock_get_session.return_value.request.side_effect = [
+            mock_response(429, {"Retry-After": "1"}),
+            mock_response(200),
+        ]
+
+        response = http_client.get("https://api.trello.com/1/lists/abc")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(limiter.acquire.call_count, 2)
+        limiter.throttle.assert_called_once_with(1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+from crewai import TaskOutput
+
+from pro_tools.crew import ProTools
+from pro_tools.models.research import Research, Topic
+from pro_tools.tools.RedditSearchTool import RedditSerpApiSearchTool
+from pro_tools.utils.research_compactor import compact_research, compact_text, dedupe_results, estimate_tokens
+
+RESEARCH = """## Key findings
+
+- Vector databases let AI agents recall earlier conversations across sessions.
+- Vector databases let AI agents recall earlier conversations across sessions!
+- Agents with long-term memory need eviction policies so stale facts do not pile up.
+
+## Community sentiment
+
+Redditors mostly share memes about the weather this week, unrelated to the topic.
+
+- Tooling for agent memory is moving fast; LangGraph and Letta are popular picks.
+"""
+
+
+class TestResearchCompactor(unittest.TestCase):
+    """Test deduplicating and trimming research without an LLM."""
+
+    def test_duplicates_are_dropped_and_order_kept(self):
+        """Test that a near-identical bullet is dropped and kept passages stay in written order."""
+        compacted = compact_text(RESEARCH, "AI agent memory", budget=1000)
+
+        self.assertEqual(compacted.count("recall earlier conversations"), 1)
+        self.assertLess(compacted.index("## Key findings"), compacted.index("eviction policies"))
+        self.assertLess(compacted.index("eviction policies"), compacted.index("LangGraph"))
+
+    def test_budget_keeps_the_most_relevant_passages(self):
+        """Test that a tight budget drops the off-topic paragraph first and is respected."""
+        compacted = compact_text(RESEARCH, "AI agent memory", budget=70)
+
+        self.assertLessEqual(estimate_tokens(compacted.replace("\n\n", "")), 70)
+        self.assertNotIn("weather", compacted)
+        self.assertIn("agent", compacted.lower())
+        # Headings only come along with content kept under them
+        self.assertEqual("## Community sentiment" in compacted, "LangGraph" in compacted)
+
+    def test_topics_are_compacted_against_their_own_name(self):
+        """Test that each topic keeps its ID and name and is cut to the per-topic budget."""
+        research = Research(research_topics=[
+            Topic(id="c1", name="AI agent memory", research=RESEARCH),
+            Topic(id="c2", name="Short", research="Already short."),
+        ])
+        compacted = compact_research(research, budget=60)
+
+        self.assertEqual([(t.id, t.name) for t in compacted.research_topics], [("c1", "AI agent memory"), ("c2", "Short")])
+        self.assertLess(len(compacted.research_topics[0].research), len(RESEARCH))
+        self.assertEqual(compacted.research_topics[1].research, "Already short.")
+
+    def test_search_results_are_deduplicated(self):
+        """Test that repeated links and near-identical snippets are dropped before formatting."""
+        results = [
+            {"title": "AI agents", "link": "https://a", "snippet": "Agents that browse the web"},
+            {"title": "AI agents", "link": "https://b", "snippet": "Agents that browse the web."},
+            {"title": "Other", "link": "https://a", "snippet": "Different text"},
+            {"title": "Memory", "link": "https://c", "snippet": "How agents remember"},
+        ]
+        self.assertEqual([r["link"] for r in dedupe_results(results)], ["https://a", "https://c"])
+
+        with patch.dict(os.environ, {"RESEARCH_COMPACTION_ENABLED": "true", "SERPAPI_CACHE_ENABLED": "false"}):
+            tool = RedditSerpApiSearchTool()
+        formatted = tool._format_results({"organic_results": results}, max_results=2)
+        self.assertIn("2. Memory", formatted)
+
+    def test_crew_guardrail_hands_compacted_research_on(self):
+        """Test that research_task's guardrail swaps in the compacted research for the writer."""
+        with patch.dict(os.environ, {"RESEARCH_COMPACTION_ENABLED": "true"}):
+            pro_tools = ProTools()
+        self.assertIsNotNone(pro_tools.research_task().guardrail)
+
+        research = Research(research_topics=[Topic(id="c1", name="AI agent memory", research=RESEARCH)])
+        output = TaskOutput(description="research", agent="researcher", raw=research.model_dump_json(),
+                            pydantic=research)
+        with patch.dict(os.environ, {"RESEARCH_TOPIC_TOKEN_BUDGET": "60"}):
+            success, result = pro_tools._prepare_research(output)
+
+        self.assertTrue(success)
+        self.assertIsInstance(result, TaskOutput)
+        self.assertEqual(Research.model_validate_json(result.raw), result.pydantic)
+        self.assertLess(len(result.raw), len(output.raw))
+        self.assertEqual(pro_tools._prepare_research(MagicMock(pydantic=None))[0], True)
+
+
+if __name__ == "__main__":
+    unittest.main()
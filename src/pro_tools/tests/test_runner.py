@@ -0,0 +1,103 @@
+import unittest
+from unittest.mock import patch, MagicMock
+
+from pro_tools.models.publish_result import CardPublishResult, PublishReport
+from pro_tools.runner import chunk_cards, run_batched, run_fanout
+
+
+def fake_kickoff(inputs):
+    if any(card["name"] == "broken" for card in inputs["trello_cards"]):
+        raise RuntimeError("LLM failure")
+    return MagicMock(raw="done")
+
+
+class TestFanout(unittest.TestCase):
+    """Test the per-card parallel crew fan-out."""
+
+    def setUp(self):
+        self.cards = [
+            {"id": "c1", "name": "first"},
+            {"id": "c2", "name": "broken"},
+            {"id": "c3", "name": "third"},
+        ]
+
+    def test_chunk_cards(self):
+        """Test that cards are split into groups of the requested size."""
+        groups = list(chunk_cards(self.cards, 2))
+        self.assertEqual([len(group) for group in groups], [2, 1])
+
+    @patch('pro_tools.runner.ProTools')
+    def test_one_failed_card_does_not_fail_the_others(self, mock_pro_tools):
+        """Test that results and failures are collected per card."""
+        mock_pro_tools.return_value.publish_report = None
+        mock_pro_tools.return_value.resume_cards.side_effect = lambda cards: (cards, PublishReport())
+        mock_pro_tools.return_value.crew.return_value.kickoff.side_effect = fake_kickoff
+
+        report = run_fanout(self.cards, workers=2, group_size=1)
+
+        self.assertEqual(sorted(r.card_id for r in report.succeeded), ["c1", "c3"])
+        self.assertEqual([r.card_id for r in report.failed], ["c2"])
+        self.assertEqual(report.failed[0].error, "LLM failure")
+        self.assertEqual(mock_pro_tools.return_value.crew.return_value.kickoff.call_count, 3)
+
+    @patch('pro_tools.runner.ProTools')
+    def test_batched_runs_one_crew_per_batch(self, mock_pro_tools):
+        """Test that a streamed card source is fed to the crew in fixed-size batches."""
+        kickoff = mock_pro_tools.return_value.crew.return_value.kickoff
+        kickoff.side_effect = fake_kickoff
+        mock_pro_tools.return_value.publish_report = None
+        mock_pro_tools.return_value.resume_cards.side_effect = lambda cards: (cards, PublishReport())
+
+        report = run_batched(iter(self.cards), batch_size=2)
+
+        batches = [call.kwargs["inputs"]["trello_cards"] for call in kickoff.call_args_list]
+        self.assertEqual([len(batch) for batch in batches], [2, 1])
+        self.assertEqual([r.card_id for r in report.failed], ["c1", "c2"])
+        self.assertEqual([r.card_id for r in report.succeeded], ["c3"])
+
+    @patch('pro_tools.runner.ProTools')
+    def test_resumed_cards_report_their_publish_outcome(self, mock_pro_tools):
+        """Test that a card resume_cards failed to publish is reported failed, not succeeded."""
+        mock_pro_tools.return_value.publish_report = None
+        mock_pro_tools.return_value.resume_cards.return_value = ([self.cards[2]], PublishReport(results=[
+            CardPublishResult(card_id="c1", name="first", status="succeeded", comment="ok", move="ok"),
+            CardPublishResult(card_id="c2", name="broken", status="failed", comment="Error: 500", move="ok"),
+        ]))
+        mock_pro_tools.return_value.crew.return_value.kickoff.side_effect = fake_kickoff
+
+        report = run_batched(iter(self.cards), batch_size=3)
+
+        self.assertEqual([r.card_id for r in report.succeeded], ["c1", "c3"])
+        self.assertEqual([r.card_id for r in report.failed], ["c2"])
+        self.assertEqual(report.failed[0].error, "comment: Error: 500 | move: ok")
+
+    @patch('pro_tools.runner.ProTools')
+    def test_failed_kickoff_keeps_resumed_outcomes(self, mock_pro_tools):
+        """Test that a kickoff that raises fails only the cards it ran for, not those already resumed."""
+        mock_pro_tools.return_value.publish_report = None
+        mock_pro_tools.return_value.resume_cards.return_value = ([self.cards[1]], PublishReport(results=[
+            CardPublishResult(card_id="c1", name="first", status="succeeded", comment="ok", move="ok"),
+        ]))
+        mock_pro_tools.return_value.crew.return_value.kickoff.side_effect = fake_kickoff
+
+        report = run_batched(iter(self.cards[:2]), batch_size=2)
+
+        self.assertEqual([r.card_id for r in report.succeeded], ["c1"])
+        self.assertEqual([(r.card_id, r.error) for r in report.failed], [("c2", "LLM failure")])
+
+    @patch('pro_tools.runner.ProTools')
+    def test_cards_left_out_of_the_article_fail(self, mock_pro_tools):
+        """Test that in direct-write mode a card without a section is reported failed."""
+        mock_pro_tools.return_value.resume_cards.side_effect = lambda cards: (cards, PublishReport())
+        mock_pro_tools.return_value.crew.return_value.kickoff.side_effect = fake_kickoff
+        mock_pro_tools.return_value.publish_report = PublishReport(results=[
+            CardPublishResult(card_id="c1", name="first", status="succeeded", comment="ok", move="ok"),
+        ])
+
+        report = run_batched(iter([self.cards[0], self.cards[2]]), batch_size=2)
+
+        self.assertEqual([r.card_id for r in report.succeeded], ["c1"])
+        self.assertEqual([(r.card_id, r.error) for r in report.failed], [("c3", "No section written for this card")])
+
+if __name__ == '__main__':
+    unittest.main()
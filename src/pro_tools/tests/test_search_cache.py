@@ -0,0 +1,92 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+
+from pro_tools.tools.RedditSearchTool import RedditSerpApiSearchTool
+from pro_tools.utils.deadline import DeadlineExceeded
+from pro_tools.utils.search_cache import SearchCache
+
+RESULTS = {
+    "search_parameters": {"q": "crewai release"},
+    "organic_results": [{"title": "CrewAI", "link": "https://example.com", "snippet": "News"}],
+}
+
+
+class TestSearchCache(unittest.TestCase):
+    """Test the persistent SerpApi response cache."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "cache.sqlite3")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_normalized_query_hits(self):
+        """Test that case and whitespace differences share an entry."""
+        cache = SearchCache(self.path)
+        cache.put("CrewAI  release", 3, RESULTS)
+
+        self.assertEqual(cache.get("crewai release", 3), RESULTS)
+        self.assertIsNone(cache.get("crewai release", 5))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_expired_entries_miss(self):
+        """Test that entries older than the TTL are not served."""
+        cache = SearchCache(self.path, ttl=10)
+        cache.put("query", 3, RESULTS)
+
+        with patch('pro_tools.utils.search_cache.time.time', return_value=time.time() + 11):
+            self.assertIsNone(cache.get("query", 3))
+        self.assertEqual(len(cache), 0)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test that the size cap evicts the entry accessed longest ago."""
+        cache = SearchCache(self.path, max_entries=2)
+        cache.put("a", 3, RESULTS)
+        cache.put("b", 3, RESULTS)
+        cache.get("a", 3)
+        cache.put("c", 3, RESULTS)
+
+        self.assertIsNotNone(cache.get("a", 3))
+        self.assertIsNone(cache.get("b", 3))
+        self.assertEqual(len(cache), 2)
+
+    @patch('pro_tools.tools.RedditSearchTool.http_client')
+    def test_tool_renders_repeat_queries_from_cache(self, mock_http_client):
+        """Test that the tool only calls SerpApi once for a repeated query."""
+        response = MagicMock()
+        response.json.return_value = RESULTS
+        mock_http_client.get.return_value = response
+
+        with patch.dict(os.environ, {'SERPAPI_API_KEY': 'key', 'SERPAPI_CACHE_ENABLED': 'true',
+                                     'SERPAPI_CACHE_PATH': self.path}):
+            tool = RedditSerpApiSearchTool()
+            first = tool._run("crewai release")
+            second = tool._run("CrewAI release ")
+
+        self.assertEqual(first, second)
+        self.assertIn("CrewAI", second)
+        mock_http_client.get.assert_called_once()
+
+    @patch('pro_tools.tools.RedditSearchTool.http_client')
+    def test_tool_failures_are_not_passed_off_as_research(self, mock_http_client):
+        """Test that a failed search returns an error and an expired deadline is raised."""
+        with patch.dict(os.environ, {'SERPAPI_API_KEY': 'key'}):
+            tool = RedditSerpApiSearchTool()
+        self.assertIsNone(tool._cache)
+
+        mock_http_client.get.side_effect = ConnectionError("connection reset")
+        result = tool._run("crewai release")
+        self.assertTrue(result.startswith("Error: SerpApi search for 'crewai release' failed"))
+        self.assertNotIn("Placeholder", result)
+
+        mock_http_client.get.side_effect = DeadlineExceeded("Run deadline exceeded")
+        with self.assertRaises(DeadlineExceeded):
+            tool._run("crewai release")
+
+
+if __name__ == '__main__':
+    unittest.main()
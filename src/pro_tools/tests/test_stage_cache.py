@@ -0,0 +1,110 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+
+from pro_tools.crew import ProTools
+from pro_tools.models.article import Section
+from pro_tools.models.research import Topic
+from pro_tools.utils.stage_cache import StageCache
+
+TASK = {"description": "Research {trello_cards}", "expected_output": "Notes"}
+AGENT = {"role": "Researcher", "goal": "Find things", "backstory": "Curious"}
+
+
+class TestStageCache(unittest.TestCase):
+    """Test the content-addressed cache of Research and Article outputs."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "stage_cache.sqlite3")
+        self.cache = StageCache(self.path, ttl=60, max_bytes=10_000, refresh=False)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_key_ignores_name_formatting_but_tracks_prompts(self):
+        """Test that the key changes with the prompts but not with card name spacing or case."""
+        key = StageCache.make_key("research", "AI  Agents", TASK, AGENT)
+
+        self.assertEqual(key, StageCache.make_key("research", "ai agents", TASK, AGENT))
+        self.assertNotEqual(key, StageCache.make_key("research", "AI Agents", {**TASK, "description": "New"}, AGENT))
+        self.assertNotEqual(key, StageCache.make_key("research", "AI Agents", TASK, {**AGENT, "goal": "Other"}))
+        self.assertNotEqual(key, StageCache.make_key("article", "AI Agents", TASK, AGENT))
+
+    def test_expired_and_refreshed_entries_miss(self):
+        """Test that entries older than the TTL, or any entry while refreshing, are not returned."""
+        self.cache.put("key", "research", {"research": "notes"})
+        self.assertEqual(self.cache.get("key"), {"research": "notes"})
+
+        self.cache.refresh = True
+        self.assertIsNone(self.cache.get("key"))
+
+        self.cache.refresh = False
+        self.cache.ttl = 0
+        time.sleep(0.01)
+        self.assertIsNone(self.cache.get("key"))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_least_recently_used_entries_are_evicted_over_size_limit(self):
+        """Test that storing past max_bytes drops the least recently used entries first."""
+        self.cache.max_bytes = 2_500
+        self.cache.put("a", "research", {"research": "a" * 1000})
+        self.cache.put("b", "research", {"research": "b" * 1000})
+        self.cache.get("a")
+        self.cache.put("c", "research", {"research": "c" * 1000})
+
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("c"))
+
+    @patch('pro_tools.crew.publish_sections')
+    def test_cached_outputs_skip_their_stages(self, mock_publish_sections):
+        """Test that cached articles are published and cached research skips to the article stage."""
+        mock_publish_sections.return_value = MagicMock(succeeded=[])
+
+        with patch.dict(os.environ, {'STAGE_CACHE_ENABLED': 'true', 'STAGE_CACHE_PATH': self.path}):
+            pro_tools = ProTools()
+        pro_tools.stage_cache.put(
+            pro_tools._stage_key("article", "Written"), "article",
+            Section(id="old-1", name="Written", article="# Written").model_dump(),
+        )
+        pro_tools.stage_cache.put(
+            pro_tools._stage_key("research", "Researched"), "research",
+            Topic(id="old-2", name="Researched", research="notes").model_dump(),
+        )
+        cards = [
+            {"id": "c1", "name": "Written"},
+            {"id": "c2", "name": "researched"},
+            {"id": "c3", "name": "New"},
+        ]
+
+        with patch('pro_tools.crew.ProTools') as mock_resumed:
+            remaining, _ = pro_tools.resume_cards(cards)
+
+        self.assertEqual([card["id"] for card in remaining], ["c3"])
+        sections = mock_publish_sections.call_args.args[0]
+        self.assertEqual([(section.id, section.article) for section in sections], [("c1", "# Written")])
+        inputs = mock_resumed.return_value.crew.return_value.kickoff.call_args.kwargs["inputs"]
+        self.assertEqual([card["id"] for card in inputs["trello_cards"]], ["c2"])
+        self.assertIn('"id":"c2"', inputs["research_topics"])
+
+    def test_task_outputs_are_stored_under_the_card_name(self):
+        """Test that recorded stage outputs are cached for later cards with the same name."""
+        with patch.dict(os.environ, {'STAGE_CACHE_ENABLED': 'true', 'STAGE_CACHE_PATH': self.path}):
+            pro_tools = ProTools()
+        pro_tools._card_activity = {"c1": None}
+        pro_tools._card_names = {"c1": "AI Agents"}
+
+        pro_tools._record_stage("research", [
+            Topic(id="c1", name="AI Agents", research="notes"),
+            Topic(id="made-up", name="Other", research="ignored"),
+        ])
+
+        self.assertEqual(pro_tools.stage_cache.get(pro_tools._stage_key("research", "ai agents"))["research"], "notes")
+        self.assertEqual(len(pro_tools.stage_cache), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
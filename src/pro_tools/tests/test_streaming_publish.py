@@ -0,0 +1,163 @@
+import json
+import os
+import unittest
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import aiohttp
+from crewai.events import CrewKickoffFailedEvent, LLMCallStartedEvent, LLMStreamChunkEvent, crewai_event_bus
+
+from pro_tools.crew import ProTools
+from pro_tools.models.article import Article, Section
+from pro_tools.models.publish_result import PublishReport
+from pro_tools.testing.fake_services import FakeBoard, FakeServices
+from pro_tools.utils import section_stream
+from pro_tools.utils.section_stream import SectionStreamParser, unwatch_task, watch_task
+from pro_tools.utils.trello_publisher import StreamingPublisher
+
+ARTICLE = Article(sections=[
+    Section(id="c1", name="First", article="# First\n\nBraces { and ] inside text"),
+    Section(id="c2", name="Second", article="# Second"),
+])
+ANSWER = (
+    'Thought: I could answer {"sections": [{"id": "bogus"}]} but let me write it properly.\n'
+    "Final Answer: ```json\n" + ARTICLE.model_dump_json(indent=2) + "\n```"
+)
+
+
+def chunks(text, size=7):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class TestSectionStream(unittest.TestCase):
+    """Test that sections are picked out of a streamed answer as soon as they close."""
+
+    def test_sections_complete_before_the_answer_does(self):
+        """Test that each section is emitted once, when its own JSON object closes."""
+        emitted = []
+        parser = SectionStreamParser(lambda section: emitted.append((section["id"], len(received))))
+        received = ""
+        for chunk in chunks(ANSWER):
+            received += chunk
+            parser.feed(chunk)
+
+        self.assertEqual([section_id for section_id, _ in emitted], ["c1", "c2"])
+        first_done = ANSWER.index('"id": "c2"')
+        self.assertLess(emitted[0][1], first_done)
+        self.assertLess(emitted[1][1], len(ANSWER))
+
+    def test_stream_chunk_events_reach_the_watched_task(self):
+        """Test that LLM stream chunks of a watched task are parsed and an LLM restart resets it."""
+        task = SimpleNamespace(id=uuid.uuid4(), name="article_task", agent=None)
+        emitted = []
+        watch_task(task.id, lambda section: emitted.append(section["id"]))
+        self.addCleanup(unwatch_task, task.id)
+
+        # A first reply that breaks off mid-section is discarded when the agent retries
+        crewai_event_bus.emit(self, LLMStreamChunkEvent(chunk=ANSWER[:ANSWER.index('"c1"')], from_task=task))
+        crewai_event_bus.emit(self, LLMCallStartedEvent(model="test", messages="retry", from_task=task))
+        for chunk in chunks(ANSWER):
+            crewai_event_bus.emit(self, LLMStreamChunkEvent(chunk=chunk, from_task=task))
+        other = SimpleNamespace(id=uuid.uuid4(), name="research_task", agent=None)
+        crewai_event_bus.emit(self, LLMStreamChunkEvent(chunk=ANSWER, from_task=other))
+
+        self.assertEqual(emitted, ["c1", "c2"])
+
+
+class TestStreamingPublisher(unittest.TestCase):
+    """Test publishing sections one at a time against the local Trello stand-in."""
+
+    def setUp(self):
+        self.services = FakeServices(FakeBoard(num_cards=3)).start()
+        self.addCleanup(self.services.stop)
+        env = patch.dict(os.environ, {**self.services.env(), "TRELLO_RATE_LIMIT": "1000000"})
+        env.start()
+        self.addCleanup(env.stop)
+        self.board = self.services.board
+
+    def test_each_card_is_published_once(self):
+        """Test that submitted sections are commented and moved once each, in submission order."""
+        cards = self.board.cards_in_list(self.board.todo_list_id)
+        published = []
+        publisher = StreamingPublisher(on_published=published.append, workers=2)
+        for card in cards + cards[:1]:
+            publisher.submit(Section(id=card["id"], name=card["name"], article=f"# {card['name']}"))
+        report = publisher.wait()
+
+        self.assertEqual([result.card_id for result in report.results], [card["id"] for card in cards])
+        self.assertEqual(len(report.succeeded), 3)
+        self.assertEqual(len(published), 3)
+        self.assertEqual(len(self.board.comments), 3)
+        self.assertEqual(self.board.cards_in_list(self.board.todo_list_id), [])
+        self.assertIsNotNone(publisher.first_update_after)
+
+    def test_sections_share_one_session(self):
+        """Test that every section of a run is published on one event loop and aiohttp session."""
+        cards = self.board.cards_in_list(self.board.todo_list_id)
+        with patch("pro_tools.utils.async_trello_utils.asyncio.run") as run, \
+                patch("pro_tools.utils.async_trello_utils.aiohttp.ClientSession",
+                      wraps=aiohttp.ClientSession) as session:
+            publisher = StreamingPublisher(workers=3)
+            for card in cards:
+                publisher.submit(Section(id=card["id"], name=card["name"], article=f"# {card['name']}"))
+            report = publisher.wait()
+
+        self.assertEqual(len(report.succeeded), 3)
+        run.assert_not_called()
+        session.assert_called_once()
+        self.assertIsNone(publisher._session._loop)
+
+
+class TestCrewStreaming(unittest.TestCase):
+    """Test how the crew hands sections to the streaming publisher."""
+
+    def test_streaming_implies_direct_write(self):
+        """Test that streaming mode drops the trello_update_task and watches the article task."""
+        pro_tools = ProTools(stream_results=True)
+        crew = pro_tools.crew()
+        self.addCleanup(unwatch_task, pro_tools._streamed_task_id)
+
+        self.assertEqual([task.name for task in crew.tasks], ["research_task", "article_task"])
+        self.assertIsNotNone(pro_tools._streamed_task_id)
+
+    def test_sections_are_published_as_they_stream(self):
+        """Test that each known section is submitted the moment it closes, and the callback only adds the rest."""
+        pro_tools = ProTools(stream_results=True)
+        pro_tools.article_task()
+        self.addCleanup(unwatch_task, pro_tools._streamed_task_id)
+        pro_tools._card_activity = {"c1": None, "c2": None, "c3": None}
+        pro_tools._publisher = MagicMock()
+        received = []
+        pro_tools._publisher.submit.side_effect = lambda section: received.append((section.id, len("".join(sent))))
+
+        task = SimpleNamespace(id=pro_tools._streamed_task_id, name="article_task", agent=None)
+        sent = []
+        for chunk in chunks(ANSWER):
+            sent.append(chunk)
+            crewai_event_bus.emit(self, LLMStreamChunkEvent(chunk=chunk, from_task=task))
+        self.assertEqual([card_id for card_id, _ in received], ["c1", "c2"])
+        self.assertLess(received[0][1], ANSWER.index('"id": "c2"'))
+
+        late = Section(id="c3", name="Third", article="# Third")
+        made_up = Section(id="made-up", name="x", article="x")
+        pro_tools._record_article(MagicMock(pydantic=Article(sections=ARTICLE.sections + [late, made_up])))
+        self.assertEqual([card_id for card_id, _ in received], ["c1", "c2", "c3"])
+
+    def test_failed_kickoff_closes_the_publisher(self):
+        """Test that a kickoff that raises stops watching the stream and waits for the publisher."""
+        pro_tools = ProTools(stream_results=True)
+        crew = pro_tools.crew()
+        pro_tools.prepare_inputs({"trello_cards": [{"id": "c1", "name": "First"}]})
+        publisher = pro_tools._publisher = MagicMock()
+        publisher.wait.return_value = PublishReport()
+
+        crewai_event_bus.emit(crew, CrewKickoffFailedEvent(error="boom", crew_name="crew"))
+        crewai_event_bus.emit(crew, CrewKickoffFailedEvent(error="boom", crew_name="crew"))
+
+        publisher.wait.assert_called_once()
+        self.assertNotIn(str(pro_tools._streamed_task_id), section_stream._streams)
+        pro_tools._leave_stage()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import unittest
+from unittest.mock import patch
+
+from crewai import TaskOutput
+
+from pro_tools.crew import ProTools
+from pro_tools.models.research import Research, Topic
+from pro_tools.utils.topic_clusters import cluster_cards, normalize_name
+
+CARDS = [
+    {"id": "c1", "name": "GPT-5 release"},
+    {"id": "c2", "name": "AI agents"},
+    {"id": "c3", "name": "GPT 5 released?"},
+    {"id": "c4", "name": "AI agent memory"},
+    {"id": "c5", "name": "LLaMA-4"},
+    {"id": "c6", "name": "Llama 4"},
+]
+
+
+class TestTopicClusters(unittest.TestCase):
+    """Test collapsing cards with near-duplicate names."""
+
+    def test_near_duplicate_names_cluster_together(self):
+        """Test that reworded names cluster and related but distinct topics stay apart."""
+        clusters = cluster_cards(CARDS)
+
+        self.assertEqual(normalize_name("GPT-5 released?"), "gpt 5 released")
+        self.assertEqual([[card["id"] for card in cluster] for cluster in clusters],
+                         [["c1", "c3"], ["c2"], ["c4"], ["c5", "c6"]])
+        # Only names identical once normalized still cluster at the strictest threshold
+        self.assertEqual([len(cluster) for cluster in cluster_cards(CARDS, threshold=1.0)], [1, 1, 1, 1, 2])
+        self.assertEqual(len(cluster_cards([{"id": "a", "name": ""}, {"id": "b", "name": "?"}])), 2)
+
+    def test_crew_researches_each_cluster_once_and_fans_out(self):
+        """Test that only the first card of a cluster is researched and its topic reaches every card."""
+        with patch.dict(os.environ, {"CARD_DEDUP_ENABLED": "true"}):
+            pro_tools = ProTools()
+        inputs = pro_tools.prepare_inputs({"trello_cards": CARDS})
+        self.assertEqual([card["id"] for card in inputs["trello_cards"]], ["c1", "c2", "c4", "c5"])
+
+        research = Research(research_topics=[
+            Topic(id=card["id"], name=card["name"], research=f"Findings on {card['name']}")
+            for card in inputs["trello_cards"]
+        ])
+        output = TaskOutput(description="research", agent="researcher", raw=research.model_dump_json(),
+                            pydantic=research)
+        success, result = pro_tools._prepare_research(output)
+
+        self.assertTrue(success)
+        topics = {topic.id: topic for topic in result.pydantic.research_topics}
+        self.assertEqual(list(topics), ["c1", "c3", "c2", "c4", "c5", "c6"])
+        self.assertEqual(topics["c3"].name, "GPT 5 released?")
+        self.assertEqual(topics["c3"].research, "Findings on GPT-5 release")
+        self.assertEqual(Research.model_validate_json(result.raw), result.pydantic)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import unittest
+from unittest.mock import patch, MagicMock
+
+from pro_tools.utils.trello_utils import TrelloUtils
+
+
+def mock_response(status_code, payload):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = payload
+    response.text = str(payload)
+    return response
+
+
+@patch.dict(os.environ, {
+    'TRELLO_API_KEY': 'key',
+    'TRELLO_API_TOKEN': 'token',
+    'TRELLO_CREDENTIAL_CACHE_TTL': '0',
+})
+class TestStartupSnapshot(unittest.TestCase):
+    """Test the batched startup snapshot of the board and TODO list."""
+
+    @patch('pro_tools.utils.trello_utils.http_client')
+    def test_snapshot_uses_one_batch_request(self, mock_http_client):
+        """Test that board, lists and cards come back from a single request."""
+        mock_http_client.get.return_value = mock_response(200, [
+            {'200': {'name': 'Board', 'lists': [{'id': 'todo', 'name': 'TODO'}]}},
+            {'200': [{'id': 'c1', 'name': 'Card 1', 'desc': 'ignored'}]},
+        ])
+
+        snapshot = TrelloUtils(verify_access=False).get_startup_snapshot('board', 'todo')
+
+        self.assertEqual(snapshot['cards'], [{'id': 'c1', 'name': 'Card 1'}])
+        mock_http_client.get.assert_called_once()
+        url = mock_http_client.get.call_args.args[0]
+        self.assertTrue(url.endswith('/1/batch'))
+
+    @patch('pro_tools.utils.trello_utils.http_client')
+    def test_snapshot_checks_list_membership_locally(self, mock_http_client):
+        """Test that a list missing from the board's open lists is rejected."""
+        mock_http_client.get.return_value = mock_response(200, [
+            {'200': {'name': 'Board', 'lists': [{'id': 'other', 'name': 'Other'}]}},
+            {'200': []},
+        ])
+
+        with self.assertRaises(ValueError) as context:
+            TrelloUtils(verify_access=False).get_startup_snapshot('board', 'todo')
+
+        self.assertIn("not found in board", str(context.exception))
+
+    @patch('pro_tools.utils.trello_utils.http_client')
+    def test_board_enumeration_is_opt_in(self, mock_http_client):
+        """Test that verifying access does not list boards unless asked to."""
+        mock_http_client.get.return_value = mock_response(200, {'username': 'me'})
+
+        TrelloUtils()
+
+        mock_http_client.get.assert_called_once()
+
+
+@patch.dict(os.environ, {
+    'TRELLO_API_KEY': 'key',
+    'TRELLO_API_TOKEN': 'token',
+    'TRELLO_CREDENTIAL_CACHE_TTL': '0',
+})
+class TestCardPagination(unittest.TestCase):
+    """Test paging through a list with Trello's limit/before parameters."""
+
+    @patch('pro_tools.utils.trello_utils.http_client')
+    def test_iter_cards_pages_with_before_cursor(self, mock_http_client):
+        """Test that pages are requested until a short page is returned."""
+        mock_http_client.get.side_effect = [
+            mock_response(200, [{'id': 'c5', 'name': 'e'}, {'id': 'c4', 'name': 'd'}]),
+            mock_response(200, [{'id': 'c3', 'name': 'c'}, {'id': 'c2', 'name': 'b'}]),
+            mock_response(200, [{'id': 'c1', 'name': 'a'}]),
+        ]
+
+        cards = list(TrelloUtils(verify_access=False).iter_cards_in_list('todo', page_size=2))
+
+        self.assertEqual([card['id'] for card in cards], ['c5', 'c4', 'c3', 'c2', 'c1'])
+        befores = [call.kwargs['params'].get('before') for call in mock_http_client.get.call_args_list]
+        self.assertEqual(befores, [None, 'c4', 'c2'])
+
+    @patch('pro_tools.utils.trello_utils.http_client')
+    def test_iter_cards_follows_the_lean_payload_switch(self, mock_http_client):
+        """Test that pages are projected to the card fields unless lean payloads are off."""
+        mock_http_client.get.return_value = mock_response(200, [{'id': 'c1', 'name': 'a'}])
+        trello_utils = TrelloUtils(verify_access=False)
+
+        list(trello_utils.iter_cards_in_list('todo'))
+        with patch.dict(os.environ, {'TRELLO_LEAN_PAYLOADS': 'false'}):
+            list(trello_utils.iter_cards_in_list('todo'))
+
+        fields = [call.kwargs['params'].get('fields') for call in mock_http_client.get.call_args_list]
+        self.assertEqual(fields, ['id,name,dateLastActivity', None])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import os
+import threading
+import unittest
+from unittest.mock import patch
+
+import requests
+
+from pro_tools.testing.fake_services import FakeBoard, FakeServices
+from pro_tools.testing.webhook_sender import build_action, send_webhook
+from pro_tools.utils import http_client
+from pro_tools.webhook_daemon import WebhookDaemon, card_from_action
+
+
+class TestWebhookDaemon(unittest.TestCase):
+    """Test the webhook daemon against the local Trello stand-in and simulated webhooks."""
+
+    SECRET = "app-secret"
+
+    def setUp(self):
+        self.services = FakeServices(FakeBoard(num_cards=2), webhook_secret=self.SECRET).start()
+        self.addCleanup(self.services.stop)
+        env = patch.dict(os.environ, {**self.services.env(), "TRELLO_RATE_LIMIT": "1000000"})
+        env.start()
+        self.addCleanup(env.stop)
+        self.board = self.services.board
+        self.batches = []
+        self.processed = threading.Event()
+
+    def _process(self, cards):
+        self.batches.append(cards)
+        self.processed.set()
+
+    def _daemon(self, **kwargs):
+        daemon = WebhookDaemon(process=self._process, host="127.0.0.1", port=0, batch_window=0.05, **kwargs)
+        self.addCleanup(daemon._server.server_close)
+        return daemon
+
+    def _trello(self, method, path, **params):
+        params.update({"key": "fake-key", "token": "fake-token"})
+        return http_client.request(method, f"{self.services.trello_api_url}{path}", params=params).json()
+
+    def _wait_for_cards(self, count):
+        while sum(len(batch) for batch in self.batches) < count:
+            self.assertTrue(self.processed.wait(5), "no batch processed")
+            self.processed.clear()
+
+    def test_card_from_action_only_accepts_arrivals_in_the_list(self):
+        """Test that only cards created in or moved into the TODO list are picked up."""
+        card = {"id": "c1", "name": "AI agents"}
+        todo, doing = self.board.todo_list_id, self.board.doing_list_id
+
+        self.assertEqual(card_from_action(build_action("createCard", card, todo), todo)["id"], "c1")
+        self.assertEqual(card_from_action(build_action("updateCard", card, todo, doing), todo)["id"], "c1")
+        self.assertIsNone(card_from_action(build_action("updateCard", card, doing, todo), todo))
+        self.assertIsNone(card_from_action(build_action("createCard", card, doing), todo))
+        self.assertIsNone(card_from_action({"action": {"type": "commentCard", "data": {"card": card}}}, todo))
+
+    def test_registers_webhook_and_processes_new_and_moved_cards(self):
+        """Test that the daemon registers a webhook and processes only cards arriving in TODO."""
+        daemon = self._daemon(secret=self.SECRET, callback_url="pending", catch_up=False)
+        # The port is only known once the server is bound
+        daemon.callback_url = daemon.url
+        with daemon:
+            self.assertEqual([webhook["callbackURL"] for webhook in self.services.webhooks.values()], [daemon.url])
+
+            created = self._trello("POST", "/cards", idList=self.board.todo_list_id, name="Tool calling")
+            self._wait_for_cards(1)
+            # Moving a card out of TODO is ignored, moving it back in queues it again
+            self._trello("PUT", f"/cards/{created['id']}", idList=self.board.doing_list_id)
+            self._trello("PUT", f"/cards/{created['id']}", idList=self.board.todo_list_id)
+            self._wait_for_cards(2)
+
+        cards = [card for batch in self.batches for card in batch]
+        self.assertEqual([card["id"] for card in cards], [created["id"], created["id"]])
+        self.assertEqual(cards[0]["name"], "Tool calling")
+        self.assertEqual(self.services.webhooks, {})
+
+    def test_rejects_unsigned_callbacks(self):
+        """Test that callbacks without a valid signature are refused and not queued."""
+        daemon = self._daemon(secret=self.SECRET, callback_url="https://example.com/hook", catch_up=False)
+        payload = build_action("createCard", {"id": "c1", "name": "AI agents"}, self.board.todo_list_id)
+        with patch.object(daemon, "register_webhook"), daemon:
+            self.assertEqual(send_webhook(daemon.url, payload), 401)
+            self.assertEqual(send_webhook(daemon.url, payload, "wrong-secret", daemon.callback_url), 401)
+            self.assertEqual(send_webhook(daemon.url, payload, self.SECRET, daemon.callback_url), 200)
+            self.assertEqual(requests.head(daemon.url, timeout=5).status_code, 200)
+            self._wait_for_cards(1)
+
+        self.assertEqual(self.batches, [[{"id": "c1", "name": "AI agents",
+                                           "dateLastActivity": payload["action"]["date"]}]])
+
+    def test_serves_from_a_worker_thread_on_localhost_by_default(self):
+        """Test that serve_forever runs off the main thread and listens on 127.0.0.1 unless told otherwise."""
+        daemon = WebhookDaemon(process=self._process, port=0, catch_up=False)
+        self.addCleanup(daemon._server.server_close)
+        self.assertEqual(daemon._server.server_address[0], "127.0.0.1")
+
+        errors = []
+
+        def serve():
+            try:
+                daemon.serve_forever()
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=serve)
+        thread.start()
+        daemon._stopping.set()
+        thread.join(10)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(errors, [])
+
+    def test_catch_up_queues_existing_cards_once(self):
+        """Test that cards already in TODO are queued on start and duplicates are collapsed."""
+        daemon = self._daemon(catch_up=False)
+        existing = self.board.cards_in_list(self.board.todo_list_id)
+        self.assertEqual(daemon.queue_existing_cards(), 2)
+        self.assertEqual(daemon.queue_existing_cards(), 0)
+        with daemon:
+            self._wait_for_cards(2)
+
+        self.assertEqual(sorted(card["id"] for batch in self.batches for card in batch),
+                         sorted(card["id"] for card in existing))
+
+
+if __name__ == "__main__":
+    unittest.main()
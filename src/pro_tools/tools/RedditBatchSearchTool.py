@@ -0,0 +1,52 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Type
+
+from pydantic import BaseModel, Field, PrivateAttr
+
+from pro_tools.tools.RedditSearchTool import RedditSerpApiSearchTool
+from pro_tools.utils import deadline
+from pro_tools.utils.metrics import timed
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+class SerpApiBatchSearchToolInput(BaseModel):
+    queries: List[str] = Field(..., description="The queries to search the web for.")
+    max_results: int = Field(3, description="The maximum number of results to return per query.")
+
+
+class RedditSerpApiBatchSearchTool(RedditSerpApiSearchTool):
+    name: str = "Reddit Batch Search Tool"
+    description: str = (
+        "Search Reddit and the web for several queries in one call. "
+        "Returns the results grouped by query."
+    )
+    args_schema: Type[BaseModel] = SerpApiBatchSearchToolInput
+    _max_concurrency: int = PrivateAttr()
+
+    def __init__(self):
+        super().__init__()
+        self._max_concurrency = int(os.getenv("SERPAPI_MAX_CONCURRENCY") or DEFAULT_MAX_CONCURRENCY)
+
+    @timed("tool")
+    @deadline.bounded
+    def _run(self, queries: List[str], max_results: int = 3) -> str:
+        # Drop blanks and exact repeats while keeping the agent's order
+        unique_queries = list(dict.fromkeys(query.strip() for query in queries if query.strip()))
+        if not unique_queries:
+            return "No queries provided."
+
+        workers = min(self._max_concurrency, len(unique_queries))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="serpapi") as executor:
+            results = list(
+                executor.map(
+                    # Each search keeps the deadline of the agent's tool call
+                    deadline.bind(lambda query: RedditSerpApiSearchTool._run(self, query, max_results)),
+                    unique_queries,
+                )
+            )
+
+        return "\n".join(
+            f"## Query: {query}\n\n{result}" for query, result in zip(unique_queries, results)
+        )
@@ -1,11 +1,18 @@
 import os
+import sqlite3
 from typing import Type, Dict, Any, List, Optional
 import json
-import requests
 
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field, PrivateAttr
 
+from pro_tools.utils import http_client
+from pro_tools.utils.deadline import DeadlineExceeded, bounded
+from pro_tools.utils.http_client import serpapi_url
+from pro_tools.utils.metrics import timed
+from pro_tools.utils.research_compactor import dedupe_results
+from pro_tools.utils.search_cache import SearchCache
+
 
 class SerpApiSearchToolInput(BaseModel):
     query: str = Field(..., description="The query to search the web for.")
@@ -17,26 +24,49 @@ class RedditSerpApiSearchTool(BaseTool):
     description: str = "Search Reddit and the web for information"
     args_schema: Type[BaseModel] = SerpApiSearchToolInput
     _api_key: str = PrivateAttr()
+    _cache: Optional[SearchCache] = PrivateAttr(default=None)
+    _dedupe: bool = PrivateAttr(default=False)
+    _hedge: bool = PrivateAttr(default=False)
 
     def __init__(self):
         super().__init__()
         self._api_key = os.getenv("SERPAPI_API_KEY")
         if not self._api_key:
             print("Warning: SERPAPI_API_KEY environment variable not set. Search will return placeholder results.")
+        if os.getenv("SERPAPI_CACHE_ENABLED", "").lower() == "true":
+            self._cache = SearchCache()
+        # Results that repeat one another only cost the researcher tokens
+        self._dedupe = os.getenv("RESEARCH_COMPACTION_ENABLED", "").lower() == "true"
+        # Re-send searches slower than the usual p95 and take the first answer
+        self._hedge = os.getenv("SERPAPI_HEDGE_ENABLED", "").lower() == "true"
 
+    @timed("tool")
+    @bounded
     def _run(self, query: str, max_results: int = 3) -> str:
         if not self._api_key:
             return self._get_placeholder_results(query)
         
         try:
             return self._search_with_serpapi(query, max_results)
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             print(f"Error using SerpApi: {str(e)}")
-            return self._get_placeholder_results(query)
+            return f"Error: SerpApi search for '{query}' failed: {str(e)}"
 
     def _search_with_serpapi(self, query: str, max_results: int) -> str:
+        if self._cache is not None:
+            try:
+                cached = self._cache.get(query, max_results)
+            except sqlite3.Error as e:
+                # A broken cache only costs the search it would have saved
+                print(f"SerpApi cache unavailable: {str(e)}")
+                cached = None
+            if cached is not None:
+                return self._format_results(cached, max_results)
+
         # Base URL for SerpApi
-        base_url = "https://serpapi.com/search"
+        base_url = serpapi_url()
         
         # Parameters for the search
         params = {
@@ -47,11 +77,19 @@ class RedditSerpApiSearchTool(BaseTool):
         }
         
         # Make the request
-        response = requests.get(base_url, params=params)
+        if self._hedge:
+            response = http_client.hedged_get(base_url, params=params)
+        else:
+            response = http_client.get(base_url, params=params)
         response.raise_for_status()
         
         # Parse the response
         results = response.json()
+        if self._cache is not None and "error" not in results:
+            try:
+                self._cache.put(query, max_results, results)
+            except sqlite3.Error as e:
+                print(f"SerpApi cache unavailable: {str(e)}")
         
         # Format the results
         formatted_results = self._format_results(results, max_results)
@@ -62,7 +100,10 @@ class RedditSerpApiSearchTool(BaseTool):
         if "organic_results" not in results or not results["organic_results"]:
             return "No results found."
         
-        organic_results = results["organic_results"][:max_results]
+        organic_results = results["organic_results"]
+        if self._dedupe:
+            organic_results = dedupe_results(organic_results)
+        organic_results = organic_results[:max_results]
         
         formatted_text = f"Search results for: {results.get('search_parameters', {}).get('q', 'Unknown query')}\n\n"
         
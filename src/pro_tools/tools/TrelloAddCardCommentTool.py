@@ -1,11 +1,16 @@
 import os
 from typing import Type
 
-import requests
 from crewai.tools import BaseTool
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
 
+from pro_tools.utils import http_client
+from pro_tools.utils.deadline import bounded
+from pro_tools.utils.http_client import trello_api_url
+from pro_tools.utils.async_trello_utils import AsyncTrelloUtils
+from pro_tools.utils.metrics import timed
+
 load_dotenv()
 
 
@@ -21,6 +26,8 @@ class TrelloAddCardCommentTool(BaseTool):
     description: str = "Adds a comment to a specified Trello card."
     args_schema: Type[BaseModel] = TrelloAddCardCommentInput
 
+    @timed("tool")
+    @bounded
     def _run(self, card_id: str, text: str) -> str:
         api_key = os.getenv("TRELLO_API_KEY")
         api_token = os.getenv("TRELLO_API_TOKEN")
@@ -30,17 +37,31 @@ class TrelloAddCardCommentTool(BaseTool):
         if not api_token:
             return "Error: TRELLO_API_TOKEN environment variable not set."
 
-        url = f"https://api.trello.com/1/cards/{card_id}/actions/comments"
+        url = f"{trello_api_url()}/cards/{card_id}/actions/comments"
         headers = {"Accept": "application/json"}
         query = {"text": text, "key": api_key, "token": api_token}
 
-        response = requests.post(url, headers=headers, params=query)
+        response = http_client.post(url, headers=headers, params=query)
 
         if response.status_code == 200:
             return "Comment added successfully."
         else:
             return f"Error: {response.status_code} - {response.text}"
 
+    @timed("tool")
+    @bounded
+    async def _arun(self, card_id: str, text: str) -> str:
+        api_key = os.getenv("TRELLO_API_KEY")
+        api_token = os.getenv("TRELLO_API_TOKEN")
+
+        if not api_key:
+            return "Error: TRELLO_API_KEY environment variable not set."
+        if not api_token:
+            return "Error: TRELLO_API_TOKEN environment variable not set."
+
+        async with AsyncTrelloUtils(api_key, api_token) as trello:
+            return await trello.add_card_comment(card_id, text)
+
 
 if __name__ == "__main__":
     # Test the TrelloAddCardCommentTool
@@ -1,11 +1,16 @@
 import os
 from typing import Any, Dict, Optional, Type
 
-import requests
 from crewai.tools import BaseTool
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
 
+from pro_tools.utils import http_client
+from pro_tools.utils.deadline import bounded
+from pro_tools.utils.http_client import trello_api_url
+from pro_tools.utils.async_trello_utils import AsyncTrelloUtils
+from pro_tools.utils.metrics import timed
+
 load_dotenv()
 
 
@@ -61,6 +66,18 @@ class TrelloUpdateCardTool(BaseTool):
     )
     args_schema: Type[BaseModel] = TrelloUpdateCardInput
 
+    @staticmethod
+    def _build_query(**kwargs) -> Dict[str, Any]:
+        query = {key: value for key, value in kwargs.items() if value is not None}
+
+        # NOTE: We are moving from the "To Do" list to the "Doing" list, so we need to update the list ID to use our target list ID
+        if "idList" in query:
+            query["idList"] = os.getenv("TRELLO_DOING_LIST_ID")
+
+        return query
+
+    @timed("tool")
+    @bounded
     def _run(self, card_id: str, **kwargs) -> str:
         api_key = os.getenv("TRELLO_API_KEY")
         api_token = os.getenv("TRELLO_API_TOKEN")
@@ -70,23 +87,33 @@ class TrelloUpdateCardTool(BaseTool):
         if not api_token:
             return "Error: TRELLO_API_TOKEN environment variable not set."
 
-        url = f"https://api.trello.com/1/cards/{card_id}"
+        url = f"{trello_api_url()}/cards/{card_id}"
         print("url", url)
-        query = {key: value for key, value in kwargs.items() if value is not None}
+        query = self._build_query(**kwargs)
         print("query", query)
         query.update({"key": api_key, "token": api_token})
 
-        # NOTE: We are moving from the "To Do" list to the "Doing" list, so we need to update the list ID to use our target list ID
-        if "idList" in query:
-            query["idList"] = os.getenv("TRELLO_DOING_LIST_ID")
-
-        response = requests.put(url, params=query)
+        response = http_client.put(url, params=query)
 
         if response.status_code == 200:
             return "Card updated successfully."
         else:
             return f"Error: {response.status_code} - {response.text}"
 
+    @timed("tool")
+    @bounded
+    async def _arun(self, card_id: str, **kwargs) -> str:
+        api_key = os.getenv("TRELLO_API_KEY")
+        api_token = os.getenv("TRELLO_API_TOKEN")
+
+        if not api_key:
+            return "Error: TRELLO_API_KEY environment variable not set."
+        if not api_token:
+            return "Error: TRELLO_API_TOKEN environment variable not set."
+
+        async with AsyncTrelloUtils(api_key, api_token) as trello:
+            return await trello.update_card(card_id, **self._build_query(**kwargs))
+
 
 if __name__ == "__main__":
     # Test the TrelloUpdateCardTool
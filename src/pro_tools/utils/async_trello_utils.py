@@ -0,0 +1,346 @@
+import asyncio
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import aiohttp
+
+from pro_tools.utils import deadline
+from pro_tools.utils.board_mirror import READ_METHODS, expire_mirror
+from pro_tools.utils.credential_cache import AUTH_FAILURE_STATUS_CODES, CredentialCache
+from pro_tools.utils.http_client import trello_api_url
+from pro_tools.utils.metrics import get_metrics
+from pro_tools.utils.rate_limiter import (
+    TokenBucket,
+    backoff_delay,
+    get_trello_rate_limiter,
+    max_throttle_retries,
+)
+from pro_tools.utils.trello_utils import CARD_FIELDS, lean_payloads
+
+DEFAULT_CONCURRENCY = 10
+
+
+class AsyncTrelloUtils:
+    """
+    Asyncio counterpart to TrelloUtils and the Trello tools.
+
+    Requests share one pooled aiohttp session and run concurrently, bounded by
+    `concurrency` in-flight requests and the process-wide Trello token bucket
+    that the synchronous client uses as well.
+    Use it as an async context manager:
+
+        async with AsyncTrelloUtils() as trello:
+            results = await trello.comment_and_move_cards(updates)
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        token: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+    ):
+        self.api_key = api_key or os.getenv("TRELLO_API_KEY")
+        self.token = token or os.getenv("TRELLO_API_TOKEN")
+        if not self.api_key or not self.token:
+            raise ValueError("TRELLO_API_KEY and TRELLO_API_TOKEN must be set.")
+
+        if concurrency is None:
+            concurrency = int(os.getenv("TRELLO_ASYNC_CONCURRENCY") or DEFAULT_CONCURRENCY)
+        self.concurrency = concurrency
+        self.rate_limiter = rate_limiter or get_trello_rate_limiter()
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        self._session = aiohttp.ClientSession(connector=connector)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._session.close()
+        self._session = None
+
+    @staticmethod
+    def _encode_params(params: Dict[str, Any]) -> Dict[str, str]:
+        # aiohttp only accepts str/int/float query values.
+        encoded = {}
+        for key, value in params.items():
+            if value is None:
+                continue
+            if isinstance(value, bool):
+                value = "true" if value else "false"
+            elif not isinstance(value, (str, int, float)):
+                value = str(value)
+            encoded[key] = value
+        return encoded
+
+    async def _request(
+        self, method: str, path: str, params: Optional[Dict[str, Any]] = None
+    ) -> Tuple[int, Any]:
+        """
+        Sends one request to the Trello API.
+
+        Returns:
+            tuple: The status code and the decoded JSON body (or raw text on errors).
+        """
+        if self._session is None:
+            raise RuntimeError("AsyncTrelloUtils must be used as an async context manager.")
+
+        query = dict(params or {})
+        query.update({"key": self.api_key, "token": self.token})
+
+        base_url = trello_api_url()
+        host = urlparse(base_url).hostname
+        retries = max_throttle_retries()
+        metrics = get_metrics()
+        attempt = 0
+        async with self._semaphore:
+            while True:
+                await self.rate_limiter.acquire_async()
+                try:
+                    connect, total = deadline.request_timeout()
+                    with metrics.span("http", host):
+                        async with self._session.request(
+                            method,
+                            f"{base_url}{path}",
+                            params=self._encode_params(query),
+                            headers={"Accept": "application/json"},
+                            timeout=aiohttp.ClientTimeout(total=total, connect=connect),
+                        ) as response:
+                            body = await response.read()
+                except (asyncio.TimeoutError, TimeoutError) as e:
+                    # Reported per card like any other connection error
+                    raise aiohttp.ServerTimeoutError(str(e) or f"{method} {path} timed out") from e
+                metrics.increment("http_requests", host=host, status=response.status)
+                metrics.increment("http_bytes_received", len(body), host=host)
+                if response.status == 200:
+                    if method not in READ_METHODS:
+                        expire_mirror()
+                    return response.status, json.loads(body) if body.strip() else None
+                if response.status in AUTH_FAILURE_STATUS_CODES:
+                    CredentialCache().invalidate(self.api_key, self.token)
+                if response.status != 429 or attempt >= retries:
+                    return response.status, body.decode("utf-8", errors="replace")
+                delay = backoff_delay(attempt, response.headers.get("Retry-After"))
+                attempt += 1
+                metrics.increment("http_throttle_retries", host=host)
+                self.rate_limiter.throttle(delay)
+
+    async def get_board_lists(self, board_id: str):
+        """
+        Fetches all lists for the given board ID.
+
+        Returns:
+            list: The board's lists, or an error message if the request fails.
+        """
+        try:
+            status, data = await self._request("GET", f"/boards/{board_id}/lists")
+        except aiohttp.ClientError as e:
+            return f"Error: Unable to connect to Trello API. {e}"
+        if status == 200:
+            return data
+        return f"Error: {status} - {data}"
+
+    async def verify_list(self, list_id: str):
+        """
+        Fetches the details of a single list.
+
+        Returns:
+            dict: The list details, or an error message if the request fails.
+        """
+        try:
+            status, data = await self._request("GET", f"/lists/{list_id}")
+        except aiohttp.ClientError as e:
+            return f"Error: Unable to verify list. {e}"
+        if status == 200:
+            return data
+        return f"Error: {status} - {data}"
+
+    async def get_lists(self, list_ids: List[str]) -> List[Any]:
+        """
+        Fetches several lists concurrently, preserving input order.
+        """
+        return await asyncio.gather(*(self.verify_list(list_id) for list_id in list_ids))
+
+    async def get_cards_in_list(self, list_id: str):
+        """
+        Fetches all cards from the specified list.
+
+        Returns:
+            list: Dictionaries with the card `id` and `name`, or an error message.
+        """
+        if not list_id:
+            return "Error: List ID must be provided."
+        # Projected like TrelloUtils.get_cards_in_list (TRELLO_LEAN_PAYLOADS)
+        params = {"fields": CARD_FIELDS} if lean_payloads() else None
+        try:
+            status, data = await self._request("GET", f"/lists/{list_id}/cards", params)
+        except aiohttp.ClientError as e:
+            return f"Error: Unable to connect to Trello API. {e}"
+        if status == 200:
+            return [{"id": card["id"], "name": card["name"]} for card in data]
+        return f"Error: {status} - {data}"
+
+    async def add_card_comment(self, card_id: str, text: str) -> str:
+        """
+        Adds a comment to a card. Mirrors TrelloAddCardCommentTool.
+        """
+        try:
+            status, data = await self._request(
+                "POST", f"/cards/{card_id}/actions/comments", {"text": text}
+            )
+        except aiohttp.ClientError as e:
+            return f"Error: Unable to connect to Trello API. {e}"
+        if status == 200:
+            return "Comment added successfully."
+        return f"Error: {status} - {data}"
+
+    async def update_card(self, card_id: str, **fields) -> str:
+        """
+        Updates properties of a card. Mirrors TrelloUpdateCardTool.
+        """
+        try:
+            status, data = await self._request("PUT", f"/cards/{card_id}", fields)
+        except aiohttp.ClientError as e:
+            return f"Error: Unable to connect to Trello API. {e}"
+        if status == 200:
+            return "Card updated successfully."
+        return f"Error: {status} - {data}"
+
+    async def move_card(self, card_id: str, list_id: Optional[str] = None) -> str:
+        """
+        Moves a card to `list_id`, defaulting to TRELLO_DOING_LIST_ID.
+        """
+        return await self.update_card(card_id, idList=list_id or os.getenv("TRELLO_DOING_LIST_ID"))
+
+    async def move_cards(self, card_ids: List[str], list_id: Optional[str] = None) -> List[str]:
+        """
+        Moves many cards concurrently. Returns one outcome per card, in input order.
+        """
+        return await asyncio.gather(*(self.move_card(card_id, list_id) for card_id in card_ids))
+
+    async def comment_and_move_card(
+        self, card_id: str, text: str, list_id: Optional[str] = None
+    ) -> Dict[str, str]:
+        """
+        Comments on a card and, if the comment succeeded, moves it.
+        """
+        comment = await self.add_card_comment(card_id, text)
+        if comment.startswith("Error"):
+            return {"card_id": card_id, "comment": comment, "move": "Skipped: comment failed."}
+        move = await self.move_card(card_id, list_id)
+        return {"card_id": card_id, "comment": comment, "move": move}
+
+    async def comment_and_move_cards(
+        self, updates: List[Dict[str, str]], list_id: Optional[str] = None
+    ) -> List[Dict[str, str]]:
+        """
+        Comments on and moves many cards concurrently.
+
+        Args:
+            updates (list): Dictionaries with `card_id` and `text` keys.
+            list_id (str): Target list, defaulting to TRELLO_DOING_LIST_ID.
+
+        Returns:
+            list: One result dictionary per update, in input order.
+        """
+        return await asyncio.gather(
+            *(
+                self.comment_and_move_card(update["card_id"], update["text"], list_id)
+                for update in updates
+            )
+        )
+
+
+class TrelloSession:
+    """
+    One AsyncTrelloUtils session on a background event loop, shared by
+    synchronous callers from any thread.
+
+    Callers that publish many times per run (like StreamingPublisher) use it
+    instead of paying for a new event loop and connection pool per call.
+    The loop and session are opened on first use and closed by `close()`.
+    """
+
+    def __init__(self, **kwargs):
+        self._kwargs = kwargs
+        self._trello: Optional[AsyncTrelloUtils] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _run(self, coro):
+        # The coroutine runs in a copy of the caller's context, so the
+        # caller's deadline bounds its requests
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def _open(self) -> AsyncTrelloUtils:
+        with self._lock:
+            if self._trello is None:
+                trello = AsyncTrelloUtils(**self._kwargs)
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name="trello-session", daemon=True
+                )
+                self._thread.start()
+                self._run(trello.__aenter__())
+                self._trello = trello
+            return self._trello
+
+    def comment_and_move_cards(
+        self, updates: List[Dict[str, str]], list_id: Optional[str] = None
+    ) -> List[Dict[str, str]]:
+        """
+        Blocking AsyncTrelloUtils.comment_and_move_cards on the shared session.
+        """
+        trello = self._open()
+        return self._run(trello.comment_and_move_cards(updates, list_id))
+
+    def close(self):
+        """
+        Closes the session and stops its event loop, if it was ever opened.
+        """
+        with self._lock:
+            if self._trello is None:
+                return
+            self._run(self._trello.__aexit__(None, None, None))
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._trello = self._loop = self._thread = None
+
+
+def comment_and_move_cards(
+    updates: List[Dict[str, str]],
+    list_id: Optional[str] = None,
+    session: Optional[TrelloSession] = None,
+) -> List[Dict[str, str]]:
+    """
+    Synchronous entry point for AsyncTrelloUtils.comment_and_move_cards.
+
+    Runs on `session` when given, otherwise on a new event loop and session.
+    """
+    if session is not None:
+        return session.comment_and_move_cards(updates, list_id)
+
+    async def _run():
+        async with AsyncTrelloUtils() as trello:
+            return await trello.comment_and_move_cards(updates, list_id)
+
+    return asyncio.run(_run())
+
+
+def move_cards(card_ids: List[str], list_id: Optional[str] = None) -> List[str]:
+    """
+    Synchronous entry point for AsyncTrelloUtils.move_cards.
+    """
+
+    async def _run():
+        async with AsyncTrelloUtils() as trello:
+            return await trello.move_cards(card_ids, list_id)
+
+    return asyncio.run(_run())
@@ -0,0 +1,269 @@
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional
+
+from pro_tools.utils.sqlite_store import SQLiteStore
+
+DEFAULT_MIRROR_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "pro_tools", "board_mirror.sqlite3"
+)
+# Actions that add a card to the board, or remove it, as opposed to editing it
+CARD_CREATE_ACTIONS = ("createCard", "copyCard", "convertToCardFromCheckItem", "moveCardToBoard")
+CARD_REMOVE_ACTIONS = ("deleteCard", "moveCardFromBoard")
+LIST_CREATE_ACTIONS = ("createList", "moveListToBoard")
+CARD_FIELDS = ("name", "idList", "closed", "pos", "desc")
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def mirror_enabled() -> bool:
+    return os.getenv("BOARD_MIRROR_ENABLED", "false").lower() == "true"
+
+
+def expire_mirror():
+    """
+    Marks the board mirror stale after this process wrote to Trello, so the
+    next mirrored read replays the write instead of waiting out
+    BOARD_MIRROR_MAX_AGE. Does nothing when mirroring is off.
+    """
+    if mirror_enabled():
+        BoardMirror().mark_stale()
+
+
+def expire_mirror_on_write(response, *args, **kwargs):
+    """
+    requests response hook that expires the board mirror after any
+    successful write to Trello (a comment, a card move, ...).
+    """
+    if response.request.method in READ_METHODS or response.status_code != 200:
+        return response
+
+    # http_client installs this hook, so it can only be imported here
+    from pro_tools.utils.http_client import is_trello_url
+
+    if is_trello_url(response.request.url):
+        expire_mirror()
+    return response
+
+
+class BoardMirror(SQLiteStore):
+    """
+    Local SQLite copy of a board's lists and open cards, indexed by list ID
+    and card ID, so reads are local lookups.
+
+    The mirror is filled once from a full board snapshot, then kept current
+    by replaying the board's actions (card created, moved, renamed, archived,
+    commented on, ...) since the last action seen, so a sync costs one
+    request sized by what changed rather than by the board. The path defaults
+    to BOARD_MIRROR_PATH.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS boards (
+            board_id TEXT PRIMARY KEY,
+            data TEXT NOT NULL,
+            last_action_id TEXT,
+            synced_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS lists (
+            list_id TEXT PRIMARY KEY,
+            board_id TEXT NOT NULL,
+            closed INTEGER NOT NULL,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS lists_by_board ON lists (board_id);
+        CREATE TABLE IF NOT EXISTS cards (
+            card_id TEXT PRIMARY KEY,
+            board_id TEXT NOT NULL,
+            list_id TEXT,
+            pos REAL,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS cards_by_list ON cards (list_id, pos);
+        CREATE INDEX IF NOT EXISTS cards_by_board ON cards (board_id);
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        super().__init__(path or os.getenv("BOARD_MIRROR_PATH") or DEFAULT_MIRROR_PATH)
+
+    def sync_state(self, board_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the board's sync cursor (`last_action_id`) and `synced_at`
+        time, or None if the board was never mirrored.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT last_action_id, synced_at FROM boards WHERE board_id = ?", (board_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"last_action_id": row[0], "synced_at": row[1]}
+
+    def mark_stale(self):
+        """
+        Makes the next read of every mirrored board sync first. The sync
+        cursor is kept, so it replays only the actions since the last one.
+        """
+        with self._lock, self._connect() as conn:
+            conn.execute("UPDATE boards SET synced_at = 0")
+
+    def replace(self, board_id: str, board: Dict[str, Any], last_action_id: Optional[str]):
+        """
+        Replaces everything mirrored for a board with a full snapshot.
+
+        Args:
+            board_id (str): The ID the board is mirrored under, as configured
+                (Trello also accepts the short ID).
+            board (dict): The board with its `lists` and open `cards` nested.
+            last_action_id (str): The newest action before the snapshot was
+                taken; the next sync replays actions after it.
+        """
+        lists = board.get("lists") or []
+        cards = board.get("cards") or []
+        details = {key: value for key, value in board.items() if key not in ("lists", "cards")}
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM lists WHERE board_id = ?", (board_id,))
+            conn.execute("DELETE FROM cards WHERE board_id = ?", (board_id,))
+            conn.executemany(
+                "INSERT OR REPLACE INTO lists (list_id, board_id, closed, data) VALUES (?, ?, ?, ?)",
+                [(lst["id"], board_id, int(bool(lst.get("closed"))), json.dumps(lst)) for lst in lists],
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO cards (card_id, board_id, list_id, pos, data) VALUES (?, ?, ?, ?, ?)",
+                [(card["id"], board_id, card.get("idList"), card.get("pos"), json.dumps(card))
+                 for card in cards if not card.get("closed")],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO boards (board_id, data, last_action_id, synced_at) VALUES (?, ?, ?, ?)",
+                (board_id, json.dumps(details), last_action_id, time.time()),
+            )
+
+    def apply_actions(self, board_id: str, actions: List[Dict[str, Any]]) -> int:
+        """
+        Replays board actions, oldest first, onto the mirror and advances the
+        sync cursor past them. Replaying an action twice is harmless.
+
+        Args:
+            board_id (str): The mirrored board.
+            actions (list): Trello actions in any order.
+
+        Returns:
+            int: The number of actions applied.
+        """
+        ordered = sorted(actions, key=lambda action: (action.get("date") or "", action["id"]))
+        with self._lock, self._connect() as conn:
+            for action in ordered:
+                self._apply(conn, board_id, action)
+            if ordered:
+                conn.execute(
+                    "UPDATE boards SET last_action_id = ?, synced_at = ? WHERE board_id = ?",
+                    (ordered[-1]["id"], time.time(), board_id),
+                )
+            else:
+                conn.execute("UPDATE boards SET synced_at = ? WHERE board_id = ?", (time.time(), board_id))
+        return len(ordered)
+
+    def _apply(self, conn: sqlite3.Connection, board_id: str, action: Dict[str, Any]):
+        action_type = action.get("type")
+        data = action.get("data") or {}
+        date = action.get("date")
+
+        if action_type == "updateBoard" and data.get("board"):
+            row = conn.execute("SELECT data FROM boards WHERE board_id = ?", (board_id,)).fetchone()
+            if row:
+                board = json.loads(row[0])
+                board.update({key: value for key, value in data["board"].items() if key != "id"})
+                conn.execute("UPDATE boards SET data = ? WHERE board_id = ?", (json.dumps(board), board_id))
+            return
+
+        if "list" in data and "card" not in data and action_type in (*LIST_CREATE_ACTIONS, "updateList"):
+            source = data["list"]
+            row = conn.execute("SELECT data FROM lists WHERE list_id = ?", (source["id"],)).fetchone()
+            lst = json.loads(row[0]) if row else {"id": source["id"], "idBoard": board_id, "closed": False}
+            lst.update({key: source[key] for key in ("name", "closed", "pos") if key in source})
+            conn.execute(
+                "INSERT OR REPLACE INTO lists (list_id, board_id, closed, data) VALUES (?, ?, ?, ?)",
+                (lst["id"], board_id, int(bool(lst.get("closed"))), json.dumps(lst)),
+            )
+            return
+        if action_type == "moveListFromBoard" and data.get("list"):
+            conn.execute("DELETE FROM lists WHERE list_id = ?", (data["list"]["id"],))
+            return
+
+        source = data.get("card") or {}
+        card_id = source.get("id")
+        if not card_id:
+            return
+        if action_type in CARD_REMOVE_ACTIONS:
+            conn.execute("DELETE FROM cards WHERE card_id = ?", (card_id,))
+            return
+
+        row = conn.execute("SELECT data FROM cards WHERE card_id = ?", (card_id,)).fetchone()
+        if row is None and action_type not in CARD_CREATE_ACTIONS and action_type != "updateCard":
+            # Activity on a card the mirror does not hold (e.g. archived)
+            return
+        card = json.loads(row[0]) if row else {"id": card_id, "closed": False}
+        card.update({key: source[key] for key in CARD_FIELDS if key in source})
+        if data.get("listAfter"):
+            card["idList"] = data["listAfter"]["id"]
+        elif data.get("list") and (action_type in CARD_CREATE_ACTIONS or action_type == "updateCard"):
+            # An unarchived card is not in the mirror yet and only its action says where it is
+            card["idList"] = data["list"]["id"]
+        # Every card action (comments, attachments, edits) bumps Trello's dateLastActivity
+        if date:
+            card["dateLastActivity"] = date
+
+        if card.get("closed") or "idList" not in card:
+            conn.execute("DELETE FROM cards WHERE card_id = ?", (card_id,))
+            return
+        conn.execute(
+            "INSERT OR REPLACE INTO cards (card_id, board_id, list_id, pos, data) VALUES (?, ?, ?, ?, ?)",
+            (card_id, board_id, card["idList"], card.get("pos"), json.dumps(card)),
+        )
+
+    def get_board(self, board_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the board details with its open lists under `lists`, or None.
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT data FROM boards WHERE board_id = ?", (board_id,)).fetchone()
+        if row is None:
+            return None
+        return {**json.loads(row[0]), "lists": self.get_lists(board_id)}
+
+    def get_lists(self, board_id: str, include_closed: bool = False) -> List[Dict[str, Any]]:
+        query = "SELECT data FROM lists WHERE board_id = ?"
+        if not include_closed:
+            query += " AND closed = 0"
+        with self._connect() as conn:
+            rows = conn.execute(query + " ORDER BY rowid", (board_id,)).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def get_list(self, list_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT data FROM lists WHERE list_id = ?", (list_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_card(self, card_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT data FROM cards WHERE card_id = ?", (card_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def cards_in_list(self, list_id: str) -> List[Dict[str, Any]]:
+        """
+        Returns the open cards of a list in board order. Cards added since the
+        snapshot have no position and come last, oldest first.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT data FROM cards WHERE list_id = ? ORDER BY pos IS NULL, pos, card_id",
+                (list_id,),
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def clear(self):
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM boards")
+            conn.execute("DELETE FROM lists")
+            conn.execute("DELETE FROM cards")
@@ -0,0 +1,133 @@
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from pro_tools.models.article import Section
+from pro_tools.models.research import Topic
+from pro_tools.utils.sqlite_store import SQLiteStore
+
+DEFAULT_LEDGER_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "pro_tools", "card_ledger.sqlite3"
+)
+STAGES = ("research", "article", "commented", "published")
+
+
+class ResumePlan:
+    """
+    How each card of a run should be handled given what earlier runs completed.
+
+    Attributes:
+        fresh (list): Cards with no usable progress; they start from research.
+        from_article (list): Cards whose research is done; each card carries
+            its stored Topic under `topic` and starts from article_task.
+        to_publish (list): Sections already written but not yet published.
+        to_move (list): Cards whose article was posted as a comment but that
+            were not moved; only the move is retried.
+        done (list): Cards already published and unchanged since.
+    """
+
+    def __init__(self):
+        self.fresh: List[Dict[str, Any]] = []
+        self.from_article: List[Dict[str, Any]] = []
+        self.to_publish: List[Section] = []
+        self.to_move: List[Dict[str, Any]] = []
+        self.done: List[Dict[str, Any]] = []
+
+
+class CardLedger(SQLiteStore):
+    """
+    Local SQLite record of the last stage each card completed.
+
+    Each card ID maps to its latest completed stage (research, article,
+    commented or published), the stage's output and the card's
+    `dateLastActivity` at the time. A card whose `dateLastActivity` has
+    changed since is treated as new, except a commented one: our own comment
+    changed it, and the card only still needs its move.
+    The path defaults to CARD_LEDGER_PATH.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS card_ledger (
+            card_id TEXT PRIMARY KEY,
+            stage TEXT NOT NULL,
+            date_last_activity TEXT,
+            payload TEXT,
+            updated_at REAL NOT NULL
+        );
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        super().__init__(path or os.getenv("CARD_LEDGER_PATH") or DEFAULT_LEDGER_PATH)
+
+    def record(
+        self,
+        card_id: str,
+        stage: str,
+        date_last_activity: Optional[str] = None,
+        payload: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Records that `card_id` completed `stage`, replacing any earlier entry.
+        """
+        if stage not in STAGES:
+            raise ValueError(f"Unknown stage: {stage}")
+        with self._lock, self._connect() as conn:
+            if date_last_activity is None:
+                row = conn.execute(
+                    "SELECT date_last_activity FROM card_ledger WHERE card_id = ?", (card_id,)
+                ).fetchone()
+                date_last_activity = row[0] if row else None
+            conn.execute(
+                "INSERT OR REPLACE INTO card_ledger "
+                "(card_id, stage, date_last_activity, payload, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (
+                    card_id,
+                    stage,
+                    date_last_activity,
+                    json.dumps(payload) if payload is not None else None,
+                    time.time(),
+                ),
+            )
+
+    def get(self, card_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the ledger entry for a card, or None if it was never recorded.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT stage, date_last_activity, payload FROM card_ledger WHERE card_id = ?",
+                (card_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "card_id": card_id,
+            "stage": row[0],
+            "date_last_activity": row[1],
+            "payload": json.loads(row[2]) if row[2] else None,
+        }
+
+    def plan(self, cards: List[Dict[str, Any]]) -> ResumePlan:
+        """
+        Sorts cards by where they should resume. Cards are dictionaries with
+        `id`, `name` and, ideally, `dateLastActivity`.
+        """
+        plan = ResumePlan()
+        for card in cards:
+            entry = self.get(card["id"])
+            if entry is not None and entry["stage"] == "commented":
+                plan.to_move.append(card)
+                continue
+            unchanged = entry is not None and entry["date_last_activity"] == card.get("dateLastActivity")
+            if not unchanged:
+                plan.fresh.append(card)
+            elif entry["stage"] == "published":
+                plan.done.append(card)
+            elif entry["stage"] == "article" and entry["payload"]:
+                plan.to_publish.append(Section(**entry["payload"]))
+            elif entry["stage"] == "research" and entry["payload"]:
+                plan.from_article.append({**card, "topic": Topic(**entry["payload"])})
+            else:
+                plan.fresh.append(card)
+        return plan
@@ -0,0 +1,294 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pro_tools.utils.metrics import get_metrics
+from pro_tools.utils.sqlite_store import SQLiteStore
+
+DEFAULT_QUEUE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "pro_tools", "card_queue.sqlite3"
+)
+DEFAULT_LEASE_SECONDS = 1800
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BATCH_SIZE = 10
+STATUSES = ("queued", "leased", "done", "failed")
+
+
+def new_worker_id() -> str:
+    """
+    Returns an ID naming this process in the queue, e.g. `host-1234-9f2c1a`.
+    """
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+class CardQueue(SQLiteStore):
+    """
+    Durable SQLite work queue that lets any number of worker processes share
+    a TODO list without processing a card twice.
+
+    Cards are enqueued once, keyed by card ID. A worker claims a batch under
+    a lease: the cards are marked with a lease token and an expiry, and no
+    other worker can claim them until the worker acknowledges them (done),
+    releases them (back to the queue, or failed after `max_attempts`) or the
+    lease expires, e.g. because the worker crashed. Expired leases are
+    handed out again on the next claim. Claims are a single UPDATE, so two
+    workers racing for the same cards never both get them.
+
+    Workers on other hosts share the queue through a shared path; SQLite
+    needs a filesystem with working locks for that.
+
+    Args:
+        path (str): Database path (CARD_QUEUE_PATH, default
+            ~/.cache/pro_tools/card_queue.sqlite3).
+        lease_seconds (float): How long a claim holds its cards without
+            being renewed (CARD_QUEUE_LEASE_SECONDS, default 1800).
+        max_attempts (int): Claims a card gets before it is marked failed
+            (CARD_QUEUE_MAX_ATTEMPTS, default 3).
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS cards (
+            card_id TEXT PRIMARY KEY,
+            data TEXT NOT NULL,
+            date_last_activity TEXT,
+            status TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            lease_token TEXT,
+            worker TEXT,
+            lease_expires REAL,
+            error TEXT,
+            enqueued_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS cards_by_status ON cards (status, enqueued_at);
+        CREATE INDEX IF NOT EXISTS cards_by_lease ON cards (lease_token);
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        lease_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+    ):
+        super().__init__(path or os.getenv("CARD_QUEUE_PATH") or DEFAULT_QUEUE_PATH)
+        if lease_seconds is None:
+            lease_seconds = float(os.getenv("CARD_QUEUE_LEASE_SECONDS") or DEFAULT_LEASE_SECONDS)
+        if max_attempts is None:
+            max_attempts = int(os.getenv("CARD_QUEUE_MAX_ATTEMPTS") or DEFAULT_MAX_ATTEMPTS)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+    def enqueue(self, cards: Iterable[Dict[str, Any]]) -> int:
+        """
+        Adds cards to the queue. Cards already queued or leased are left
+        alone; finished cards are queued again only if their
+        `dateLastActivity` changed, e.g. because they were moved back to the
+        TODO list.
+
+        Returns:
+            int: The number of cards newly queued.
+        """
+        now = time.time()
+        rows = [
+            (card["id"], json.dumps(card), card.get("dateLastActivity"), now, now)
+            for card in cards
+        ]
+        with self._lock, self._connect() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                """
+                INSERT INTO cards (card_id, data, date_last_activity, status, enqueued_at, updated_at)
+                VALUES (?, ?, ?, 'queued', ?, ?)
+                ON CONFLICT (card_id) DO UPDATE SET
+                    data = excluded.data,
+                    date_last_activity = excluded.date_last_activity,
+                    status = 'queued',
+                    attempts = 0,
+                    error = NULL,
+                    enqueued_at = excluded.enqueued_at,
+                    updated_at = excluded.updated_at
+                WHERE cards.status IN ('done', 'failed')
+                    AND cards.date_last_activity IS NOT excluded.date_last_activity
+                """,
+                rows,
+            )
+            queued = conn.total_changes - before
+        if queued:
+            get_metrics().increment("card_queue_cards", queued, action="enqueued")
+        return queued
+
+    def claim(self, worker_id: str, limit: Optional[int] = None) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+        """
+        Leases up to `limit` cards to a worker, oldest first, including cards
+        whose earlier lease expired.
+
+        Args:
+            worker_id (str): Who holds the lease, for `stats` and debugging.
+            limit (int): Cards to claim (CARD_QUEUE_BATCH_SIZE, default 10).
+
+        Returns:
+            tuple: The lease token, or None if nothing was claimed, and the
+                claimed cards as they were enqueued.
+        """
+        if limit is None:
+            limit = int(os.getenv("CARD_QUEUE_BATCH_SIZE") or DEFAULT_BATCH_SIZE)
+        token = uuid.uuid4().hex
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            # Cards whose last allowed attempt ran out of time are not retried
+            conn.execute(
+                "UPDATE cards SET status = 'failed', error = 'Lease expired on the last attempt', "
+                "lease_token = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, now, self.max_attempts),
+            )
+            conn.execute(
+                """
+                UPDATE cards SET status = 'leased', lease_token = ?, worker = ?, lease_expires = ?,
+                    attempts = attempts + 1, updated_at = ?
+                WHERE card_id IN (
+                    SELECT card_id FROM cards
+                    WHERE status = 'queued' OR (status = 'leased' AND lease_expires < ?)
+                    ORDER BY enqueued_at, card_id
+                    LIMIT ?
+                )
+                """,
+                (token, worker_id, now + self.lease_seconds, now, now, limit),
+            )
+            rows = conn.execute(
+                "SELECT data, attempts FROM cards WHERE lease_token = ? ORDER BY enqueued_at, card_id",
+                (token,),
+            ).fetchall()
+        if not rows:
+            return None, []
+        metrics = get_metrics()
+        metrics.increment("card_queue_cards", len(rows), action="claimed")
+        redelivered = sum(1 for _, attempts in rows if attempts > 1)
+        if redelivered:
+            metrics.increment("card_queue_cards", redelivered, action="redelivered")
+        return token, [json.loads(data) for data, _ in rows]
+
+    def renew(self, token: str) -> int:
+        """
+        Extends a lease by another `lease_seconds`.
+
+        Returns:
+            int: The number of cards still held under the lease.
+        """
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE cards SET lease_expires = ?, updated_at = ? WHERE lease_token = ? AND status = 'leased'",
+                (now + self.lease_seconds, now, token),
+            )
+            return cursor.rowcount
+
+    def ack(self, token: str, card_ids: Iterable[str]) -> List[str]:
+        """
+        Marks leased cards as done. A card whose lease was lost, because it
+        expired and another worker claimed the card, is not acknowledged.
+
+        Returns:
+            list: The IDs that were acknowledged.
+        """
+        return self._finish(token, card_ids, "'done'", None, "acked")
+
+    def release(self, token: str, card_ids: Iterable[str], error: Optional[str] = None) -> List[str]:
+        """
+        Gives leased cards back to the queue for another attempt, or marks
+        them failed once they have used `max_attempts`.
+
+        Returns:
+            list: The IDs that were released.
+        """
+        status = f"CASE WHEN attempts >= {int(self.max_attempts)} THEN 'failed' ELSE 'queued' END"
+        return self._finish(token, card_ids, status, error, "released")
+
+    def _finish(
+        self,
+        token: str,
+        card_ids: Iterable[str],
+        status: str,
+        error: Optional[str],
+        action: str,
+    ) -> List[str]:
+        now = time.time()
+        finished = []
+        with self._lock, self._connect() as conn:
+            for card_id in card_ids:
+                cursor = conn.execute(
+                    f"UPDATE cards SET status = {status}, error = ?, lease_token = NULL, "
+                    "lease_expires = NULL, updated_at = ? "
+                    "WHERE card_id = ? AND lease_token = ? AND status = 'leased'",
+                    (error, now, card_id, token),
+                )
+                if cursor.rowcount:
+                    finished.append(card_id)
+        if finished:
+            get_metrics().increment("card_queue_cards", len(finished), action=action)
+        return finished
+
+    @contextmanager
+    def hold(self, token: Optional[str]) -> Iterator[None]:
+        """
+        Renews a lease in the background while the block runs, so a crew
+        run longer than `lease_seconds` keeps its cards. If the process
+        dies, renewals stop and the lease expires.
+        """
+        if token is None:
+            yield
+            return
+        keeper = LeaseKeeper(self, token)
+        keeper.start()
+        try:
+            yield
+        finally:
+            keeper.stop()
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the number of cards in each status."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM cards GROUP BY status").fetchall()
+        counts = {status: 0 for status in STATUSES}
+        counts.update(dict(rows))
+        return counts
+
+    def clear(self):
+        """Removes every card from the queue."""
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM cards")
+
+
+class LeaseKeeper:
+    """
+    Background thread renewing a lease every third of its duration until
+    stopped. See CardQueue.hold.
+    """
+
+    def __init__(self, queue: CardQueue, token: str):
+        self.queue = queue
+        self.token = token
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="card-lease", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        interval = max(1.0, self.queue.lease_seconds / 3)
+        while not self._stop.wait(interval):
+            try:
+                if not self.queue.renew(self.token):
+                    return
+            except sqlite3.Error as e:
+                print(f"Failed to renew card lease: {str(e)}")
@@ -0,0 +1,242 @@
+import functools
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+CASSETTE_VERSION = 1
+DEFAULT_CASSETTE_PATH = "cassette.json"
+MODES = ("record", "replay")
+
+
+class CassetteMiss(LookupError):
+    """Raised in replay mode when no recording matches a call."""
+
+
+def _fingerprint(kind: str, name: str, payload: Any) -> str:
+    data = json.dumps([kind, name, payload], sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """
+    Records LLM completions, tool calls and Trello I/O during a real run and
+    serves them back in a later run, without network access or tokens.
+
+    Interactions are matched by a hash of what was asked (the LLM messages,
+    or the tool name and arguments). Identical calls are served in the order
+    they were recorded. A call with no exact match falls back to the next
+    unused recording of the same kind and name, with a warning, so small
+    prompt changes between releases still replay.
+
+    Replay can add latency per interaction: a fixed `latency` in seconds,
+    plus `latency_scale` times the duration measured while recording.
+
+    Args:
+        path (str): The cassette file, defaulting to CASSETTE_PATH.
+        mode (str): "record" or "replay".
+        latency (float): Seconds added to each replayed interaction
+            (CASSETTE_LATENCY, default 0).
+        latency_scale (float): Multiplier on recorded durations
+            (CASSETTE_LATENCY_SCALE, default 0).
+
+    Usage:
+        with Cassette("run.json", mode="record"):
+            ProTools().crew().kickoff()
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        mode: str = "replay",
+        latency: Optional[float] = None,
+        latency_scale: Optional[float] = None,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unsupported cassette mode: {mode}")
+        self.path = path or os.getenv("CASSETTE_PATH") or DEFAULT_CASSETTE_PATH
+        self.mode = mode
+        if latency is None:
+            latency = float(os.getenv("CASSETTE_LATENCY") or 0)
+        if latency_scale is None:
+            latency_scale = float(os.getenv("CASSETTE_LATENCY_SCALE") or 0)
+        self.latency = latency
+        self.latency_scale = latency_scale
+        self.interactions: List[Dict[str, Any]] = []
+        self._used: set = set()
+        self._lock = threading.Lock()
+        self._patches: List[Tuple[Any, str, Any, bool]] = []
+
+        if mode == "replay":
+            with open(self.path) as f:
+                data = json.load(f)
+            if data.get("version") != CASSETTE_VERSION:
+                raise ValueError(f"Unsupported cassette version in {self.path}: {data.get('version')}")
+            self.interactions = data["interactions"]
+
+    @property
+    def replayed_count(self) -> int:
+        """
+        Number of recorded interactions replayed so far.
+        """
+        return len(self._used)
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            data = {"version": CASSETTE_VERSION, "interactions": self.interactions}
+        with open(self.path, "w") as f:
+            json.dump(data, f, indent=2)
+
+    def _record(self, kind: str, name: str, request: Any, response: Any, duration: float):
+        # Keep the request as stored in the file, so replays hash the same value
+        request = json.loads(json.dumps(request, default=str))
+        with self._lock:
+            self.interactions.append({
+                "kind": kind,
+                "name": name,
+                "key": _fingerprint(kind, name, request),
+                "request": request,
+                "response": response,
+                "duration": duration,
+            })
+
+    def _replay(self, kind: str, name: str, request: Any) -> Any:
+        key = _fingerprint(kind, name, request)
+        with self._lock:
+            match = next(
+                (i for i, item in enumerate(self.interactions) if i not in self._used and item["key"] == key),
+                None,
+            )
+            if match is None:
+                match = next(
+                    (i for i, item in enumerate(self.interactions)
+                     if i not in self._used and item["kind"] == kind and item["name"] == name),
+                    None,
+                )
+                if match is None:
+                    raise CassetteMiss(f"No recorded {kind} interaction left for {name}")
+                print(f"Cassette: no exact match for {kind} {name}, replaying the next recording")
+            self._used.add(match)
+            interaction = self.interactions[match]
+
+        delay = self.latency + self.latency_scale * interaction.get("duration", 0)
+        if delay > 0:
+            time.sleep(delay)
+        return interaction["response"]
+
+    def wrap(
+        self,
+        owner: Any,
+        attribute: str,
+        kind: str,
+        name: str,
+        request: Callable[..., Any],
+        encode: Callable[[Any], Any] = lambda value: value,
+        decode: Callable[[Any], Any] = lambda value: value,
+    ):
+        """
+        Replaces `owner.attribute` with a version that records or replays it
+        until `restore()`.
+
+        Args:
+            owner: The class or module holding the callable.
+            attribute (str): The callable's attribute name.
+            kind (str): Interaction kind, e.g. "llm", "tool" or "trello".
+            name (str): Interaction name within the kind.
+            request (callable): Maps the call's arguments to the JSON-able
+                value that identifies it.
+            encode (callable): Maps a result to JSON for recording.
+            decode (callable): Maps a recorded result back for replay.
+        """
+        original = getattr(owner, attribute)
+        cassette = self
+
+        @functools.wraps(original)
+        def wrapper(*args, **kwargs):
+            key = request(*args, **kwargs)
+            if cassette.mode == "replay":
+                return decode(cassette._replay(kind, name, key))
+            start = time.perf_counter()
+            result = original(*args, **kwargs)
+            if inspect.isgenerator(result):
+                # Generators are recorded, and returned, as the list they yield
+                result = list(result)
+            cassette._record(kind, name, key, encode(result), time.perf_counter() - start)
+            return result
+
+        # Inherited attributes are deleted again on restore rather than copied down
+        own = attribute in vars(owner)
+        self._patches.append((owner, attribute, original, own))
+        setattr(owner, attribute, wrapper)
+
+    def restore(self):
+        while self._patches:
+            owner, attribute, original, own = self._patches.pop()
+            if own:
+                setattr(owner, attribute, original)
+            else:
+                delattr(owner, attribute)
+
+    def install(self):
+        """
+        Wraps the LLM, every crew tool and the Trello reads and writes made
+        outside tools (card loading, in full or streamed, and direct-write
+        publishing).
+        """
+        from crewai.llm import LLM
+
+        import pro_tools.crew as crew_module
+        from pro_tools.models.publish_result import PublishReport
+        from pro_tools.tools.RedditBatchSearchTool import RedditSerpApiBatchSearchTool
+        from pro_tools.tools.RedditSearchTool import RedditSerpApiSearchTool
+        from pro_tools.tools.TrelloAddCardCommentTool import TrelloAddCardCommentTool
+        from pro_tools.tools.TrelloUpdateCardTool import TrelloUpdateCardTool
+
+        def llm_request(llm, messages, *args, **kwargs):
+            return {"model": llm.model, "messages": messages, "tools": kwargs.get("tools")}
+
+        self.wrap(LLM, "call", "llm", "completion", llm_request, encode=str)
+
+        for tool_class in (
+            RedditSerpApiSearchTool,
+            RedditSerpApiBatchSearchTool,
+            TrelloAddCardCommentTool,
+            TrelloUpdateCardTool,
+        ):
+            self.wrap(tool_class, "_run", "tool", tool_class.__name__,
+                      lambda tool, *args, **kwargs: {"args": args, "kwargs": kwargs})
+
+        self.wrap(crew_module.ProTools, "load_trello_cards", "trello", "load_trello_cards",
+                  lambda pro_tools: {})
+        self.wrap(crew_module.ProTools, "iter_trello_cards", "trello", "iter_trello_cards",
+                  lambda pro_tools, page_size=None: {"page_size": page_size})
+        self.wrap(crew_module, "publish_article", "trello", "publish_article",
+                  lambda article, list_id=None: {"article": article.model_dump(), "list_id": list_id},
+                  encode=lambda report: report.model_dump(),
+                  decode=lambda data: PublishReport(**data))
+        self.wrap(crew_module, "publish_sections", "trello", "publish_sections",
+                  lambda sections, list_id=None, session=None: {
+                      "sections": [section.model_dump() for section in sections],
+                      "list_id": list_id,
+                  },
+                  encode=lambda report: report.model_dump(),
+                  decode=lambda data: PublishReport(**data))
+        self.wrap(crew_module, "move_cards", "trello", "move_cards",
+                  lambda cards, list_id=None: {"cards": cards, "list_id": list_id},
+                  encode=lambda report: report.model_dump(),
+                  decode=lambda data: PublishReport(**data))
+
+    def __enter__(self) -> "Cassette":
+        self.install()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.restore()
+        if self.mode == "record":
+            self.save()
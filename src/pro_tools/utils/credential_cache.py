@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "pro_tools", "trello_credentials.json"
+)
+DEFAULT_TTL = 3600
+AUTH_FAILURE_STATUS_CODES = (401, 403)
+
+_file_lock = threading.Lock()
+
+
+def credential_key(api_key: str, token: str) -> str:
+    """
+    Returns a stable hash of the credentials so neither is stored in plain text.
+    """
+    return hashlib.sha256(f"{api_key}:{token}".encode("utf-8")).hexdigest()
+
+
+class CredentialCache:
+    """
+    On-disk cache of successful Trello credential verifications.
+
+    Entries are keyed by a hash of the API key and token and expire after
+    `ttl` seconds. The path and TTL default to TRELLO_CREDENTIAL_CACHE_PATH
+    and TRELLO_CREDENTIAL_CACHE_TTL; a TTL of 0 disables the cache.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None):
+        self.path = path or os.getenv("TRELLO_CREDENTIAL_CACHE_PATH") or DEFAULT_CACHE_PATH
+        if ttl is None:
+            ttl = float(os.getenv("TRELLO_CREDENTIAL_CACHE_TTL") or DEFAULT_TTL)
+        self.ttl = ttl
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, entries: Dict[str, Any]):
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".credentials-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(entries, file)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def get(self, api_key: str, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached verification for these credentials, or None if it
+        is missing or older than the TTL.
+        """
+        if not self.enabled:
+            return None
+        entry = self._load().get(credential_key(api_key, token))
+        if not entry or time.time() - entry.get("verified_at", 0) > self.ttl:
+            return None
+        return entry
+
+    def set(self, api_key: str, token: str, details: Dict[str, Any]):
+        """
+        Records a successful verification for these credentials.
+        """
+        if not self.enabled:
+            return
+        with _file_lock:
+            entries = self._load()
+            entries[credential_key(api_key, token)] = {**details, "verified_at": time.time()}
+            try:
+                self._save(entries)
+            except OSError as e:
+                print(f"Warning: Unable to write credential cache {self.path}: {e}")
+
+    def invalidate(self, api_key: str, token: str):
+        """
+        Drops the cached verification for these credentials, if any.
+        """
+        with _file_lock:
+            entries = self._load()
+            if entries.pop(credential_key(api_key, token), None) is None:
+                return
+            try:
+                self._save(entries)
+            except OSError as e:
+                print(f"Warning: Unable to write credential cache {self.path}: {e}")
+
+
+def invalidate_on_auth_failure(response, *args, **kwargs):
+    """
+    requests response hook that drops the cached verification of the
+    credentials used by any Trello call rejected with 401 or 403.
+    """
+    if response.status_code not in AUTH_FAILURE_STATUS_CODES:
+        return response
+
+    # http_client installs this hook, so it can only be imported here
+    from pro_tools.utils.http_client import is_trello_url
+
+    if not is_trello_url(response.request.url):
+        return response
+
+    query = parse_qs(urlparse(response.request.url).query)
+    api_key = query.get("key", [None])[0]
+    token = query.get("token", [None])[0]
+    if api_key and token:
+        CredentialCache().invalidate(api_key, token)
+    return response
@@ -0,0 +1,79 @@
+import threading
+import time
+from typing import Any, Dict, List
+
+from crewai.events import (
+    CrewKickoffCompletedEvent,
+    CrewKickoffFailedEvent,
+    CrewKickoffStartedEvent,
+    LLMCallCompletedEvent,
+    LLMCallFailedEvent,
+    LLMCallStartedEvent,
+    TaskCompletedEvent,
+    TaskFailedEvent,
+    crewai_event_bus,
+)
+
+from pro_tools.utils.metrics import get_metrics
+
+_installed = False
+_install_lock = threading.Lock()
+_llm_starts = threading.local()
+_kickoff_starts: Dict[int, float] = {}
+
+
+def _llm_stack() -> List[float]:
+    if not hasattr(_llm_starts, "stack"):
+        _llm_starts.stack = []
+    return _llm_starts.stack
+
+
+def _on_llm_started(source: Any, event: LLMCallStartedEvent):
+    _llm_stack().append(time.perf_counter())
+
+
+def _on_llm_finished(source: Any, event: Any):
+    stack = _llm_stack()
+    if stack:
+        model = getattr(event, "model", None) or "unknown"
+        get_metrics().observe("llm", model, time.perf_counter() - stack.pop())
+
+
+def _on_task_finished(source: Any, event: Any):
+    task = event.task
+    duration = getattr(task, "execution_duration", None)
+    if duration is not None:
+        get_metrics().observe("task", task.name or "unnamed", duration)
+
+
+def _on_kickoff_started(source: Any, event: CrewKickoffStartedEvent):
+    _kickoff_starts[id(source)] = time.perf_counter()
+
+
+def _on_kickoff_finished(source: Any, event: Any):
+    metrics = get_metrics()
+    start = _kickoff_starts.pop(id(source), None)
+    if start is not None:
+        metrics.observe("kickoff", event.crew_name or "crew", time.perf_counter() - start)
+    if getattr(event, "total_tokens", None):
+        metrics.increment("llm_tokens", event.total_tokens)
+
+
+def install_crew_listeners():
+    """
+    Records LLM calls, tasks and crew kickoffs as metrics spans by listening
+    on the crewai event bus. Safe to call more than once.
+    """
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        crewai_event_bus.register_handler(LLMCallStartedEvent, _on_llm_started)
+        crewai_event_bus.register_handler(LLMCallCompletedEvent, _on_llm_finished)
+        crewai_event_bus.register_handler(LLMCallFailedEvent, _on_llm_finished)
+        crewai_event_bus.register_handler(TaskCompletedEvent, _on_task_finished)
+        crewai_event_bus.register_handler(TaskFailedEvent, _on_task_finished)
+        crewai_event_bus.register_handler(CrewKickoffStartedEvent, _on_kickoff_started)
+        crewai_event_bus.register_handler(CrewKickoffCompletedEvent, _on_kickoff_finished)
+        crewai_event_bus.register_handler(CrewKickoffFailedEvent, _on_kickoff_finished)
+        _installed = True
@@ -0,0 +1,180 @@
+import contextvars
+import functools
+import inspect
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional, Tuple
+
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_REQUEST_TIMEOUT = 30.0
+DEFAULT_LLM_TIMEOUT = 300.0
+# Share of the time still left that each stage may use when it starts;
+# whatever a stage does not use is left for the stages after it
+STAGE_SHARES = {
+    "load": 0.1,
+    "research": 0.5,
+    "article": 0.7,
+    "publish": 1.0,
+}
+
+# Absolute time.monotonic() by which the current run must finish
+_expires_at: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "pro_tools_deadline", default=None
+)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when work would start after the run's deadline has passed."""
+
+
+def _env_float(name: str, default: Optional[float]) -> Optional[float]:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def run_budget() -> Optional[float]:
+    """
+    Seconds a whole run may take (RUN_DEADLINE_SECONDS), or None for no
+    deadline.
+    """
+    return _env_float("RUN_DEADLINE_SECONDS", None)
+
+
+def remaining() -> Optional[float]:
+    """
+    Seconds left before the current deadline, or None when there is none.
+    """
+    expires_at = _expires_at.get()
+    if expires_at is None:
+        return None
+    return expires_at - time.monotonic()
+
+
+def check(what: str = "continuing"):
+    """
+    Raises DeadlineExceeded if the current deadline has passed.
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded(f"Run deadline exceeded {-left:.1f}s ago, stopped before {what}")
+
+
+def set_deadline(seconds: Optional[float]) -> contextvars.Token:
+    """
+    Narrows the current deadline to `seconds` from now; a deadline is never
+    extended. Undo it by passing the returned token to `reset`.
+    """
+    current = _expires_at.get()
+    if seconds is not None:
+        expires_at = time.monotonic() + seconds
+        current = expires_at if current is None else min(current, expires_at)
+    return _expires_at.set(current)
+
+
+def reset(token: contextvars.Token):
+    _expires_at.reset(token)
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Runs the block under a deadline `seconds` from now, or under the outer
+    deadline if that is sooner. `None` keeps the outer deadline as it is.
+    """
+    token = set_deadline(seconds)
+    try:
+        yield
+    finally:
+        reset(token)
+
+
+def stage_budget(stage: str) -> Optional[float]:
+    """
+    Seconds the stage may take: its share (STAGE_SHARES) of the time left,
+    or None when there is no deadline.
+    """
+    left = remaining()
+    if left is None:
+        return None
+    return max(0.0, left) * STAGE_SHARES.get(stage, 1.0)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Runs the block under its stage's budget of the current deadline.
+    """
+    check(f"the {name} stage")
+    with deadline(stage_budget(name)):
+        yield
+
+
+def request_timeout(default: Optional[float] = None) -> Tuple[float, float]:
+    """
+    Returns the `(connect, read)` timeout for one HTTP request: the
+    per-request timeout (HTTP_REQUEST_TIMEOUT, default 30s) cut down to
+    the time left before the deadline.
+
+    Raises:
+        DeadlineExceeded: If the deadline has already passed.
+    """
+    check("sending a request")
+    timeout = default if default is not None else _env_float("HTTP_REQUEST_TIMEOUT", DEFAULT_REQUEST_TIMEOUT)
+    left = remaining()
+    if left is not None:
+        timeout = min(timeout, left)
+    connect = min(_env_float("HTTP_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT), timeout)
+    return connect, timeout
+
+
+def llm_timeout() -> float:
+    """
+    Timeout of one LLM call (LLM_REQUEST_TIMEOUT, default 300s), cut down
+    to the time left before the deadline.
+    """
+    timeout = _env_float("LLM_REQUEST_TIMEOUT", DEFAULT_LLM_TIMEOUT)
+    left = remaining()
+    if left is not None:
+        timeout = max(1.0, min(timeout, left))
+    return timeout
+
+
+def bind(func: Callable) -> Callable:
+    """
+    Returns `func` bound to the caller's deadline, for running on another
+    thread (threads do not inherit context variables).
+    """
+    context = contextvars.copy_context()
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any):
+        # A context can only be entered by one thread at a time
+        return context.copy().run(func, *args, **kwargs)
+    return wrapper
+
+
+def bounded(func: Callable) -> Callable:
+    """
+    Decorator for tool `_run`/`_arun` methods: once the deadline has
+    passed, the tool returns an error to the agent instead of starting
+    more work.
+    """
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any):
+            try:
+                check("a tool call")
+            except DeadlineExceeded as e:
+                return f"Error: {str(e)}"
+            return await func(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any):
+        try:
+            check("a tool call")
+        except DeadlineExceeded as e:
+            return f"Error: {str(e)}"
+        return func(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,302 @@
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from pro_tools.utils import deadline
+from pro_tools.utils.board_mirror import expire_mirror_on_write
+from pro_tools.utils.credential_cache import invalidate_on_auth_failure
+from pro_tools.utils.metrics import get_metrics
+from pro_tools.utils.rate_limiter import backoff_delay, get_trello_rate_limiter, max_throttle_retries
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 20
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_HEDGE_DELAY = 2.0
+# Requests to a host before its own p95 latency replaces DEFAULT_HEDGE_DELAY
+HEDGE_MIN_SAMPLES = 20
+HEDGE_QUANTILE = 0.95
+
+# 429 is handled in request() so throttling goes through the shared rate limiter.
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+TRELLO_HOST = "api.trello.com"
+DEFAULT_TRELLO_API_URL = f"https://{TRELLO_HOST}/1"
+DEFAULT_SERPAPI_URL = "https://serpapi.com/search"
+# POST is deliberately excluded: retrying a comment could post it twice.
+RETRY_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+class DeadlineRetry(Retry):
+    """
+    urllib3 retry policy that gives up once the run's deadline has passed,
+    instead of sending the request again with a fresh timeout.
+    """
+
+    def increment(self, *args, **kwargs) -> Retry:
+        left = deadline.remaining()
+        if left is not None and left <= 0:
+            # Treat the retries as used up, so urllib3 raises the failure now
+            return Retry.increment(self.new(total=0), *args, **kwargs)
+        return super().increment(*args, **kwargs)
+
+
+def build_session(
+    pool_connections: Optional[int] = None,
+    pool_maxsize: Optional[int] = None,
+    max_retries: Optional[int] = None,
+    backoff_factor: Optional[float] = None,
+) -> requests.Session:
+    """
+    Builds a requests session with keep-alive connection pooling and retries.
+
+    Any argument left as None is read from the environment
+    (HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_MAX_RETRIES,
+    HTTP_BACKOFF_FACTOR) and falls back to the module defaults.
+
+    Args:
+        pool_connections (int): Number of per-host connection pools to cache.
+        pool_maxsize (int): Maximum number of connections kept alive per host.
+        max_retries (int): Retries for connection errors and retryable statuses.
+        backoff_factor (float): Exponential backoff factor between retries.
+
+    Returns:
+        requests.Session: A configured session.
+    """
+    if pool_connections is None:
+        pool_connections = _env_int("HTTP_POOL_CONNECTIONS", DEFAULT_POOL_CONNECTIONS)
+    if pool_maxsize is None:
+        pool_maxsize = _env_int("HTTP_POOL_MAXSIZE", DEFAULT_POOL_MAXSIZE)
+    if max_retries is None:
+        max_retries = _env_int("HTTP_MAX_RETRIES", DEFAULT_MAX_RETRIES)
+    if backoff_factor is None:
+        backoff_factor = _env_float("HTTP_BACKOFF_FACTOR", DEFAULT_BACKOFF_FACTOR)
+
+    retry = DeadlineRetry(
+        total=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=RETRY_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # requests' default, pinned so JSON payloads always come back compressed
+    session.headers["Accept-Encoding"] = "gzip, deflate"
+    session.hooks["response"].append(invalidate_on_auth_failure)
+    session.hooks["response"].append(expire_mirror_on_write)
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Returns the process-wide session, creating it on first use.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
+
+def close_session():
+    """
+    Closes the process-wide session and its pooled connections.
+    The next call to get_session() builds a fresh one.
+    """
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def trello_api_url() -> str:
+    """
+    Base URL of the Trello REST API. TRELLO_API_URL overrides it, e.g. to
+    point at the local stand-in in pro_tools.testing.fake_services.
+    """
+    return (os.getenv("TRELLO_API_URL") or DEFAULT_TRELLO_API_URL).rstrip("/")
+
+
+def serpapi_url() -> str:
+    """
+    URL of the SerpApi search endpoint, overridable with SERPAPI_URL.
+    """
+    return os.getenv("SERPAPI_URL") or DEFAULT_SERPAPI_URL
+
+
+def is_trello_url(url: str) -> bool:
+    parsed = urlparse(url)
+    return parsed.hostname == TRELLO_HOST or parsed.netloc == urlparse(trello_api_url()).netloc
+
+
+def record_response(response: requests.Response, host: str, streamed: bool = False):
+    """
+    Counts a response's status, bytes sent and received, and the retries
+    urllib3 made before it. Streamed bodies are not read, so not counted.
+    """
+    metrics = get_metrics()
+    metrics.increment("http_requests", host=host, status=response.status_code)
+    body = response.request.body if response.request is not None else None
+    if body:
+        metrics.increment("http_bytes_sent", len(body), host=host)
+    if not streamed:
+        metrics.increment("http_bytes_received", len(response.content or b""), host=host)
+    history = getattr(getattr(response.raw, "retries", None), "history", None)
+    if history:
+        metrics.increment("http_retries", len(history), host=host)
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """
+    Sends a request on the shared session.
+
+    Trello calls first take a token from the process-wide rate limiter. A 429
+    response from any host is retried after the server's Retry-After delay
+    (or exponential backoff), up to TRELLO_MAX_THROTTLE_RETRIES times, and
+    pauses the Trello limiter so concurrent callers back off too.
+
+    Unless the caller passes its own `timeout`, every attempt gets the
+    per-request timeout cut down to the time left before the run's
+    deadline (see pro_tools.utils.deadline), so a hung connection cannot
+    stall the run.
+
+    Raises:
+        DeadlineExceeded: If the deadline passes before a request is sent.
+    """
+    session = get_session()
+    limiter = get_trello_rate_limiter() if is_trello_url(url) else None
+    retries = max_throttle_retries()
+    metrics = get_metrics()
+    host = urlparse(url).hostname or ""
+
+    attempt = 0
+    while True:
+        if limiter is not None:
+            limiter.acquire()
+        timeout = kwargs.get("timeout") or deadline.request_timeout()
+        with metrics.span("http", host):
+            response = session.request(method, url, **{**kwargs, "timeout": timeout})
+        record_response(response, host, streamed=kwargs.get("stream", False))
+        if response.status_code != 429 or attempt >= retries:
+            return response
+
+        delay = backoff_delay(attempt, response.headers.get("Retry-After"))
+        left = deadline.remaining()
+        if left is not None and delay >= left:
+            # Waiting out the throttle would overrun the deadline
+            return response
+        response.close()
+        attempt += 1
+        metrics.increment("http_throttle_retries", host=host)
+        print(f"Throttled by {host}, retrying in {delay:.1f}s (attempt {attempt}/{retries})")
+        if limiter is not None:
+            limiter.throttle(delay)
+        else:
+            time.sleep(delay)
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+
+def put(url: str, **kwargs) -> requests.Response:
+    return request("PUT", url, **kwargs)
+
+
+def delete(url: str, **kwargs) -> requests.Response:
+    return request("DELETE", url, **kwargs)
+
+
+def hedge_delay(host: str) -> float:
+    """
+    How long to wait for a response from `host` before hedging: the p95 of
+    its earlier requests in this run, or HTTP_HEDGE_DELAY (default 2s)
+    until there are enough of them.
+    """
+    observed = get_metrics().quantile("http", host, HEDGE_QUANTILE, min_samples=HEDGE_MIN_SAMPLES)
+    if observed is not None:
+        return observed
+    return _env_float("HTTP_HEDGE_DELAY", DEFAULT_HEDGE_DELAY)
+
+
+def _close_response(future: Future):
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+def hedged_get(url: str, hedge_after: Optional[float] = None, **kwargs) -> requests.Response:
+    """
+    Sends a GET and, if it has not completed after `hedge_after` seconds
+    (see hedge_delay), sends the same GET again and returns whichever
+    response arrives first. Only for idempotent, read-only requests: both
+    may reach the server.
+
+    Raises:
+        Exception: What the last outstanding request raised, if both fail.
+    """
+    host = urlparse(url).hostname or ""
+    if hedge_after is None:
+        hedge_after = hedge_delay(host)
+
+    send = deadline.bind(get)
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="hedge")
+    try:
+        first = executor.submit(send, url, **kwargs)
+        done, _ = wait([first], timeout=hedge_after)
+        if done:
+            return first.result()
+
+        metrics = get_metrics()
+        metrics.increment("http_hedged_requests", host=host)
+        second = executor.submit(send, url, **kwargs)
+        pending = {first, second}
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            succeeded = [future for future in done if future.exception() is None]
+            if not succeeded:
+                if not pending:
+                    raise next(iter(done)).exception()
+                continue
+            winner = first if first in succeeded else second
+            # The slower request is left to finish and its connection returned to the pool
+            for other in pending | (set(succeeded) - {winner}):
+                other.add_done_callback(_close_response)
+            if winner is second:
+                metrics.increment("http_hedge_wins", host=host)
+            return winner.result()
+    finally:
+        executor.shutdown(wait=False)
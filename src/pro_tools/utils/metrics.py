@@ -0,0 +1,217 @@
+import functools
+import inspect
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+CounterKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def percentile(samples: List[float], quantile: float) -> float:
+    """
+    Nearest-rank percentile of `samples`, which must be sorted.
+    """
+    if not samples:
+        return 0.0
+    rank = max(1, math.ceil(quantile * len(samples)))
+    return samples[rank - 1]
+
+
+def _labels(labels: Dict[str, Any]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _label_text(labels: Tuple[Tuple[str, str], ...]) -> str:
+    return ",".join(f'{key}="{value}"' for key, value in labels)
+
+
+class Metrics:
+    """
+    In-process timing spans and counters for one run.
+
+    Spans are grouped by phase (http, tool, task, llm, kickoff) and by a name
+    within the phase, such as the host, tool class or task name. Counters
+    carry optional labels. The summary reports count, total, p50, p95, p99
+    and max seconds per phase and per name.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = time.time()
+            self._timings: Dict[Tuple[str, str], List[float]] = {}
+            self._counters: Dict[CounterKey, float] = {}
+
+    def observe(self, phase: str, name: str, seconds: float):
+        with self._lock:
+            self._timings.setdefault((phase, name), []).append(seconds)
+
+    def increment(self, name: str, value: float = 1, **labels: Any):
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    @contextmanager
+    def span(self, phase: str, name: str) -> Iterator[None]:
+        """
+        Times the enclosed block, whether or not it raises.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(phase, name, time.perf_counter() - start)
+
+    def quantile(self, phase: str, name: str, quantile: float, min_samples: int = 1) -> Optional[float]:
+        """
+        Returns a quantile of a span's timings so far, or None with fewer
+        than `min_samples` samples.
+        """
+        with self._lock:
+            samples = sorted(self._timings.get((phase, name), []))
+        if len(samples) < max(1, min_samples):
+            return None
+        return percentile(samples, quantile)
+
+    def counter(self, name: str, **labels: Any) -> float:
+        with self._lock:
+            return self._counters.get((name, _labels(labels)), 0)
+
+    @staticmethod
+    def _stats(samples: List[float]) -> Dict[str, float]:
+        ordered = sorted(samples)
+        stats = {"count": len(ordered), "total": sum(ordered)}
+        for quantile in QUANTILES:
+            stats[f"p{int(quantile * 100)}"] = percentile(ordered, quantile)
+        stats["max"] = ordered[-1] if ordered else 0.0
+        return stats
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Returns all spans and counters as a JSON-serializable dictionary.
+        """
+        with self._lock:
+            timings = {key: list(samples) for key, samples in self._timings.items()}
+            counters = dict(self._counters)
+
+        phases: Dict[str, Dict[str, Any]] = {}
+        by_phase: Dict[str, List[float]] = {}
+        for (phase, name), samples in sorted(timings.items()):
+            phases.setdefault(phase, {"series": {}})["series"][name] = self._stats(samples)
+            by_phase.setdefault(phase, []).extend(samples)
+        for phase, samples in by_phase.items():
+            phases[phase]["summary"] = self._stats(samples)
+
+        return {
+            "started_at": self.started_at,
+            "finished_at": time.time(),
+            "phases": phases,
+            "counters": {
+                f"{name}{{{_label_text(labels)}}}" if labels else name: value
+                for (name, labels), value in sorted(counters.items())
+            },
+        }
+
+    def to_prometheus(self) -> str:
+        """
+        Renders spans as summaries and counters in the Prometheus text format.
+        """
+        with self._lock:
+            timings = {key: list(samples) for key, samples in self._timings.items()}
+            counters = dict(self._counters)
+
+        lines = [
+            "# HELP pro_tools_phase_seconds Time spent per phase of the run.",
+            "# TYPE pro_tools_phase_seconds summary",
+        ]
+        for (phase, name), samples in sorted(timings.items()):
+            stats = self._stats(samples)
+            labels = _label_text((("phase", phase), ("name", name)))
+            for quantile in QUANTILES:
+                lines.append(
+                    f'pro_tools_phase_seconds{{{labels},quantile="{quantile}"}} '
+                    f'{stats[f"p{int(quantile * 100)}"]:.6f}'
+                )
+            lines.append(f"pro_tools_phase_seconds_sum{{{labels}}} {stats['total']:.6f}")
+            lines.append(f"pro_tools_phase_seconds_count{{{labels}}} {stats['count']}")
+
+        typed = set()
+        for (name, labels), value in sorted(counters.items()):
+            metric = f"pro_tools_{name}_total"
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} counter")
+                typed.add(metric)
+            suffix = f"{{{_label_text(labels)}}}" if labels else ""
+            lines.append(f"{metric}{suffix} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Optional[str] = None, fmt: Optional[str] = None) -> Optional[str]:
+        """
+        Writes the run's metrics to `path` (METRICS_OUTPUT_PATH) as JSON or as
+        a Prometheus textfile (METRICS_FORMAT, or inferred from a `.prom`
+        extension). Does nothing when no path is configured.
+
+        Returns:
+            str: The path written, or None.
+        """
+        path = path or os.getenv("METRICS_OUTPUT_PATH")
+        if not path:
+            return None
+        fmt = (fmt or os.getenv("METRICS_FORMAT") or ("prometheus" if path.endswith(".prom") else "json")).lower()
+        if fmt not in ("json", "prometheus"):
+            raise ValueError(f"Unsupported metrics format: {fmt}")
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        content = self.to_prometheus() if fmt == "prometheus" else json.dumps(self.summary(), indent=2)
+        # Write then rename so textfile collectors never read a partial file
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        return path
+
+
+_metrics = Metrics()
+
+
+def get_metrics() -> Metrics:
+    """
+    Returns the process-wide metrics registry.
+    """
+    return _metrics
+
+
+def timed(phase: str) -> Callable:
+    """
+    Decorator recording each call of a function or coroutine as a span named
+    after its class (for methods) or function.
+    """
+    def decorator(func: Callable) -> Callable:
+        parts = func.__qualname__.split(".")
+        name = parts[-2] if len(parts) > 1 else parts[0]
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with _metrics.span(phase, name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _metrics.span(phase, name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
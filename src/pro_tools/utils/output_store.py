@@ -0,0 +1,299 @@
+import argparse
+import gzip
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+from pro_tools.utils.sqlite_store import SQLiteStore
+
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.expanduser("~"), ".cache", "pro_tools", "outputs")
+DEFAULT_SHARD_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+DEFAULT_ACTIVE_SECONDS = 3600
+SHARD_SUFFIX = ".jsonl.gz"
+
+_store: Optional["OutputStore"] = None
+_store_lock = threading.Lock()
+
+
+def new_run_id() -> str:
+    """
+    Returns a unique run ID that sorts by start time, e.g.
+    `20250101T120000Z-4f2a9c1b`.
+    """
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ") + "-" + uuid.uuid4().hex[:8]
+
+
+def is_shard_of(name: str, run_id: str) -> bool:
+    """
+    Returns whether `name` is one of the run's shards, `<run id>.jsonl.gz`
+    or `<run id>-<n>.jsonl.gz`, and not that of a run whose ID merely
+    starts with `run_id`.
+    """
+    if not name.endswith(SHARD_SUFFIX):
+        return False
+    stem = name[:-len(SHARD_SUFFIX)]
+    if stem == run_id:
+        return True
+    prefix = f"{run_id}-"
+    return stem.startswith(prefix) and stem[len(prefix):].isdigit()
+
+
+class OutputStore(SQLiteStore):
+    """
+    Append-only store for the research topics and article sections of every
+    run, replacing the research.txt and article.txt files each run overwrote.
+
+    Each run appends to its own shard, `<dir>/shards/<run id>.jsonl.gz`, so
+    concurrent runs never share a file. Every record is one JSON line
+    compressed as its own gzip member: the shard is still a valid gzip file
+    of JSONL, and a single record can be read back by seeking to it and
+    decompressing only its bytes. A SQLite index maps each card ID to the
+    shard, offset and length of its records.
+
+    A shard is rotated once it reaches `shard_bytes`. When a run starts and
+    whenever a shard rotates, the oldest shards of other runs are deleted,
+    with their index entries, until all shards together fit in `max_bytes`,
+    so disk use stays bounded however many runs there are. Runs that wrote
+    to any of their shards within `active_seconds` are taken to be still
+    running, and their shards are kept.
+    Records are written as they are produced and nothing is held in memory.
+
+    Args:
+        directory (str): Where shards and the index live (OUTPUT_STORE_DIR,
+            default ~/.cache/pro_tools/outputs).
+        run_id (str): The ID of this run's shard; generated if not given.
+        shard_bytes (int): Size at which a run moves on to a new shard
+            (OUTPUT_STORE_SHARD_BYTES, default 64 MB).
+        max_bytes (int): Total shard size kept (OUTPUT_STORE_MAX_BYTES,
+            default 500 MB).
+        active_seconds (float): How recently another run must have written
+            for its shards to be spared by pruning
+            (OUTPUT_STORE_ACTIVE_SECONDS, default 3600).
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS records (
+            card_id TEXT NOT NULL,
+            stage TEXT NOT NULL,
+            run_id TEXT NOT NULL,
+            shard TEXT NOT NULL,
+            offset INTEGER NOT NULL,
+            length INTEGER NOT NULL,
+            created_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS records_by_card ON records (card_id, created_at);
+        CREATE INDEX IF NOT EXISTS records_by_shard ON records (shard);
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        run_id: Optional[str] = None,
+        shard_bytes: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        active_seconds: Optional[float] = None,
+    ):
+        self.directory = directory or os.getenv("OUTPUT_STORE_DIR") or DEFAULT_OUTPUT_DIR
+        self.shard_dir = os.path.join(self.directory, "shards")
+        super().__init__(os.path.join(self.directory, "index.sqlite3"))
+        if shard_bytes is None:
+            shard_bytes = int(os.getenv("OUTPUT_STORE_SHARD_BYTES") or DEFAULT_SHARD_BYTES)
+        if max_bytes is None:
+            max_bytes = int(os.getenv("OUTPUT_STORE_MAX_BYTES") or DEFAULT_MAX_BYTES)
+        if active_seconds is None:
+            active_seconds = float(os.getenv("OUTPUT_STORE_ACTIVE_SECONDS") or DEFAULT_ACTIVE_SECONDS)
+        self.shard_bytes = shard_bytes
+        self.max_bytes = max_bytes
+        self.active_seconds = active_seconds
+        self.run_id = run_id or new_run_id()
+        self._shard_number = 0
+        self._pruned = False
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # Shards live next to the index, so their directory is created with it
+        if not self._schema_ready:
+            os.makedirs(self.shard_dir, exist_ok=True)
+        with super()._connect() as conn:
+            yield conn
+
+    @property
+    def shard(self) -> str:
+        """File name of the shard this run is appending to."""
+        suffix = f"-{self._shard_number}" if self._shard_number else ""
+        return f"{self.run_id}{suffix}{SHARD_SUFFIX}"
+
+    def append(self, stage: str, card_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Appends one record to this run's shard and indexes it by card ID.
+
+        Args:
+            stage (str): What the record holds, e.g. "research" or "article".
+            card_id (str): The Trello card the record belongs to.
+            data (dict): The record, e.g. a Topic or Section dump.
+
+        Returns:
+            dict: The stored record, with its run ID and timestamp.
+        """
+        record = {
+            "run_id": self.run_id,
+            "stage": stage,
+            "card_id": card_id,
+            "created_at": time.time(),
+            "data": data,
+        }
+        member = gzip.compress((json.dumps(record) + "\n").encode("utf-8"))
+        with self._lock, self._connect() as conn:
+            if not self._pruned:
+                self._prune(conn)
+                self._pruned = True
+            path = os.path.join(self.shard_dir, self.shard)
+            if os.path.exists(path) and os.path.getsize(path) + len(member) > self.shard_bytes:
+                self._shard_number += 1
+                path = os.path.join(self.shard_dir, self.shard)
+                # Long-running processes (e.g. the webhook daemon) prune as they go
+                self._prune(conn)
+            # The index row is only written once the bytes are on disk
+            with open(path, "ab") as f:
+                offset = f.tell()
+                f.write(member)
+            conn.execute(
+                "INSERT INTO records (card_id, stage, run_id, shard, offset, length, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (card_id, stage, self.run_id, self.shard, offset, len(member), record["created_at"]),
+            )
+        return record
+
+    def _read(self, shard: str, offset: int, length: int) -> Dict[str, Any]:
+        with open(os.path.join(self.shard_dir, shard), "rb") as f:
+            f.seek(offset)
+            return json.loads(gzip.decompress(f.read(length)))
+
+    def history(self, card_id: str, stage: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Returns every stored record of a card, oldest first, reading only
+        that card's records from the shards.
+
+        Args:
+            card_id (str): The Trello card ID.
+            stage (str): Only return records of this stage.
+        """
+        query = "SELECT shard, offset, length FROM records WHERE card_id = ?"
+        params: List[Any] = [card_id]
+        if stage:
+            query += " AND stage = ?"
+            params.append(stage)
+        with self._connect() as conn:
+            rows = conn.execute(query + " ORDER BY created_at, rowid", params).fetchall()
+        records = []
+        for shard, offset, length in rows:
+            try:
+                records.append(self._read(shard, offset, length))
+            except FileNotFoundError:
+                # Pruned by another process since the index was read
+                continue
+        return records
+
+    def latest(self, card_id: str, stage: str) -> Optional[Dict[str, Any]]:
+        """Returns the card's most recent record of a stage, or None."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT shard, offset, length FROM records WHERE card_id = ? AND stage = ? "
+                "ORDER BY created_at DESC, rowid DESC LIMIT 1",
+                (card_id, stage),
+            ).fetchone()
+        return self._read(*row) if row else None
+
+    def runs(self) -> List[str]:
+        """Returns the IDs of the runs still stored, oldest first."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT DISTINCT run_id FROM records ORDER BY run_id").fetchall()
+        return [row[0] for row in rows]
+
+    def iter_run(self, run_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        Streams every record of a run in write order, one line at a time.
+        """
+        shards = sorted(
+            (name for name in os.listdir(self.shard_dir) if is_shard_of(name, run_id)),
+            key=lambda name: (len(name), name),
+        ) if os.path.isdir(self.shard_dir) else []
+        for shard in shards:
+            # Concatenated gzip members read back as one stream
+            with gzip.open(os.path.join(self.shard_dir, shard), "rt", encoding="utf-8") as f:
+                for line in f:
+                    yield json.loads(line)
+
+    def _prune(self, conn: sqlite3.Connection):
+        shards = sorted(name for name in os.listdir(self.shard_dir) if name.endswith(SHARD_SUFFIX))
+        stats = {name: os.stat(os.path.join(self.shard_dir, name)) for name in shards}
+        sizes = {name: stat.st_size for name, stat in stats.items()}
+        total = sum(sizes.values())
+        # A run that rotated keeps its earlier shards while it writes to its latest;
+        # shards without index entries count as a run of their own
+        run_of = dict(conn.execute("SELECT DISTINCT shard, run_id FROM records").fetchall())
+        cutoff = time.time() - self.active_seconds
+        active = {run_of.get(name, name) for name in shards if stats[name].st_mtime >= cutoff}
+        for name in shards:
+            if total <= self.max_bytes:
+                break
+            if is_shard_of(name, self.run_id) or run_of.get(name, name) in active:
+                continue
+            conn.execute("DELETE FROM records WHERE shard = ?", (name,))
+            try:
+                os.remove(os.path.join(self.shard_dir, name))
+            except FileNotFoundError:
+                pass
+            total -= sizes[name]
+
+
+def get_output_store() -> OutputStore:
+    """
+    Returns the process-wide store, so every crew of one run (e.g. the
+    fan-out pipelines) appends to the same shard.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = OutputStore()
+    return _store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read research and articles from the output store.")
+    parser.add_argument("card_id", nargs="?", help="Print this card's history")
+    parser.add_argument("--stage", choices=("research", "article"), help="Only this stage")
+    parser.add_argument("--run", help="Print every record of this run instead")
+    parser.add_argument("--runs", action="store_true", help="List the stored runs")
+    args = parser.parse_args()
+
+    store = OutputStore()
+    if args.runs:
+        for run_id in store.runs():
+            print(run_id)
+        return
+    if args.run:
+        records = store.iter_run(args.run)
+    elif args.card_id:
+        records = store.history(args.card_id, args.stage)
+    else:
+        parser.error("Give a card ID, --run or --runs")
+    for record in records:
+        if args.stage and record["stage"] != args.stage:
+            continue
+        data = record["data"]
+        print(f"## {record['card_id']} {record['stage']} (run {record['run_id']})\n")
+        print(data.get("research") or data.get("article") or json.dumps(data, indent=2))
+        print()
+
+
+if __name__ == "__main__":
+    main()
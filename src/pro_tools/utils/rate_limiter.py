@@ -0,0 +1,161 @@
+import asyncio
+import email.utils
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+# Trello allows 100 requests per 10 second window for each token.
+DEFAULT_TRELLO_RATE_LIMIT = 100
+DEFAULT_TRELLO_RATE_PERIOD = 10.0
+DEFAULT_MAX_THROTTLE_RETRIES = 5
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_CAP = 30.0
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every caller of a rate-limited API.
+
+    Callers reserve one token per request and wait until it is available, so
+    requests leave at the maximum sustainable rate instead of bursting into
+    429s. When the server throttles anyway, `throttle()` pauses the whole
+    bucket for the server-requested delay.
+
+    The bucket tracks how many requests it admitted, how long they queued,
+    and how often and for how long the server throttled them.
+    """
+
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.period = period
+        self._rate = capacity / period
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.queued_requests = 0
+        self.queued_seconds = 0.0
+        self.throttled_responses = 0
+        self.throttled_seconds = 0.0
+
+    def _refill(self, now: float):
+        # No tokens accrue before `_updated_at`, which a throttle moves to the end of the pause
+        if now <= self._updated_at:
+            return
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+
+    def reserve(self) -> float:
+        """
+        Takes one token and returns how many seconds the caller must wait
+        before using it.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            # The token exists once the deficit has refilled, counted from the last refill
+            delay = max(0.0, self._updated_at - now + max(0.0, -self._tokens) / self._rate)
+
+            self.requests += 1
+            if delay > 0:
+                self.queued_requests += 1
+                self.queued_seconds += delay
+            return delay
+
+    def acquire(self) -> float:
+        """
+        Blocks until a token is available. Returns the time spent waiting.
+        """
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self) -> float:
+        """
+        Awaits until a token is available. Returns the time spent waiting.
+        """
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def throttle(self, delay: float):
+        """
+        Records a throttled response and holds every caller back for `delay`
+        seconds, then resumes at the steady rate rather than a full burst.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens = min(self._tokens, 0.0)
+            # Nothing refills until the pause ends, so callers that reserve during
+            # it are spaced out at the steady rate after it instead of all at once
+            self._updated_at = max(self._updated_at, now + delay)
+            self.throttled_responses += 1
+            self.throttled_seconds += delay
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "queued_requests": self.queued_requests,
+                "queued_seconds": round(self.queued_seconds, 3),
+                "throttled_responses": self.throttled_responses,
+                "throttled_seconds": round(self.throttled_seconds, 3),
+            }
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parses a Retry-After header given either in seconds or as an HTTP date.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def backoff_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """
+    Returns the delay before retrying a throttled request: the server's
+    Retry-After when given, exponential backoff otherwise.
+    """
+    delay = parse_retry_after(retry_after)
+    if delay is None:
+        delay = DEFAULT_BACKOFF_BASE * (2 ** attempt)
+    return min(delay, DEFAULT_BACKOFF_CAP)
+
+
+def max_throttle_retries() -> int:
+    return int(os.getenv("TRELLO_MAX_THROTTLE_RETRIES") or DEFAULT_MAX_THROTTLE_RETRIES)
+
+
+_trello_bucket: Optional[TokenBucket] = None
+_trello_bucket_lock = threading.Lock()
+
+
+def get_trello_rate_limiter() -> TokenBucket:
+    """
+    Returns the process-wide bucket every Trello call goes through. Its size
+    comes from TRELLO_RATE_LIMIT requests per TRELLO_RATE_PERIOD seconds.
+    """
+    global _trello_bucket
+    if _trello_bucket is None:
+        with _trello_bucket_lock:
+            if _trello_bucket is None:
+                _trello_bucket = TokenBucket(
+                    int(os.getenv("TRELLO_RATE_LIMIT") or DEFAULT_TRELLO_RATE_LIMIT),
+                    float(os.getenv("TRELLO_RATE_PERIOD") or DEFAULT_TRELLO_RATE_PERIOD),
+                )
+    return _trello_bucket
@@ -0,0 +1,198 @@
+import math
+import os
+import re
+from typing import Any, Dict, List, Optional
+
+# numpy is always installed alongside crewai (through chromadb)
+import numpy as np
+
+from pro_tools.models.research import Research, Topic
+
+DEFAULT_TOPIC_TOKEN_BUDGET = 800
+DEFAULT_DUPLICATE_THRESHOLD = 0.85
+# Relevance to the card name dominates; closeness to the rest of the topic breaks ties
+QUERY_WEIGHT = 0.7
+CENTROID_WEIGHT = 0.3
+
+WORD = re.compile(r"[a-z0-9]+")
+LIST_ITEM = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+")
+HEADING = re.compile(r"^\s*#{1,6}\s")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximates the token count of English text at four characters per token.
+    """
+    return math.ceil(len(text) / 4) if text else 0
+
+
+def token_budget() -> int:
+    return int(os.getenv("RESEARCH_TOPIC_TOKEN_BUDGET") or DEFAULT_TOPIC_TOKEN_BUDGET)
+
+
+def duplicate_threshold() -> float:
+    return float(os.getenv("RESEARCH_DUPLICATE_THRESHOLD") or DEFAULT_DUPLICATE_THRESHOLD)
+
+
+def split_units(markdown: str) -> List[str]:
+    """
+    Splits Markdown into the units compaction keeps or drops: headings,
+    list items (with their continuation lines) and paragraphs.
+    """
+    units: List[str] = []
+    current: List[str] = []
+
+    def flush():
+        if current:
+            units.append("\n".join(current))
+            current.clear()
+
+    for line in markdown.splitlines():
+        if not line.strip():
+            flush()
+        elif HEADING.match(line):
+            flush()
+            units.append(line)
+        elif LIST_ITEM.match(line):
+            flush()
+            current.append(line)
+        else:
+            current.append(line)
+    flush()
+    return units
+
+
+def tfidf_matrix(documents: List[str]) -> np.ndarray:
+    """
+    Returns the L2-normalized TF-IDF vectors of the documents, one row each,
+    with sublinear term frequencies and smoothed IDF.
+    """
+    tokenized = [WORD.findall(document.lower()) for document in documents]
+    vocabulary: Dict[str, int] = {}
+    for tokens in tokenized:
+        for token in tokens:
+            vocabulary.setdefault(token, len(vocabulary))
+
+    counts = np.zeros((len(documents), max(1, len(vocabulary))))
+    for row, tokens in enumerate(tokenized):
+        if tokens:
+            np.add.at(counts[row], [vocabulary[token] for token in tokens], 1)
+
+    tf = np.zeros_like(counts)
+    np.log1p(counts, out=tf, where=counts > 0)
+    df = np.count_nonzero(counts, axis=0)
+    idf = np.log((1 + len(documents)) / (1 + df)) + 1
+    weights = tf * idf
+    norms = np.linalg.norm(weights, axis=1, keepdims=True)
+    return np.divide(weights, norms, out=np.zeros_like(weights), where=norms > 0)
+
+
+def select_units(
+    units: List[str],
+    query: str,
+    budget: int,
+    threshold: float,
+) -> List[int]:
+    """
+    Picks the units to keep: the most relevant first, skipping any unit
+    nearly identical to one already kept, until the token budget is spent.
+    Headings are kept, within the budget, for sections with kept content.
+
+    Returns:
+        list: Indices of the kept units, in their original order.
+    """
+    if not units:
+        return []
+    matrix = tfidf_matrix(units + [query])
+    vectors, query_vector = matrix[:-1], matrix[-1]
+    centroid = vectors.mean(axis=0)
+    centroid_norm = np.linalg.norm(centroid)
+    if centroid_norm > 0:
+        centroid = centroid / centroid_norm
+    scores = QUERY_WEIGHT * (vectors @ query_vector) + CENTROID_WEIGHT * (vectors @ centroid)
+    similarity = vectors @ vectors.T
+
+    is_heading = [bool(HEADING.match(unit)) for unit in units]
+    heading_of = []
+    current_heading = None
+    for index, heading in enumerate(is_heading):
+        if heading:
+            current_heading = index
+        heading_of.append(current_heading)
+
+    # Stable sort: equally relevant units keep their written order
+    order = sorted((i for i in range(len(units)) if not is_heading[i]), key=lambda i: -scores[i])
+    kept: List[int] = []
+    used = 0
+    for index in order:
+        if kept and similarity[index, kept].max() >= threshold:
+            continue
+        cost = estimate_tokens(units[index])
+        heading = heading_of[index]
+        if heading is not None and heading not in kept:
+            cost += estimate_tokens(units[heading])
+        if used + cost > budget:
+            continue
+        kept.append(index)
+        if heading is not None and heading not in kept:
+            kept.append(heading)
+        used += cost
+    return sorted(kept)
+
+
+def compact_text(
+    text: str,
+    query: str,
+    budget: Optional[int] = None,
+    threshold: Optional[float] = None,
+) -> str:
+    """
+    Deduplicates and trims Markdown to `budget` tokens, keeping what is most
+    relevant to `query`. Text already within budget and free of duplicates
+    comes back unchanged apart from blank-line normalization.
+    """
+    budget = token_budget() if budget is None else budget
+    threshold = duplicate_threshold() if threshold is None else threshold
+    units = split_units(text)
+    return "\n\n".join(units[index] for index in select_units(units, query, budget, threshold))
+
+
+def compact_research(
+    research: Research,
+    budget: Optional[int] = None,
+    threshold: Optional[float] = None,
+) -> Research:
+    """
+    Compacts every topic's research to the per-topic token budget, ranking
+    its paragraphs and list items by relevance to the topic (card) name.
+    """
+    return Research(research_topics=[
+        Topic(id=topic.id, name=topic.name, research=compact_text(topic.research, topic.name, budget, threshold))
+        for topic in research.research_topics
+    ])
+
+
+def dedupe_results(results: List[Dict[str, Any]], threshold: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    Drops search results that repeat an earlier result's link, or whose
+    title and snippet are nearly identical to an earlier one's.
+    """
+    threshold = duplicate_threshold() if threshold is None else threshold
+    if len(results) < 2:
+        return list(results)
+    texts = [f"{result.get('title', '')} {result.get('snippet', '')}" for result in results]
+    matrix = tfidf_matrix(texts)
+    similarity = matrix @ matrix.T
+
+    kept: List[int] = []
+    links = set()
+    for index, result in enumerate(results):
+        link = result.get("link")
+        if link and link in links:
+            continue
+        if kept and similarity[index, kept].max() >= threshold:
+            continue
+        kept.append(index)
+        if link:
+            links.add(link)
+    return [results[index] for index in kept]
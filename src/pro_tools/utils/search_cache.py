@@ -0,0 +1,117 @@
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+from pro_tools.utils.metrics import get_metrics
+from pro_tools.utils.sqlite_store import SQLiteStore
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "pro_tools", "serpapi_cache.sqlite3"
+)
+DEFAULT_TTL = 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 1000
+
+
+def normalize_query(query: str) -> str:
+    """
+    Lowercases a query and collapses whitespace so trivially different
+    phrasings share a cache entry.
+    """
+    return " ".join(query.lower().split())
+
+
+class SearchCache(SQLiteStore):
+    """
+    Persistent SQLite cache of raw SerpApi responses.
+
+    Entries are keyed on the normalized query and `max_results`, expire after
+    `ttl` seconds and are evicted least-recently-used first once the cache
+    holds more than `max_entries`. Defaults come from SERPAPI_CACHE_PATH,
+    SERPAPI_CACHE_TTL and SERPAPI_CACHE_MAX_ENTRIES.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS search_cache (
+            query TEXT NOT NULL,
+            max_results INTEGER NOT NULL,
+            results TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            last_accessed REAL NOT NULL,
+            PRIMARY KEY (query, max_results)
+        );
+        CREATE INDEX IF NOT EXISTS idx_search_cache_last_accessed ON search_cache (last_accessed);
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+    ):
+        super().__init__(path or os.getenv("SERPAPI_CACHE_PATH") or DEFAULT_CACHE_PATH)
+        if ttl is None:
+            ttl = float(os.getenv("SERPAPI_CACHE_TTL") or DEFAULT_TTL)
+        if max_entries is None:
+            max_entries = int(os.getenv("SERPAPI_CACHE_MAX_ENTRIES") or DEFAULT_MAX_ENTRIES)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, query: str, max_results: int) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached raw SerpApi response, or None on a miss or expired entry.
+        """
+        key = normalize_query(query)
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT results, created_at FROM search_cache WHERE query = ? AND max_results = ?",
+                (key, max_results),
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    conn.execute(
+                        "DELETE FROM search_cache WHERE query = ? AND max_results = ?",
+                        (key, max_results),
+                    )
+                self.misses += 1
+                get_metrics().increment("cache_misses", cache="serpapi")
+                return None
+            conn.execute(
+                "UPDATE search_cache SET last_accessed = ? WHERE query = ? AND max_results = ?",
+                (now, key, max_results),
+            )
+            self.hits += 1
+            get_metrics().increment("cache_hits", cache="serpapi")
+            return json.loads(row[0])
+
+    def put(self, query: str, max_results: int, results: Dict[str, Any]):
+        """
+        Stores a raw SerpApi response and evicts the least recently used
+        entries beyond `max_entries`.
+        """
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO search_cache "
+                "(query, max_results, results, created_at, last_accessed) VALUES (?, ?, ?, ?, ?)",
+                (normalize_query(query), max_results, json.dumps(results), now, now),
+            )
+            conn.execute(
+                "DELETE FROM search_cache WHERE rowid IN ("
+                "SELECT rowid FROM search_cache ORDER BY last_accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self):
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM search_cache")
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self)}
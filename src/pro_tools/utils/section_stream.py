@@ -0,0 +1,132 @@
+import json
+import re
+import threading
+from typing import Any, Callable, Dict, List
+
+from crewai.events import LLMCallStartedEvent, LLMStreamChunkEvent, crewai_event_bus
+
+# The writer's reply is a ReAct answer; its JSON only follows the final marker
+FINAL_ANSWER_MARKER = "Final Answer:"
+SECTIONS_START = re.compile(r'"sections"\s*:\s*\[')
+
+_installed = False
+_install_lock = threading.Lock()
+_streams: Dict[str, "SectionStreamParser"] = {}
+_streams_lock = threading.Lock()
+
+
+class SectionStreamParser:
+    """
+    Pulls complete sections out of a streamed Article answer as the tokens
+    arrive, so each one can be used before the rest are written.
+
+    Text is buffered until the `"sections": [` array of the final answer
+    starts; from then on, every JSON object that closes in the array is
+    decoded and handed to `on_section` once. Objects still being written
+    are left in the buffer until more text arrives.
+
+    Args:
+        on_section (callable): Called with each section's dict.
+    """
+
+    def __init__(self, on_section: Callable[[Dict[str, Any]], None]):
+        self.on_section = on_section
+        self._decoder = json.JSONDecoder()
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Starts over, e.g. when the agent makes another LLM call."""
+        self._buffer = ""
+        self._position = None
+        self._done = False
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Adds streamed text and returns the sections it completed.
+        """
+        with self._lock:
+            self._buffer += text
+            sections = self._parse()
+        for section in sections:
+            self.on_section(section)
+        return sections
+
+    def _parse(self) -> List[Dict[str, Any]]:
+        if self._done:
+            return []
+        if self._position is None:
+            marker = self._buffer.find(FINAL_ANSWER_MARKER)
+            if marker >= 0:
+                search_from = marker + len(FINAL_ANSWER_MARKER)
+            elif self._buffer.lstrip().startswith(("{", "```")):
+                # Models told to answer with JSON sometimes skip the ReAct marker
+                search_from = 0
+            else:
+                # Still in the agent's thoughts, which may quote JSON of their own
+                return []
+            match = SECTIONS_START.search(self._buffer, search_from)
+            if match is None:
+                return []
+            self._position = match.end()
+
+        sections = []
+        while True:
+            # Skip the separators between array items
+            while self._position < len(self._buffer) and self._buffer[self._position] in " \t\r\n,":
+                self._position += 1
+            if self._position >= len(self._buffer):
+                return sections
+            if self._buffer[self._position] == "]":
+                self._done = True
+                return sections
+            try:
+                item, end = self._decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                # The object is not complete yet
+                return sections
+            self._position = end
+            if isinstance(item, dict):
+                sections.append(item)
+
+
+def _on_llm_started(source: Any, event: LLMCallStartedEvent):
+    with _streams_lock:
+        parser = _streams.get(str(event.task_id))
+    if parser is not None:
+        parser.reset()
+
+
+def _on_chunk(source: Any, event: LLMStreamChunkEvent):
+    with _streams_lock:
+        parser = _streams.get(str(event.task_id))
+    if parser is not None and event.chunk:
+        parser.feed(event.chunk)
+
+
+def watch_task(task_id: Any, on_section: Callable[[Dict[str, Any]], None]) -> SectionStreamParser:
+    """
+    Streams the sections a task's LLM writes to `on_section`, as each one
+    completes. Only LLMs created with `stream=True` emit the chunks this
+    listens to; others produce nothing until the task callback.
+    """
+    _install()
+    parser = SectionStreamParser(on_section)
+    with _streams_lock:
+        _streams[str(task_id)] = parser
+    return parser
+
+
+def unwatch_task(task_id: Any):
+    with _streams_lock:
+        _streams.pop(str(task_id), None)
+
+
+def _install():
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        crewai_event_bus.register_handler(LLMCallStartedEvent, _on_llm_started)
+        crewai_event_bus.register_handler(LLMStreamChunkEvent, _on_chunk)
+        _installed = True
@@ -0,0 +1,49 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class SQLiteStore:
+    """
+    Base class of the local SQLite stores (search cache, card ledger, stage
+    cache, board mirror, card queue, output index).
+
+    Connections are short-lived and opened in WAL mode, so several threads
+    and processes can share the file. The database and its directory are
+    created on first use, so constructing a store has no side effects.
+    Subclasses set `SCHEMA` to the script creating their tables and guard
+    writes that must not interleave with `self._lock`.
+
+    Args:
+        path (str): Path of the SQLite database file.
+    """
+
+    SCHEMA = ""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._schema_ready = False
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Opens a connection inside a transaction that commits when the block
+        exits cleanly and rolls back if it raises.
+        """
+        if not self._schema_ready:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                if not self._schema_ready:
+                    conn.executescript(self.SCHEMA)
+                    self._schema_ready = True
+                yield conn
+        finally:
+            conn.close()
@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+from pro_tools.utils.metrics import get_metrics
+from pro_tools.utils.sqlite_store import SQLiteStore
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "pro_tools", "stage_cache.sqlite3"
+)
+DEFAULT_TTL = 7 * 24 * 60 * 60
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+
+class StageCache(SQLiteStore):
+    """
+    Content-addressed SQLite cache of per-card Research and Article outputs.
+
+    Keys hash the normalized card name together with the task and agent
+    configuration that produced the output, so editing a prompt in
+    tasks.yaml or agents.yaml invalidates every entry made with the old one.
+    Entries expire after `ttl` seconds and the least recently used are
+    evicted once stored payloads exceed `max_bytes`. With `refresh` set,
+    lookups always miss so outputs are recomputed and overwritten.
+
+    Defaults come from STAGE_CACHE_PATH, STAGE_CACHE_TTL,
+    STAGE_CACHE_MAX_BYTES and STAGE_CACHE_REFRESH.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS stage_cache (
+            key TEXT PRIMARY KEY,
+            stage TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            created_at REAL NOT NULL,
+            last_accessed REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_stage_cache_last_accessed ON stage_cache (last_accessed);
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        refresh: Optional[bool] = None,
+    ):
+        super().__init__(path or os.getenv("STAGE_CACHE_PATH") or DEFAULT_CACHE_PATH)
+        if ttl is None:
+            ttl = float(os.getenv("STAGE_CACHE_TTL") or DEFAULT_TTL)
+        if max_bytes is None:
+            max_bytes = int(os.getenv("STAGE_CACHE_MAX_BYTES") or DEFAULT_MAX_BYTES)
+        if refresh is None:
+            refresh = os.getenv("STAGE_CACHE_REFRESH", "").lower() == "true"
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(stage: str, card_name: str, task_config: Dict[str, Any], agent_config: Dict[str, Any]) -> str:
+        """
+        Builds the cache key for one card's output of one stage.
+
+        Args:
+            stage (str): "research" or "article".
+            card_name (str): The Trello card name; case and spacing are ignored.
+            task_config (dict): The task's entry from tasks.yaml.
+            agent_config (dict): The entry from agents.yaml of the agent running the task.
+        """
+        fingerprint = {
+            "stage": stage,
+            "card_name": " ".join(card_name.lower().split()),
+            "task": {key: task_config.get(key) for key in ("description", "expected_output")},
+            "agent": {key: agent_config.get(key) for key in ("role", "goal", "backstory")},
+        }
+        return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached output for `key`, or None on a miss, an expired
+        entry or when refreshing.
+        """
+        if self.refresh:
+            self.misses += 1
+            get_metrics().increment("cache_misses", cache="stage")
+            return None
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT payload, created_at FROM stage_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    conn.execute("DELETE FROM stage_cache WHERE key = ?", (key,))
+                self.misses += 1
+                get_metrics().increment("cache_misses", cache="stage")
+                return None
+            conn.execute("UPDATE stage_cache SET last_accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            get_metrics().increment("cache_hits", cache="stage")
+            return json.loads(row[0])
+
+    def put(self, key: str, stage: str, payload: Dict[str, Any]):
+        """
+        Stores an output and evicts the least recently used entries until the
+        cache fits in `max_bytes`.
+        """
+        data = json.dumps(payload)
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO stage_cache "
+                "(key, stage, payload, size, created_at, last_accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, stage, data, len(data), now, now),
+            )
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM stage_cache").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            for old_key, size in conn.execute(
+                "SELECT key, size FROM stage_cache WHERE key != ? ORDER BY last_accessed ASC", (key,)
+            ).fetchall():
+                conn.execute("DELETE FROM stage_cache WHERE key = ?", (old_key,))
+                total -= size
+                if total <= self.max_bytes:
+                    break
+
+    def clear(self):
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM stage_cache")
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM stage_cache").fetchone()[0]
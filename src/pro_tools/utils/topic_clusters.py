@@ -0,0 +1,123 @@
+import os
+import re
+import unicodedata
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set
+
+import numpy as np
+
+DEFAULT_THRESHOLD = 0.7
+DEFAULT_NUM_PERM = 64
+DEFAULT_BANDS = 16
+SHINGLE_SIZE = 3
+# Hashes stay below 2**31 so a * x + b never overflows int64
+PRIME = (1 << 31) - 1
+
+NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_name(name: str) -> str:
+    """
+    Lowercases a card name, strips accents and turns punctuation into
+    spaces, e.g. "GPT-5 released?" -> "gpt 5 released".
+    """
+    ascii_name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    return NON_ALNUM.sub(" ", ascii_name.lower()).strip()
+
+
+def shingles(name: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    """
+    Returns the character shingles of a normalized name with spaces removed,
+    so "GPT-5" and "GPT 5" share all of theirs.
+    """
+    text = normalize_name(name).replace(" ", "")
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+class MinHasher:
+    """
+    MinHash signatures whose agreement rate estimates the Jaccard similarity
+    of two shingle sets.
+
+    Args:
+        num_perm (int): Hash functions, i.e. the signature length.
+        seed (int): Seed of the hash functions; signatures are only
+            comparable between hashers with the same seed.
+    """
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(1, PRIME, size=num_perm, dtype=np.int64)
+        self._b = rng.integers(0, PRIME, size=num_perm, dtype=np.int64)
+
+    def signature(self, shingle_set: Set[str]) -> np.ndarray:
+        if not shingle_set:
+            return np.full(self.num_perm, PRIME, dtype=np.int64)
+        hashes = np.array([zlib.crc32(s.encode("utf-8")) % PRIME for s in sorted(shingle_set)], dtype=np.int64)
+        return ((np.outer(hashes, self._a) + self._b) % PRIME).min(axis=0)
+
+
+def cluster_cards(
+    cards: List[Dict[str, Any]],
+    threshold: Optional[float] = None,
+    num_perm: int = DEFAULT_NUM_PERM,
+    bands: int = DEFAULT_BANDS,
+) -> List[List[Dict[str, Any]]]:
+    """
+    Groups cards whose names are near-duplicates, e.g. "GPT-5 release" and
+    "GPT 5 released?".
+
+    Names are compared by the estimated Jaccard similarity of their
+    character shingles. Locality-sensitive hashing over bands of the MinHash
+    signatures finds the candidate pairs, so only likely duplicates are
+    compared rather than every pair of cards.
+
+    Args:
+        cards (list): Dictionaries with the card `id` and `name`.
+        threshold (float): Similarity at which two names are duplicates
+            (CARD_DEDUP_THRESHOLD, default 0.7).
+
+    Returns:
+        list: Clusters in the order of their first card, each listing its
+            cards in input order. Cards without duplicates form their own
+            cluster.
+    """
+    if threshold is None:
+        threshold = float(os.getenv("CARD_DEDUP_THRESHOLD") or DEFAULT_THRESHOLD)
+    hasher = MinHasher(num_perm)
+    shingle_sets = [shingles(card.get("name") or "") for card in cards]
+    signatures = [hasher.signature(shingle_set) for shingle_set in shingle_sets]
+
+    parent = list(range(len(cards)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    rows = num_perm // bands
+    compared = set()
+    for band in range(bands):
+        buckets = defaultdict(list)
+        for index, signature in enumerate(signatures):
+            # Nameless cards are never duplicates of each other
+            if shingle_sets[index]:
+                buckets[signature[band * rows:(band + 1) * rows].tobytes()].append(index)
+        for members in buckets.values():
+            for position, i in enumerate(members):
+                for j in members[position + 1:]:
+                    if (i, j) in compared:
+                        continue
+                    compared.add((i, j))
+                    if np.mean(signatures[i] == signatures[j]) >= threshold:
+                        parent[find(j)] = find(i)
+
+    clusters: Dict[int, List[Dict[str, Any]]] = {}
+    for index, card in enumerate(cards):
+        clusters.setdefault(find(index), []).append(card)
+    return list(clusters.values())
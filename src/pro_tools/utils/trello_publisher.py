@@ -0,0 +1,177 @@
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from pro_tools.models.article import Article, Section
+from pro_tools.models.publish_result import CardPublishResult, PublishReport
+from pro_tools.utils import async_trello_utils, deadline
+from pro_tools.utils.async_trello_utils import TrelloSession, comment_and_move_cards
+from pro_tools.utils.metrics import get_metrics
+
+SUCCESSFUL_COMMENT = "Comment added successfully."
+SUCCESSFUL_MOVE = "Card updated successfully."
+DEFAULT_STREAM_WORKERS = 4
+
+
+def publish_sections(
+    sections: List[Section],
+    list_id: Optional[str] = None,
+    session: Optional[TrelloSession] = None,
+) -> PublishReport:
+    """
+    Posts each section as a comment on its card and moves the card to the
+    next list, without going through an LLM agent.
+
+    This is the same work the trello_manager agent does with
+    TrelloAddCardCommentTool and TrelloUpdateCardTool, done concurrently
+    through AsyncTrelloUtils.
+
+    Args:
+        sections (list): The sections to publish; `id` is the Trello card ID.
+        list_id (str): Target list, defaulting to TRELLO_DOING_LIST_ID.
+        session (TrelloSession): Shared session to publish on; a new one is
+            opened for this call if omitted.
+
+    Returns:
+        PublishReport: One result per section, in input order.
+    """
+    if not sections:
+        return PublishReport()
+
+    updates = [{"card_id": section.id, "text": section.article} for section in sections]
+    outcomes = comment_and_move_cards(updates, list_id, session)
+
+    report = PublishReport()
+    for section, outcome in zip(sections, outcomes):
+        report.results.append(
+            CardPublishResult(
+                card_id=section.id,
+                name=section.name,
+                status="succeeded" if outcome["move"] == SUCCESSFUL_MOVE else "failed",
+                comment=outcome["comment"],
+                move=outcome["move"],
+            )
+        )
+    return report
+
+
+def move_cards(cards: List[Dict[str, Any]], list_id: Optional[str] = None) -> PublishReport:
+    """
+    Moves cards whose article is already posted as a comment to the next
+    list, finishing a publish whose move failed.
+
+    Args:
+        cards (list): Dictionaries with the card `id` and `name`.
+        list_id (str): Target list, defaulting to TRELLO_DOING_LIST_ID.
+
+    Returns:
+        PublishReport: One result per card, in input order.
+    """
+    if not cards:
+        return PublishReport()
+
+    moves = async_trello_utils.move_cards([card["id"] for card in cards], list_id)
+    return PublishReport(results=[
+        CardPublishResult(
+            card_id=card["id"],
+            name=card["name"],
+            status="succeeded" if move == SUCCESSFUL_MOVE else "failed",
+            comment="Skipped: already commented.",
+            move=move,
+        )
+        for card, move in zip(cards, moves)
+    ])
+
+
+def publish_article(article: Article, list_id: Optional[str] = None) -> PublishReport:
+    """
+    Publishes every section of an Article. See publish_sections.
+    """
+    return publish_sections(article.sections, list_id)
+
+
+class StreamingPublisher:
+    """
+    Publishes sections one at a time, as soon as each is handed over, on a
+    small thread pool, instead of waiting for the whole Article.
+
+    All sections go through one TrelloSession, so the run opens a single
+    event loop and connection pool, closed by `wait()`. Each card is
+    published at most once, however many times its section is
+    submitted. The time from `started_at` to the first successful publish
+    is recorded as the `publish/time_to_first_update` metric.
+
+    Args:
+        list_id (str): Target list, defaulting to TRELLO_DOING_LIST_ID.
+        on_published (callable): Called with each CardPublishResult.
+        workers (int): Sections published at once (TRELLO_STREAM_WORKERS,
+            default 4).
+        started_at (float): `time.perf_counter()` when the run started.
+        publish (callable): Publishes a list of sections, called like
+            publish_sections (the default).
+    """
+
+    def __init__(
+        self,
+        list_id: Optional[str] = None,
+        on_published: Optional[Callable[[CardPublishResult], None]] = None,
+        workers: Optional[int] = None,
+        started_at: Optional[float] = None,
+        publish: Optional[Callable[..., PublishReport]] = None,
+    ):
+        if workers is None:
+            workers = int(os.getenv("TRELLO_STREAM_WORKERS") or DEFAULT_STREAM_WORKERS)
+        self.list_id = list_id
+        self.on_published = on_published
+        self.publish = publish or publish_sections
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+        self.first_update_after: Optional[float] = None
+        self._session = TrelloSession()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="publish")
+        # Publishing runs under the run's deadline, not that of the stage submitting sections
+        self._run_publish = deadline.bind(self._publish)
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, section: Section) -> bool:
+        """
+        Queues a section for publishing.
+
+        Returns:
+            bool: False if the card was already submitted.
+        """
+        with self._lock:
+            if section.id in self._futures:
+                return False
+            self._futures[section.id] = self._executor.submit(self._run_publish, section)
+            return True
+
+    def _publish(self, section: Section) -> CardPublishResult:
+        result = self.publish([section], self.list_id, session=self._session).results[0]
+        if result.status == "succeeded":
+            with self._lock:
+                first = self.first_update_after is None
+                if first:
+                    self.first_update_after = time.perf_counter() - self.started_at
+            if first:
+                get_metrics().observe("publish", "time_to_first_update", self.first_update_after)
+        if self.on_published is not None:
+            self.on_published(result)
+        return result
+
+    def wait(self) -> PublishReport:
+        """
+        Waits for every submitted section and shuts the pool and session down.
+
+        Returns:
+            PublishReport: One result per card, in submission order.
+        """
+        with self._lock:
+            futures = list(self._futures.values())
+        try:
+            return PublishReport(results=[future.result() for future in futures])
+        finally:
+            self._executor.shutdown(wait=True)
+            self._session.close()
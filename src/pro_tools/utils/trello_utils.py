@@ -1,55 +1,125 @@
+import logging
 import os
+import time
+from urllib.parse import quote
 
 import requests
 from dotenv import load_dotenv
 
+from pro_tools.utils import http_client
+from pro_tools.utils.board_mirror import BoardMirror, mirror_enabled
+from pro_tools.utils.http_client import trello_api_url
+from pro_tools.utils.credential_cache import CredentialCache
+
 # Adjust the path to your .env file
 env_path = os.path.join(os.path.dirname(__file__), "../../../.env")
 load_dotenv(dotenv_path=env_path)
 
+DEFAULT_CARD_PAGE_SIZE = 100
+# dateLastActivity lets the card ledger tell whether a card changed since it was processed
+CARD_FIELDS = "id,name,dateLastActivity"
+MIRROR_CARD_FIELDS = "id,name,idList,closed,pos,dateLastActivity"
+BOARD_FIELDS = "name,url,idOrganization"
+LIST_FIELDS = "id,name,closed,idBoard"
+DEFAULT_MIRROR_MAX_AGE = 30
+# Trello's largest page of actions; a bigger backlog is cheaper to reload than to page through
+MAX_MIRROR_ACTIONS = 1000
+
+logger = logging.getLogger(__name__)
+
+
+def lean_payloads():
+    """
+    Whether Trello reads ask for only the fields the crew uses
+    (TRELLO_LEAN_PAYLOADS, on by default) instead of every field.
+    """
+    return os.getenv("TRELLO_LEAN_PAYLOADS", "true").lower() == "true"
+
+
+def _with_fields(query, **fields):
+    if lean_payloads():
+        query.update(fields)
+    return query
+
+
+def _card_summary(card):
+    summary = {"id": card["id"], "name": card["name"]}
+    if "dateLastActivity" in card:
+        summary["dateLastActivity"] = card["dateLastActivity"]
+    return summary
+
 
 class TrelloUtils:
 
-    def __init__(self):
+    def __init__(self, verify_access=True):
         self.api_key = os.getenv("TRELLO_API_KEY")
         self.token = os.getenv("TRELLO_API_TOKEN")
 
         # Debug logging for credentials
-        print("Initializing TrelloUtils...")
-        print(f"API Key loaded (first 4 chars): {self.api_key[:4] if self.api_key else 'None'}")
-        print(f"Token loaded (first 4 chars): {self.token[:4] if self.token else 'None'}")
+        logger.debug("API Key loaded (first 4 chars): %s", self.api_key[:4] if self.api_key else None)
+        logger.debug("Token loaded (first 4 chars): %s", self.token[:4] if self.token else None)
 
         if not self.api_key or not self.token:
             raise ValueError("TRELLO_API_KEY and TRELLO_API_TOKEN must be set.")
+
+        # Reads about the configured board are answered from a local mirror when enabled
+        self.board_id = os.getenv("TRELLO_BOARD_ID")
+        self.mirror = None
+        if self.board_id and mirror_enabled():
+            self.mirror = BoardMirror()
             
         # Verify API access
-        self.verify_api_access()
+        if verify_access:
+            self.verify_api_access()
 
-    def verify_api_access(self):
+    def verify_api_access(self, list_boards=None):
         """
         Verifies that the API credentials have proper access.
+
+        A successful verification is cached on disk (see CredentialCache), so
+        later runs within the TTL skip the network entirely. Any Trello call
+        rejected with 401 or 403 invalidates the cached result.
+
+        Args:
+            list_boards (bool): Also enumerate and print every accessible board.
+                Defaults to the TRELLO_LIST_BOARDS environment variable (off).
         """
-        url = "https://api.trello.com/1/members/me"
+        if list_boards is None:
+            list_boards = os.getenv("TRELLO_LIST_BOARDS", "").lower() == "true"
+
+        credential_cache = CredentialCache()
+        cached = credential_cache.get(self.api_key, self.token)
+        if cached and not list_boards:
+            print(f"Using cached Trello API verification for user: {cached.get('username', 'unknown')}")
+            return
+
+        url = f"{trello_api_url()}/members/me"
         query = {"key": self.api_key, "token": self.token}
         
         print("Verifying Trello API access...")
         try:
-            response = requests.get(url, params=query)
+            response = http_client.get(url, params=query)
             print(f"API access check status: {response.status_code}")
             
             if response.status_code == 200:
                 data = response.json()
                 print(f"Authenticated as user: {data.get('username', 'unknown')}")
                 print(f"Full name: {data.get('fullName', 'unknown')}")
+                credential_cache.set(
+                    self.api_key,
+                    self.token,
+                    {"username": data.get("username"), "fullName": data.get("fullName")},
+                )
                 
                 # Get boards the user has access to
-                boards_url = f"https://api.trello.com/1/members/me/boards"
-                boards_response = requests.get(boards_url, params=query)
-                if boards_response.status_code == 200:
-                    boards = boards_response.json()
-                    print(f"Number of accessible boards: {len(boards)}")
-                    for board in boards:
-                        print(f"Board: {board.get('name')} (ID: {board.get('id')})")
+                if list_boards:
+                    boards_url = f"{trello_api_url()}/members/me/boards"
+                    boards_response = http_client.get(boards_url, params=query)
+                    if boards_response.status_code == 200:
+                        boards = boards_response.json()
+                        print(f"Number of accessible boards: {len(boards)}")
+                        for board in boards:
+                            print(f"Board: {board.get('name')} (ID: {board.get('id')})")
             else:
                 print(f"API access verification failed: {response.status_code} - {response.text}")
                 raise ValueError("Failed to verify Trello API access")
@@ -57,6 +127,98 @@ class TrelloUtils:
             print(f"API access verification error: {e}")
             raise ValueError(f"Failed to connect to Trello API: {e}")
 
+    def sync_board_mirror(self, force=False):
+        """
+        Brings the local board mirror up to date. The first sync loads a full
+        snapshot; later ones replay only the board actions since the last one
+        seen. Syncs younger than BOARD_MIRROR_MAX_AGE seconds are reused.
+
+        Args:
+            force (bool): Sync even if the mirror is fresh.
+
+        Returns:
+            bool: True if Trello was contacted.
+
+        Raises:
+            ValueError: If mirroring is off or a request fails.
+        """
+        if self.mirror is None:
+            raise ValueError("Board mirror is not enabled.")
+
+        state = self.mirror.sync_state(self.board_id)
+        max_age = float(os.getenv("BOARD_MIRROR_MAX_AGE") or DEFAULT_MIRROR_MAX_AGE)
+        if state and not force and time.time() - state["synced_at"] < max_age:
+            return False
+        if state is None or not state["last_action_id"]:
+            self._load_board_snapshot()
+            return True
+
+        actions = self._get_board_actions(since=state["last_action_id"])
+        if len(actions) >= MAX_MIRROR_ACTIONS:
+            print(f"Over {MAX_MIRROR_ACTIONS} board changes since the last sync, reloading the board mirror")
+            self._load_board_snapshot()
+            return True
+        applied = self.mirror.apply_actions(self.board_id, actions)
+        print(f"Board mirror synced: {applied} new actions")
+        return True
+
+    def _load_board_snapshot(self):
+        # The cursor is read before the snapshot, so nothing in between is lost;
+        # actions replayed on top of a snapshot that already has them are no-ops
+        board_fields = quote(BOARD_FIELDS, safe="")
+        card_fields = quote(MIRROR_CARD_FIELDS, safe="")
+        routes = [
+            f"/boards/{self.board_id}/actions?limit=1",
+            f"/boards/{self.board_id}?fields={board_fields}&lists=all&cards=open&card_fields={card_fields}",
+        ]
+        url = f"{trello_api_url()}/batch"
+        query = {"key": self.api_key, "token": self.token, "urls": ",".join(routes)}
+        try:
+            response = http_client.get(url, params=query)
+        except requests.RequestException as e:
+            raise ValueError(f"Unable to connect to Trello API. {e}")
+        if response.status_code != 200:
+            raise ValueError(f"Error: {response.status_code} - {response.text}")
+
+        actions_result, board_result = response.json()
+        if "200" not in actions_result:
+            raise ValueError(f"Error fetching board actions: {actions_result}")
+        if "200" not in board_result:
+            raise ValueError(f"Error accessing board: {board_result}")
+        latest = actions_result["200"]
+        board = board_result["200"]
+        self.mirror.replace(self.board_id, board, latest[0]["id"] if latest else None)
+        print(f"Board mirror loaded: {len(board.get('lists', []))} lists, {len(board.get('cards', []))} cards")
+
+    def _get_board_actions(self, since):
+        url = f"{trello_api_url()}/boards/{self.board_id}/actions"
+        query = {"key": self.api_key, "token": self.token, "since": since, "limit": MAX_MIRROR_ACTIONS}
+        try:
+            response = http_client.get(url, params=query)
+        except requests.RequestException as e:
+            raise ValueError(f"Unable to connect to Trello API. {e}")
+        if response.status_code != 200:
+            raise ValueError(f"Error: {response.status_code} - {response.text}")
+        return response.json()
+
+    def _use_mirror(self, board_id=None, list_id=None):
+        """
+        Whether a read can be answered from the board mirror: mirroring is
+        on, the board or list belongs to the mirrored board, and the mirror
+        is synced. A failed sync falls back to reading from Trello.
+        """
+        if self.mirror is None or (board_id and board_id != self.board_id):
+            return False
+        try:
+            self.sync_board_mirror()
+        except ValueError as e:
+            print(f"Board mirror sync failed, reading from Trello: {str(e)}")
+            return False
+        if list_id:
+            lst = self.mirror.get_list(list_id)
+            return lst is not None and not lst.get("closed")
+        return True
+
     def get_full_board_id(self, short_board_id):
         """
         Fetches the full board ID for the given short board ID from Trello API.
@@ -67,11 +229,11 @@ class TrelloUtils:
         Returns:
             str: The full board ID or an error message if the request fails.
         """
-        url = f"https://api.trello.com/1/boards/{short_board_id}"
+        url = f"{trello_api_url()}/boards/{short_board_id}"
         query = {"key": self.api_key, "token": self.token}
 
         try:
-            response = requests.get(url, params=query)
+            response = http_client.get(url, params=query)
             if response.status_code == 200:
                 board_data = response.json()
                 return board_data.get(
@@ -92,11 +254,14 @@ class TrelloUtils:
         Returns:
             list: A list of dictionaries containing list details or an error message if the request fails.
         """
-        url = f"https://api.trello.com/1/boards/{board_id}/lists"
-        query = {"key": self.api_key, "token": self.token}
+        if self._use_mirror(board_id=board_id):
+            return self.mirror.get_lists(board_id)
+
+        url = f"{trello_api_url()}/boards/{board_id}/lists"
+        query = _with_fields({"key": self.api_key, "token": self.token}, fields=LIST_FIELDS)
 
         try:
-            response = requests.get(url, params=query)
+            response = http_client.get(url, params=query)
             if response.status_code == 200:
                 return response.json()
             else:
@@ -114,18 +279,23 @@ class TrelloUtils:
         Returns:
             dict: The list details if found, or an error message if not found.
         """
-        url = f"https://api.trello.com/1/lists/{list_id}"
-        query = {"key": self.api_key, "token": self.token}
-        
         print(f"Verifying list ID: {list_id}")
+        if self._use_mirror(list_id=list_id):
+            data = self.mirror.get_list(list_id)
+            logger.debug("List details: %s", data)
+            return data
+
+        url = f"{trello_api_url()}/lists/{list_id}"
+        query = _with_fields({"key": self.api_key, "token": self.token}, fields=LIST_FIELDS)
         
         try:
-            response = requests.get(url, params=query)
+            response = http_client.get(url, params=query)
             print(f"List verification response status: {response.status_code}")
             
             if response.status_code == 200:
                 data = response.json()
-                print(f"List details: {data}")
+                print(f"List name: {data.get('name')}")
+                logger.debug("List details: %s", data)
                 return data
             else:
                 error_msg = f"Error: {response.status_code} - {response.text}"
@@ -146,17 +316,24 @@ class TrelloUtils:
         Returns:
             dict: The board details if accessible, or raises an error if not.
         """
-        url = f"https://api.trello.com/1/boards/{board_id}"
+        url = f"{trello_api_url()}/boards/{board_id}"
         query = {
             "key": self.api_key,
             "token": self.token,
-            "fields": "name,url,idOrganization",
+            "fields": BOARD_FIELDS,
             "lists": "open"
         }
+        _with_fields(query, list_fields="id,name")
         
         print(f"\nVerifying access to board: {board_id}")
+        if self._use_mirror(board_id=board_id):
+            data = self.mirror.get_board(board_id)
+            print(f"Board name: {data.get('name')}")
+            print(f"Board URL: {data.get('url')}")
+            return data
+
         try:
-            response = requests.get(url, params=query)
+            response = http_client.get(url, params=query)
             print(f"Board access check status: {response.status_code}")
             
             if response.status_code == 200:
@@ -177,6 +354,218 @@ class TrelloUtils:
             print(error_msg)
             raise ValueError(error_msg)
 
+    def get_startup_snapshot(self, board_id, list_id):
+        """
+        Fetches the board, its open lists and the cards of one list in a single
+        round-trip using Trello's batch endpoint, then checks locally that the
+        list belongs to the board.
+
+        Args:
+            board_id (str): The ID of the Trello board.
+            list_id (str): The ID of the list whose cards should be fetched.
+
+        Returns:
+            dict: The board details under `board` and the list's cards
+                (dictionaries with `id` and `name`) under `cards`.
+
+        Raises:
+            ValueError: If the request fails or the list is not an open list of the board.
+        """
+        if self._use_mirror(board_id=board_id):
+            board = self.mirror.get_board(board_id)
+            if list_id not in [lst["id"] for lst in board["lists"]]:
+                raise ValueError(f"List ID {list_id} not found in board {board_id}")
+            cards = [_card_summary(card) for card in self.mirror.cards_in_list(list_id)]
+            print(f"Retrieved {len(cards)} cards from the board mirror")
+            return {"board": board, "cards": cards}
+
+        routes = [f"/boards/{board_id}?lists=open", f"/lists/{list_id}/cards"]
+        if lean_payloads():
+            routes = [
+                f"/boards/{board_id}?fields={quote(BOARD_FIELDS, safe='')}&lists=open",
+                f"/lists/{list_id}/cards?fields={quote(CARD_FIELDS, safe='')}",
+            ]
+        url = f"{trello_api_url()}/batch"
+        query = {"key": self.api_key, "token": self.token, "urls": ",".join(routes)}
+
+        print(f"\nFetching board {board_id} and list {list_id} in one batch request...")
+        try:
+            response = http_client.get(url, params=query)
+        except requests.RequestException as e:
+            raise ValueError(f"Error connecting to board: {e}")
+
+        if response.status_code != 200:
+            raise ValueError(f"Error accessing board: {response.status_code} - {response.text}")
+
+        board_result, cards_result = response.json()
+        if "200" not in board_result:
+            raise ValueError(f"Error accessing board: {board_result}")
+        if "200" not in cards_result:
+            raise ValueError(f"Error fetching cards: {cards_result}")
+
+        board = board_result["200"]
+        print(f"Board name: {board.get('name')}")
+        list_ids = [lst.get("id") for lst in board.get("lists", [])]
+        if list_id not in list_ids:
+            raise ValueError(f"List ID {list_id} not found in board {board_id}")
+
+        cards = [_card_summary(card) for card in cards_result["200"]]
+        print(f"Retrieved {len(cards)} cards")
+        return {"board": board, "cards": cards}
+
+    def iter_cards_in_list(self, list_id, page_size=None):
+        """
+        Yields the cards of a list one page at a time, using Trello's `limit`
+        and `before` parameters, so the whole list is never held in memory.
+
+        Args:
+            list_id (str): The ID of the Trello list.
+            page_size (int): Cards requested per page. Defaults to
+                TRELLO_CARD_PAGE_SIZE, or 100.
+
+        Yields:
+            dict: The card `id` and `name`.
+
+        Raises:
+            ValueError: If a page cannot be fetched.
+        """
+        if not list_id:
+            raise ValueError("List ID must be provided.")
+        if self._use_mirror(list_id=list_id):
+            for card in self.mirror.cards_in_list(list_id):
+                yield _card_summary(card)
+            return
+        if page_size is None:
+            page_size = int(os.getenv("TRELLO_CARD_PAGE_SIZE") or DEFAULT_CARD_PAGE_SIZE)
+
+        url = f"{trello_api_url()}/lists/{list_id}/cards"
+        before = None
+        while True:
+            query = _with_fields(
+                {"key": self.api_key, "token": self.token, "limit": page_size}, fields=CARD_FIELDS
+            )
+            if before:
+                query["before"] = before
+
+            try:
+                response = http_client.get(url, params=query)
+            except requests.RequestException as e:
+                raise ValueError(f"Unable to connect to Trello API. {e}")
+            if response.status_code != 200:
+                raise ValueError(f"Error: {response.status_code} - {response.text}")
+
+            page = response.json()
+            for card in page:
+                yield _card_summary(card)
+
+            if len(page) < page_size:
+                return
+            # Card IDs are ordered by creation time, so the smallest one is the next cursor
+            before = min(card["id"] for card in page)
+
+    def count_cards_in_list(self, list_id, limit=None):
+        """
+        Counts the cards in a list, fetching only their IDs.
+
+        Args:
+            list_id (str): The ID of the Trello list.
+            limit (int): Stop counting at this many cards; `limit=1` is enough
+                to tell whether the list is empty.
+
+        Returns:
+            int: The number of cards, capped at `limit`.
+
+        Raises:
+            ValueError: If the request fails.
+        """
+        if not list_id:
+            raise ValueError("List ID must be provided.")
+        if self._use_mirror(list_id=list_id):
+            count = len(self.mirror.cards_in_list(list_id))
+            return min(count, limit) if limit else count
+
+        url = f"{trello_api_url()}/lists/{list_id}/cards"
+        query = {"key": self.api_key, "token": self.token, "fields": "id"}
+        if limit:
+            query["limit"] = limit
+
+        try:
+            response = http_client.get(url, params=query)
+        except requests.RequestException as e:
+            raise ValueError(f"Unable to connect to Trello API. {e}")
+        if response.status_code != 200:
+            raise ValueError(f"Error: {response.status_code} - {response.text}")
+        return len(response.json())
+
+    def create_webhook(self, callback_url, id_model, description=None):
+        """
+        Registers a webhook that POSTs every action on a model (a board, list
+        or card) to `callback_url`. Trello sends a HEAD request to the URL
+        first and refuses the webhook unless it answers 200.
+
+        Args:
+            callback_url (str): The publicly reachable endpoint.
+            id_model (str): The ID of the model to watch.
+            description (str): Shown when listing the token's webhooks.
+
+        Returns:
+            dict: The created webhook.
+
+        Raises:
+            ValueError: If Trello refuses the webhook or the request fails.
+        """
+        url = f"{trello_api_url()}/webhooks"
+        query = {
+            "key": self.api_key,
+            "token": self.token,
+            "callbackURL": callback_url,
+            "idModel": id_model,
+            "description": description or "pro_tools webhook daemon",
+        }
+        try:
+            response = http_client.post(url, params=query)
+        except requests.RequestException as e:
+            raise ValueError(f"Unable to connect to Trello API. {e}")
+        if response.status_code != 200:
+            raise ValueError(f"Error registering webhook: {response.status_code} - {response.text}")
+        return response.json()
+
+    def get_webhooks(self):
+        """
+        Lists the webhooks registered with this token.
+
+        Returns:
+            list: The webhooks, each with its `id`, `idModel` and `callbackURL`.
+
+        Raises:
+            ValueError: If the request fails.
+        """
+        url = f"{trello_api_url()}/tokens/{self.token}/webhooks"
+        query = {"key": self.api_key, "token": self.token}
+        try:
+            response = http_client.get(url, params=query)
+        except requests.RequestException as e:
+            raise ValueError(f"Unable to connect to Trello API. {e}")
+        if response.status_code != 200:
+            raise ValueError(f"Error: {response.status_code} - {response.text}")
+        return response.json()
+
+    def delete_webhook(self, webhook_id):
+        """
+        Deletes a webhook.
+
+        Raises:
+            ValueError: If the request fails.
+        """
+        url = f"{trello_api_url()}/webhooks/{webhook_id}"
+        query = {"key": self.api_key, "token": self.token}
+        try:
+            response = http_client.delete(url, params=query)
+        except requests.RequestException as e:
+            raise ValueError(f"Unable to connect to Trello API. {e}")
+        if response.status_code != 200:
+            raise ValueError(f"Error: {response.status_code} - {response.text}")
+
     def get_cards_in_list(self, list_id):
         """
         Fetches all cards from the specified list ID in Trello.
@@ -189,22 +578,26 @@ class TrelloUtils:
         """
         if not list_id:
             return "Error: List ID must be provided."
+        if self._use_mirror(list_id=list_id):
+            cards = [_card_summary(card) for card in self.mirror.cards_in_list(list_id)]
+            print(f"Processed cards from the board mirror: {len(cards)}")
+            return cards
 
-        url = f"https://api.trello.com/1/lists/{list_id}/cards"
-        query = {"key": self.api_key, "token": self.token}
-        
-        print(f"Making request to Trello API: {url}")
-        print(f"Using list_id: {list_id}")
+        url = f"{trello_api_url()}/lists/{list_id}/cards"
+        query = _with_fields({"key": self.api_key, "token": self.token}, fields=CARD_FIELDS)
+
+        print(f"Fetching cards in list: {list_id}")
 
         try:
-            response = requests.get(url, params=query)
+            response = http_client.get(url, params=query)
             print(f"Response status code: {response.status_code}")
             
             if response.status_code == 200:
                 data = response.json()
-                print(f"Raw response data: {data}")
-                cards = [{"id": card["id"], "name": card["name"]} for card in data]
-                print(f"Processed cards: {cards}")
+                # Formatting a large list is O(n), so payloads are only dumped at DEBUG level
+                logger.debug("Raw response data: %s", data)
+                cards = [_card_summary(card) for card in data]
+                print(f"Retrieved {len(cards)} cards")
                 return cards
             else:
                 error_msg = f"Error: {response.status_code} - {response.text}"
@@ -0,0 +1,382 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import queue
+import signal
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+from pro_tools.utils import deadline
+from pro_tools.utils.metrics import get_metrics
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_PATH = "/trello/webhook"
+DEFAULT_BATCH_WINDOW = 2.0
+DEFAULT_BATCH_SIZE = 10
+# Trello actions are a few KB; anything far larger is not from Trello
+MAX_BODY_BYTES = 1024 * 1024
+# Actions that put a card into a list without an earlier list to move from
+CARD_ARRIVAL_ACTIONS = ("createCard", "copyCard", "moveCardToBoard", "convertToCardFromCheckItem")
+
+
+def webhook_signature(body: bytes, callback_url: str, secret: str) -> str:
+    """
+    Computes Trello's X-Trello-Webhook header: the base64 HMAC-SHA1 of the
+    request body followed by the registered callback URL, keyed with the
+    application secret.
+    """
+    digest = hmac.new(secret.encode("utf-8"), body + callback_url.encode("utf-8"), hashlib.sha1).digest()
+    return base64.b64encode(digest).decode("ascii")
+
+
+def card_from_action(payload: Dict[str, Any], list_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns the card a webhook action put into `list_id`, or None when the
+    action is anything else (comments, edits, moves out of the list, ...).
+
+    Args:
+        payload (dict): The webhook body, with the Trello `action`.
+        list_id (str): The list whose new cards are wanted.
+
+    Returns:
+        dict: The card `id` and `name`, plus the action date as
+            `dateLastActivity` for the card ledger.
+    """
+    action = payload.get("action") or {}
+    data = action.get("data") or {}
+    card = data.get("card") or {}
+    if not card.get("id"):
+        return None
+
+    action_type = action.get("type")
+    if action_type in CARD_ARRIVAL_ACTIONS:
+        target = (data.get("list") or {}).get("id")
+    elif action_type == "updateCard" and "listAfter" in data:
+        target = (data.get("listAfter") or {}).get("id")
+    else:
+        return None
+    if target != list_id:
+        return None
+
+    result = {"id": card["id"], "name": card.get("name", "")}
+    if action.get("date"):
+        result["dateLastActivity"] = action["date"]
+    return result
+
+
+def process_cards(cards: List[Dict[str, Any]]):
+    """
+    Runs the crew on a batch of cards through the fan-out runner and prints
+    the outcome per card.
+    """
+    # crewai takes seconds to import, so an idle daemon never loads it
+    from pro_tools.runner import run_fanout
+
+    # Each batch is a run of its own under RUN_DEADLINE_SECONDS
+    with deadline.deadline(deadline.run_budget()):
+        report = run_fanout(cards)
+    print(f"\nProcessed {len(report.results)} cards: "
+          f"{len(report.succeeded)} succeeded, {len(report.failed)} failed")
+    for result in report.failed:
+        print(f"- {result.card_id} ({result.name}): {result.error}")
+
+
+class WebhookDaemon:
+    """
+    Long-running service that processes cards as Trello reports them,
+    instead of polling the whole TODO list.
+
+    It serves an HTTP endpoint for Trello webhook callbacks, registers a
+    webhook on the board when WEBHOOK_CALLBACK_URL is set, and queues every
+    card created in or moved into the TODO list. A worker thread drains the
+    queue in batches, waiting up to `batch_window` seconds for more cards so
+    a burst of new cards shares one crew run. A card already waiting in the
+    queue is not queued twice.
+
+    On start it also queues the cards already in the TODO list, so cards
+    added while the daemon was down are not missed; with the card ledger
+    enabled, cards finished earlier are skipped cheaply.
+
+    Args:
+        list_id (str): The TODO list, defaulting to TRELLO_TOOD_LIST_ID.
+        process (callable): Called with each batch of cards. Defaults to
+            running the crew through the fan-out runner.
+        host (str): Interface to listen on (WEBHOOK_HOST, default
+            127.0.0.1; use 0.0.0.0 to accept callbacks from other hosts).
+        port (int): Port to listen on (WEBHOOK_PORT, default 8080; 0 picks
+            a free one).
+        path (str): Callback path (WEBHOOK_PATH, default /trello/webhook).
+        callback_url (str): The public URL Trello should call
+            (WEBHOOK_CALLBACK_URL). No webhook is registered without it.
+        secret (str): The Trello application secret used to verify the
+            X-Trello-Webhook signature (TRELLO_WEBHOOK_SECRET). Unsigned or
+            mis-signed callbacks are rejected when it is set.
+        batch_window (float): Seconds to wait for more cards before a batch
+            starts (WEBHOOK_BATCH_WINDOW, default 2).
+        batch_size (int): Most cards per batch (WEBHOOK_BATCH_SIZE, default 10).
+        catch_up (bool): Queue the cards already in the list on start
+            (WEBHOOK_CATCH_UP, default true).
+    """
+
+    def __init__(
+        self,
+        list_id: Optional[str] = None,
+        process: Optional[Callable[[List[Dict[str, Any]]], Any]] = None,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        path: Optional[str] = None,
+        callback_url: Optional[str] = None,
+        secret: Optional[str] = None,
+        batch_window: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        catch_up: Optional[bool] = None,
+    ):
+        self.list_id = list_id or os.getenv("TRELLO_TOOD_LIST_ID")
+        if not self.list_id:
+            raise ValueError("TRELLO_TOOD_LIST_ID must be set.")
+        self.process = process or process_cards
+        self.path = path or os.getenv("WEBHOOK_PATH") or DEFAULT_PATH
+        self.callback_url = callback_url or os.getenv("WEBHOOK_CALLBACK_URL")
+        self.secret = secret if secret is not None else os.getenv("TRELLO_WEBHOOK_SECRET")
+        if self.secret and not self.callback_url:
+            raise ValueError("WEBHOOK_CALLBACK_URL must be set to verify webhook signatures.")
+        if batch_window is None:
+            batch_window = float(os.getenv("WEBHOOK_BATCH_WINDOW") or DEFAULT_BATCH_WINDOW)
+        if batch_size is None:
+            batch_size = int(os.getenv("WEBHOOK_BATCH_SIZE") or DEFAULT_BATCH_SIZE)
+        if catch_up is None:
+            catch_up = os.getenv("WEBHOOK_CATCH_UP", "true").lower() == "true"
+        self.batch_window = batch_window
+        self.batch_size = max(1, batch_size)
+        self.catch_up = catch_up
+        self.webhook_id: Optional[str] = None
+
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self._pending: set = set()
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._created_webhook = False
+        if port is None:
+            port = int(os.getenv("WEBHOOK_PORT") or DEFAULT_PORT)
+        self._server = ThreadingHTTPServer((host or os.getenv("WEBHOOK_HOST") or DEFAULT_HOST, port),
+                                           self._handler_class())
+        self._server.daemon_threads = True
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{self.path}"
+
+    def enqueue(self, card: Dict[str, Any]) -> bool:
+        """
+        Queues a card for processing unless it is already waiting.
+
+        Returns:
+            bool: True if the card was queued.
+        """
+        with self._lock:
+            if card["id"] in self._pending:
+                return False
+            self._pending.add(card["id"])
+        get_metrics().increment("webhook_cards_queued")
+        self._queue.put(card)
+        return True
+
+    def handle_callback(self, body: bytes, signature: Optional[str]) -> int:
+        """
+        Handles one webhook POST and returns the HTTP status to answer with.
+        Trello retries anything other than a 2xx, so only bad signatures and
+        unparseable bodies are refused.
+        """
+        metrics = get_metrics()
+        if self.secret:
+            expected = webhook_signature(body, self.callback_url, self.secret)
+            if not signature or not hmac.compare_digest(expected, signature):
+                metrics.increment("webhook_rejected", reason="signature")
+                return 401
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            metrics.increment("webhook_rejected", reason="body")
+            return 400
+
+        action_type = (payload.get("action") or {}).get("type", "unknown")
+        metrics.increment("webhook_events", type=action_type)
+        card = card_from_action(payload, self.list_id)
+        if card is not None and self.enqueue(card):
+            print(f"Queued card {card['id']} ({card['name']}) from {action_type}")
+        return 200
+
+    def _next_batch(self) -> List[Dict[str, Any]]:
+        card = self._queue.get()
+        if card is None:
+            return []
+        batch = [card]
+        window_ends = time.monotonic() + self.batch_window
+        while len(batch) < self.batch_size:
+            remaining = window_ends - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                card = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if card is None:
+                # Finish this batch, then let the worker see the stop signal
+                self._queue.put(None)
+                break
+            batch.append(card)
+        with self._lock:
+            # Cards moved back into the list while their batch runs are queued again
+            for card in batch:
+                self._pending.discard(card["id"])
+        return batch
+
+    def _work(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+            print(f"\nProcessing {len(batch)} cards from webhooks")
+            try:
+                self.process(batch)
+            except Exception as e:
+                print(f"Error processing cards {[card['id'] for card in batch]}: {str(e)}")
+
+    def register_webhook(self):
+        """
+        Registers a webhook on WEBHOOK_MODEL_ID (default: the board, so moves
+        from other lists are seen too), reusing one this token already has
+        for the same callback URL and model.
+        """
+        from pro_tools.utils.trello_utils import TrelloUtils
+
+        model_id = os.getenv("WEBHOOK_MODEL_ID") or os.getenv("TRELLO_BOARD_ID") or self.list_id
+        trello_utils = TrelloUtils(verify_access=False)
+        for webhook in trello_utils.get_webhooks():
+            if webhook.get("callbackURL") == self.callback_url and webhook.get("idModel") == model_id:
+                self.webhook_id = webhook["id"]
+                print(f"Using existing webhook {self.webhook_id} for {model_id}")
+                return
+        webhook = trello_utils.create_webhook(self.callback_url, model_id)
+        self.webhook_id = webhook["id"]
+        self._created_webhook = True
+        print(f"Registered webhook {self.webhook_id} for {model_id} -> {self.callback_url}")
+
+    def queue_existing_cards(self) -> int:
+        """
+        Queues the cards already in the TODO list.
+
+        Returns:
+            int: The number of cards queued.
+        """
+        from pro_tools.utils.trello_utils import TrelloUtils
+
+        queued = 0
+        for card in TrelloUtils(verify_access=False).iter_cards_in_list(self.list_id):
+            queued += self.enqueue(card)
+        return queued
+
+    def start(self) -> "WebhookDaemon":
+        """
+        Starts the HTTP endpoint and the worker, then registers the webhook
+        (Trello checks the endpoint answers first) and catches up on the list.
+        """
+        for target in (self._server.serve_forever, self._work):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        print(f"Listening for Trello webhooks on {self.url}")
+        if self.callback_url:
+            self.register_webhook()
+        if self.catch_up:
+            try:
+                queued = self.queue_existing_cards()
+                print(f"Queued {queued} cards already in the TODO list")
+            except ValueError as e:
+                print(f"Could not read the TODO list on start: {str(e)}")
+        return self
+
+    def stop(self, unregister: bool = True):
+        """
+        Stops accepting callbacks, lets the worker finish the cards already
+        queued, and deletes the webhook if this daemon created it.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+        self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        if unregister and self._created_webhook:
+            from pro_tools.utils.trello_utils import TrelloUtils
+
+            try:
+                TrelloUtils(verify_access=False).delete_webhook(self.webhook_id)
+                print(f"Deleted webhook {self.webhook_id}")
+            except ValueError as e:
+                print(f"Failed to delete webhook {self.webhook_id}: {str(e)}")
+            self._created_webhook = False
+
+    def serve_forever(self):
+        """
+        Runs until interrupted (Ctrl+C or SIGTERM), then stops cleanly.
+        """
+        # Signal handlers can only be installed from the main thread
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda signum, frame: self._stopping.set())
+        try:
+            self.start()
+            while not self._stopping.wait(1):
+                pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            print("\nShutting down, finishing queued cards...")
+            self.stop()
+
+    def __enter__(self) -> "WebhookDaemon":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _handler_class(self):
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _reply(self, status: int):
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def do_HEAD(self):
+                # Trello checks the callback URL with a HEAD request on registration
+                self._reply(200 if self.path.split("?")[0] == daemon.path else 404)
+
+            do_GET = do_HEAD
+
+            def do_POST(self):
+                if self.path.split("?")[0] != daemon.path:
+                    self._reply(404)
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                if length > MAX_BODY_BYTES:
+                    self.close_connection = True
+                    self._reply(413)
+                    return
+                body = self.rfile.read(length)
+                self._reply(daemon.handle_callback(body, self.headers.get("X-Trello-Webhook")))
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler